@@ -1,6 +1,8 @@
 from pathlib import Path
 from dotenv import load_dotenv
+from django.core.exceptions import ImproperlyConfigured
 import os
+import sys
 
 load_dotenv()
 
@@ -126,13 +128,142 @@ EDITOR_INVITE_CODE = os.environ.get("EDITOR_INVITE_CODE", "newsapp-editor-2026")
 EMAIL_BACKEND = "django.core.mail.backends.console.EmailBackend"
 DEFAULT_FROM_EMAIL = "no-reply@newsapp.local"
 
+# Subscriber fan-out (core.mailer): "recipient" sends one message per subscriber,
+# "bcc" shares identical messages in BCC chunks. Messages go out over one
+# connection, MAIL_SEND_BATCH_SIZE per send_messages() call.
+MAIL_FANOUT_MODE = "recipient"
+MAIL_BCC_CHUNK_SIZE = 50
+MAIL_SEND_BATCH_SIZE = 100
+MAIL_QUERY_CHUNK_SIZE = 2000
+
+# Hourly/daily digests (`manage.py send_digests`): readers per database pass
+# and articles listed per digest.
+DIGEST_READER_BATCH_SIZE = 1000
+DIGEST_MAX_ARTICLES = 50
+
+# Article status event log: delta sync, digests and the search index only read
+# events logged at least this many seconds ago, so an event committed late by a
+# slow transaction is not skipped. Keep it above the longest decision transaction.
+STATUS_EVENT_SETTLE_SECONDS = 30
+
 REST_FRAMEWORK = {
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.IsAuthenticated",
     ],
+    # Keyset pagination on (created_at, id); see core/pagination.py.
+    "DEFAULT_PAGINATION_CLASS": "core.pagination.KeysetPagination",
+    "PAGE_SIZE": 20,
+}
+
+# --- Reader feed timelines ---
+# Publishers/journalists with a larger audience than this are merged into
+# reader feeds at read time instead of being fanned out on approval.
+FEED_FANOUT_MAX_AUDIENCE = int(os.environ.get("FEED_FANOUT_MAX_AUDIENCE", "10000"))
+
+# --- Reader feed page cache ---
+# Must be shared by every worker (Redis/Memcached): invalidation stamps are
+# written here, and a per-process cache would keep serving stale pages in
+# the other workers. The in-process default is only accepted with DEBUG or
+# under `manage.py test`. E.g.
+#   FEED_CACHE_BACKEND=django.core.cache.backends.redis.RedisCache
+#   FEED_CACHE_LOCATION=redis://127.0.0.1:6379/1
+FEED_CACHE_BACKEND = os.environ.get(
+    "FEED_CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"
+)
+TESTING = sys.argv[1:2] == ["test"]
+if FEED_CACHE_BACKEND.endswith("LocMemCache") and not (DEBUG or TESTING):
+    raise ImproperlyConfigured(
+        "FEED_CACHE_BACKEND must be a cache shared by all workers "
+        "(e.g. RedisCache) when DEBUG is off."
+    )
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "feeds": {
+        "BACKEND": FEED_CACHE_BACKEND,
+        "LOCATION": os.environ.get("FEED_CACHE_LOCATION", "feeds"),
+    },
 }
+if FEED_CACHE_BACKEND.endswith("LocMemCache"):
+    CACHES["feeds"]["OPTIONS"] = {"MAX_ENTRIES": 10000}
+FEED_CACHE_ALIAS = "feeds"
+FEED_CACHE_TIMEOUT = 300
+
+# Article detail pages: in-process LRU in front of the shared "feeds" cache.
+DETAIL_CACHE_TIMEOUT = 600
+DETAIL_CACHE_LOCAL_TTL = 5
+DETAIL_CACHE_LOCAL_MAX_ENTRIES = 1024
+
+# --- Editor review queue ---
+# Each editor leases this many pending articles at a time; leases lapse after
+# EDITOR_CLAIM_TTL seconds and the articles return to the shared queue.
+EDITOR_CLAIM_BATCH_SIZE = 10
+EDITOR_CLAIM_TTL = 900
+
+# --- Outbox (emails and X posts after editorial decisions) ---
+# Delivered by `python manage.py process_outbox`; failures back off
+# exponentially (OUTBOX_BACKOFF_BASE * 2^n seconds, capped) and are
+# dead-lettered after OUTBOX_MAX_ATTEMPTS.
+OUTBOX_WORKER_THREADS = 4
+OUTBOX_BATCH_SIZE = 50
+OUTBOX_POLL_INTERVAL = 1.0
+OUTBOX_LEASE_SECONDS = 300
+OUTBOX_MAX_ATTEMPTS = 8
+OUTBOX_BACKOFF_BASE = 2
+OUTBOX_BACKOFF_MAX = 900
+# Approval notifications are split into one outbox message per this many
+# readers, so a failed send only retries its own batch.
+OUTBOX_NOTIFICATION_BATCH_SIZE = 500
+
+# --- Article search ---
+# Dotted path of the backend (see core/search.py); None picks MySQL FULLTEXT
+# on MySQL and the SearchTerm index table elsewhere.
+SEARCH_BACKEND = None
+SEARCH_TITLE_WEIGHT = 3
+SEARCH_MAX_LIMIT = 50
+# The SearchTerm backend caches the article count behind its idf weights
+# (feed cache) for this many seconds.
+SEARCH_DOCUMENT_COUNT_TIMEOUT = 60
+# In-process BM25 engine ("core.search_engine.BM25SearchBackend"): workers
+# map SEARCH_ENGINE_SNAPSHOT (written by rebuild_search_index) at startup and
+# apply newer status events at most every SEARCH_ENGINE_SYNC_SECONDS.
+SEARCH_ENGINE_SNAPSHOT = os.environ.get("SEARCH_ENGINE_SNAPSHOT", "")
+SEARCH_ENGINE_SYNC_SECONDS = 5
+SEARCH_BM25_K1 = 1.2
+SEARCH_BM25_B = 0.75
+SEARCH_ADMIN_MAX_RESULTS = 1000
+
+# --- Related articles ---
+# `python manage.py build_related_articles` (cron) stores the
+# RELATED_ARTICLES_COUNT most similar approved articles per article; the
+# TF-IDF model it updates incrementally is kept in RELATED_ARTICLES_MODEL.
+RELATED_ARTICLES_COUNT = 5
+RELATED_ARTICLES_MIN_SCORE = 0.05
+RELATED_ARTICLES_MODEL = os.environ.get(
+    "RELATED_ARTICLES_MODEL", str(BASE_DIR / "related_articles.npz")
+)
 
 # --- X posting (Phase F) ---
 X_POST_ENABLED = False
 X_BEARER_TOKEN = os.environ.get("X_BEARER_TOKEN", "")
-X_API_URL = "https://api.x.com/2/tweets"
\ No newline at end of file
+X_API_URL = "https://api.x.com/2/tweets"
+# Pooled keep-alive connections shared by the outbox threads; failed posts
+# are retried in place with jittered backoff, and after X_BREAKER_THRESHOLD
+# consecutive failures calls are refused for X_BREAKER_RESET seconds.
+X_CONNECT_TIMEOUT = 3.05
+X_READ_TIMEOUT = 5
+X_RETRIES = 3
+X_BACKOFF_BASE = 0.5
+X_BACKOFF_MAX = 4
+X_POOL_SIZE = OUTBOX_WORKER_THREADS
+X_BREAKER_THRESHOLD = 5
+X_BREAKER_RESET = 60
+# Approved articles are queued and posted by `python manage.py post_to_x`,
+# freshest first. X_RATE_LIMIT posts per X_RATE_LIMIT_WINDOW seconds is only
+# the starting allowance: the x-rate-limit-* response headers take over.
+X_RATE_LIMIT = 100
+X_RATE_LIMIT_WINDOW = 86400
+X_RATE_LIMIT_COOLDOWN = 60
+X_POST_MAX_ATTEMPTS = 8
+X_POST_LEASE_SECONDS = 300
\ No newline at end of file
@@ -5,5 +5,6 @@ urlpatterns = [
     path("admin/", admin.site.urls),
     path("", include("core.urls")),
     path("api/", include("core.api_urls")),
+    path("async/", include("core.async_urls")),
     path("accounts/", include("django.contrib.auth.urls")),
 ]
\ No newline at end of file
@@ -1,7 +1,11 @@
-from django.contrib import admin
+from django.contrib import admin, messages
 from django.contrib.auth.admin import UserAdmin as DjangoUserAdmin
 
-from .models import Article, Publisher, User
+from .models import Article, OutboxMessage, Publisher, User, XPost
+from .moderation import APPROVE, REJECT, bulk_decide
+from .outbox import requeue
+from .search import get_search_backend
+from .services.x_scheduler import requeue_x_posts
 
 
 @admin.register(User)
@@ -23,6 +27,9 @@ class UserAdmin(DjangoUserAdmin):
                     "bio",
                     "subscribed_publishers",
                     "subscribed_journalists",
+                    "notify_subscribed_publishers",
+                    "notify_followed_journalists",
+                    "notification_delivery",
                 )
             },
         ),
@@ -62,4 +69,65 @@ class ArticleAdmin(admin.ModelAdmin):
     list_display = ("title", "status", "publisher", "author", "created_at")
     list_filter = ("status", "publisher")
     search_fields = ("title", "body")
-    ordering = ("-created_at",)
\ No newline at end of file
+    ordering = ("-created_at",)
+    actions = ("approve_selected", "reject_selected")
+
+    def get_search_results(self, request, queryset, search_term):
+        """Search through the article search index instead of LIKE scans."""
+        if not search_term.strip():
+            return queryset, False
+        return get_search_backend().filter_queryset(queryset, search_term), False
+
+    @admin.action(description="Approve selected articles")
+    def approve_selected(self, request, queryset):
+        """Approve the selected articles in one UPDATE with batched emails."""
+        decided = bulk_decide(queryset.values_list("pk", flat=True), APPROVE, request=request)
+        self.message_user(request, f"{len(decided)} article(s) approved.", messages.SUCCESS)
+
+    @admin.action(description="Reject selected articles")
+    def reject_selected(self, request, queryset):
+        """Reject the selected articles in one UPDATE with batched emails."""
+        decided = bulk_decide(queryset.values_list("pk", flat=True), REJECT, request=request)
+        self.message_user(request, f"{len(decided)} article(s) rejected.", messages.SUCCESS)
+
+
+@admin.register(OutboxMessage)
+class OutboxMessageAdmin(admin.ModelAdmin):
+    """Admin configuration for OutboxMessage (inspect and requeue dead letters)."""
+
+    list_display = ("topic", "status", "attempts", "available_at", "created_at", "last_error")
+    list_filter = ("status", "topic")
+    ordering = ("-id",)
+    actions = ("requeue_selected",)
+
+    @admin.action(description="Requeue selected dead-lettered messages")
+    def requeue_selected(self, request, queryset):
+        """Give dead-lettered messages a fresh attempt budget."""
+        count = requeue(queryset)
+        self.message_user(request, f"{count} message(s) requeued.", messages.SUCCESS)
+
+
+@admin.register(XPost)
+class XPostAdmin(admin.ModelAdmin):
+    """Admin configuration for XPost (posting status and latency per article)."""
+
+    list_display = (
+        "article",
+        "status",
+        "attempts",
+        "queued_at",
+        "posted_at",
+        "latency_ms",
+        "response_ms",
+        "last_error",
+    )
+    list_filter = ("status",)
+    list_select_related = ("article",)
+    ordering = ("-queued_at",)
+    actions = ("requeue_selected",)
+
+    @admin.action(description="Requeue selected failed posts")
+    def requeue_selected(self, request, queryset):
+        """Give failed posts a fresh attempt budget."""
+        count = requeue_x_posts(queryset)
+        self.message_user(request, f"{count} post(s) requeued.", messages.SUCCESS)
@@ -1,7 +1,13 @@
 from django.urls import path
 
 from .api_views import (
+    ArticleChangesAPIView,
+    ArticleSearchAPIView,
+    ApprovedArticleExportAPIView,
+    FeedCacheStatsAPIView,
+    FeedSectionsAPIView,
     MyFeedArticlesAPIView,
+    MyFeedExportAPIView,
     MyJournalistArticlesAPIView,
     MyPublisherArticlesAPIView,
 )
@@ -20,4 +26,22 @@ urlpatterns = [
         MyJournalistArticlesAPIView.as_view(),
         name="articles_journalists",
     ),
+    path(
+        "articles/feed/sections/",
+        FeedSectionsAPIView.as_view(),
+        name="articles_feed_sections",
+    ),
+    path(
+        "articles/feed/export/",
+        MyFeedExportAPIView.as_view(),
+        name="articles_feed_export",
+    ),
+    path(
+        "articles/export/",
+        ApprovedArticleExportAPIView.as_view(),
+        name="articles_export",
+    ),
+    path("articles/changes/", ArticleChangesAPIView.as_view(), name="articles_changes"),
+    path("articles/search/", ArticleSearchAPIView.as_view(), name="articles_search"),
+    path("feed-cache/stats/", FeedCacheStatsAPIView.as_view(), name="feed_cache_stats"),
 ]
\ No newline at end of file
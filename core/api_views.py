@@ -1,64 +1,368 @@
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from django.urls import reverse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+from rest_framework.exceptions import ValidationError
 from rest_framework.generics import ListAPIView
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+from rest_framework.views import APIView
 
 from .api_permissions import IsReader
+from .changes import latest_token, reader_changes
+from .exports import iter_ndjson, parse_since
+from .feed_cache import cache_stats, cached_page
+from .feeds import (
+    feed_sections,
+    feed_validators,
+    journalist_feed_queryset,
+    publisher_feed_queryset,
+    reader_feed_queryset,
+)
 from .models import Article
-from .serializers import ArticleSerializer
+from .pagination import FORWARD, encode_cursor
+from .search import search_articles
+from .serializers import (
+    FeedArticleSerializer,
+    parse_field_selection,
+    with_feed_columns,
+)
 
 
-class MyFeedArticlesAPIView(ListAPIView):
+class ReaderFeedAPIView(ListAPIView):
     """
-    Returns APPROVED articles written by:
-    - journalists the user follows OR
-    - publishers the user subscribes to
+    Base class for the reader-only article feeds.
+
+    Subclasses implement ``get_feed_queryset``; this class restricts it to the
+    columns the feed serializer needs (publisher and author joined in), so a
+    page costs a constant number of queries. Items have the
+    ``ArticleSerializer`` shape.
+
+    Responses carry ETag/Last-Modified validators derived from the feed
+    versions of ``feed_sources`` (see ``core.feeds.feed_validators``);
+    matching If-None-Match / If-Modified-Since requests get a 304 without
+    touching the Article table. Other requests are served from the feed page
+    cache under the same ETag (see ``core.feed_cache``); the ``X-Feed-Cache``
+    header reports HIT or MISS.
+
+    ``?fields=id,title,...`` limits the item keys and ``?body=excerpt``
+    replaces the body with a bounded prefix; unselected columns (including
+    ``body``) are not loaded from the database.
     """
-    serializer_class = ArticleSerializer
+    serializer_class = FeedArticleSerializer
     permission_classes = [IsReader]
+    feed_sources = ("publishers", "journalists")
+
+    def get_feed_queryset(self):
+        raise NotImplementedError
+
+    def get_field_selection(self):
+        if not hasattr(self, "_field_selection"):
+            self._field_selection = parse_field_selection(self.request.query_params)
+        return self._field_selection
 
     def get_queryset(self):
-        user = self.request.user
+        fields, body_mode = self.get_field_selection()
+        return with_feed_columns(self.get_feed_queryset(), fields, body_mode)
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context["fields"], context["body_mode"] = self.get_field_selection()
+        return context
+
+    def render_page(self):
+        """
+        Query and serialize the requested page (a feed cache miss).
+
+        Returns:
+            dict: The paginated response data.
+        """
+        return super().list(self.request).data
 
-        qs = Article.objects.filter(status=Article.Status.APPROVED)
+    def list(self, request, *args, **kwargs):
+        self.get_field_selection()
+        etag, last_modified = feed_validators(
+            request.user, self.feed_sources, request.get_full_path()
+        )
+        timestamp = int(last_modified.timestamp()) if last_modified else None
 
-        qs = qs.filter(
-            publisher__in=user.subscribed_publishers.all()
-        ) | qs.filter(
-            author__in=user.subscribed_journalists.all()
+        response = get_conditional_response(
+            request._request, etag=etag, last_modified=timestamp
         )
+        if response is None:
+            data, hit = cached_page(etag, self.render_page)
+            response = Response(data)
+            response["X-Feed-Cache"] = "HIT" if hit else "MISS"
+
+        response["ETag"] = etag
+        if timestamp is not None:
+            response["Last-Modified"] = http_date(timestamp)
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
 
-        return qs.distinct().order_by("-created_at")
 
+class MyFeedArticlesAPIView(ReaderFeedAPIView):
+    """
+    Returns APPROVED articles written by:
+    - journalists the user follows OR
+    - publishers the user subscribes to
 
-class MyPublisherArticlesAPIView(ListAPIView):
+    Served from the reader's materialized timeline (see ``core.feeds``).
+    """
+    keyset_fields = ("feed_created_at", "feed_article_id")
+
+    def get_feed_queryset(self):
+        return reader_feed_queryset(self.request.user)
+
+
+class MyPublisherArticlesAPIView(ReaderFeedAPIView):
     """
     Returns APPROVED articles from publishers the user is subscribed to.
     """
-    serializer_class = ArticleSerializer
+    feed_sources = ("publishers",)
+
+    def get_feed_queryset(self):
+        return publisher_feed_queryset(self.request.user)
+
+
+class MyJournalistArticlesAPIView(ReaderFeedAPIView):
+    """
+    Returns APPROVED articles from journalists the user follows.
+    """
+    feed_sources = ("journalists",)
+
+    def get_feed_queryset(self):
+        return journalist_feed_queryset(self.request.user)
+
+
+class FeedSectionsAPIView(ReaderFeedAPIView):
+    """
+    Returns the first page of all three reader feeds in one response.
+
+    ``{"feed": ..., "publishers": ..., "journalists": ...}``, each section
+    ``{"next": url|null, "results": [...]}`` where ``next`` continues on the
+    section's own endpoint. Items have the ``ArticleSerializer`` shape plus
+    ``reasons``: ``subscribed_publisher`` and/or ``followed_journalist``.
+
+    The sections are split from one newest-first pass over the reader's
+    candidate articles (see ``core.feeds.feed_sections``). Supports
+    ``?page_size=``, ``?fields=``/``?body=``, conditional GET and the feed page
+    cache like the single feeds.
+    """
+    section_urls = {
+        "feed": "core_api:articles_feed",
+        "publishers": "core_api:articles_publishers",
+        "journalists": "core_api:articles_journalists",
+    }
+
+    def section_link(self, section: str, row):
+        """
+        Build the URL of the page after ``row`` on the section's own endpoint.
+
+        Returns:
+            str: The link URL.
+        """
+        url = self.request.build_absolute_uri(reverse(self.section_urls[section]))
+        for param in ("page_size", "fields", "body"):
+            if param in self.request.query_params:
+                url = replace_query_param(url, param, self.request.query_params[param])
+        token = encode_cursor(FORWARD, row.created_at, row.pk)
+        return replace_query_param(url, self.paginator.cursor_query_param, token)
+
+    def render_page(self):
+        fields, body_mode = self.get_field_selection()
+        limit = self.paginator.get_page_size(self.request) + 1
+        reader = self.request.user
+
+        sections, reasons = feed_sections(
+            list(with_feed_columns(publisher_feed_queryset(reader), fields, body_mode)[:limit]),
+            list(with_feed_columns(journalist_feed_queryset(reader), fields, body_mode)[:limit]),
+            limit - 1,
+        )
+
+        serializer = FeedArticleSerializer(context=self.get_serializer_context())
+        items = {}
+        data = {}
+        for section, (rows, has_more) in sections.items():
+            results = []
+            for row in rows:
+                if row.pk not in items:
+                    items[row.pk] = serializer.to_representation(row)
+                    items[row.pk]["reasons"] = reasons[row.pk]
+                results.append(items[row.pk])
+            data[section] = {
+                "next": self.section_link(section, rows[-1]) if has_more else None,
+                "results": results,
+            }
+        return data
+
+
+class FeedCacheStatsAPIView(APIView):
+    """
+    Staff-only hit/miss counters for the feed page cache.
+    """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(cache_stats())
+
+
+class NDJSONExportAPIView(APIView):
+    """
+    Base class for streaming newline-delimited JSON article exports.
+
+    Streams every matching article oldest-first in bounded batches (see
+    ``core.exports``). Supports the feed ``?fields=``/``?body=`` options and
+    ``?since=<token>`` to resume after a previously received line.
+    """
+    keyset_fields = ("created_at", "pk")
+
+    def get_export_queryset(self):
+        raise NotImplementedError
+
+    def get(self, request):
+        fields, body_mode = parse_field_selection(request.query_params)
+        try:
+            since = parse_since(request.query_params.get("since"))
+        except ValueError:
+            raise ValidationError({"since": "Invalid resume token."})
+
+        rows = iter_ndjson(
+            with_feed_columns(self.get_export_queryset(), fields, body_mode),
+            context={"fields": fields, "body_mode": body_mode},
+            since=since,
+            keyset_fields=self.keyset_fields,
+        )
+        return StreamingHttpResponse(rows, content_type="application/x-ndjson")
+
+
+class MyFeedExportAPIView(NDJSONExportAPIView):
+    """
+    Streams the reader's complete combined feed history as NDJSON.
+    """
     permission_classes = [IsReader]
+    keyset_fields = ("feed_created_at", "feed_article_id")
 
-    def get_queryset(self):
-        user = self.request.user
-        return (
-            Article.objects.filter(
-                status=Article.Status.APPROVED,
-                publisher__in=user.subscribed_publishers.all(),
+    def get_export_queryset(self):
+        return reader_feed_queryset(self.request.user)
+
+
+class ApprovedArticleExportAPIView(NDJSONExportAPIView):
+    """
+    Streams every APPROVED article as NDJSON (staff only).
+    """
+    permission_classes = [IsAdminUser]
+
+    def get_export_queryset(self):
+        return Article.objects.filter(status=Article.Status.APPROVED)
+
+
+class ArticleChangesAPIView(APIView):
+    """
+    Delta sync for the reader's combined feed.
+
+    ``GET /api/articles/changes/?since=<token>`` returns the articles that
+    entered (``inserted``) or left (``removed``) the reader's feed since the
+    token, plus the next ``since`` token (see ``core.changes``). Without
+    ``since`` it only returns a token for the current position; load the full
+    feed after taking it. ``has_more`` asks the client to call again right
+    away, and ``resync`` to reload the full feed because the reader's
+    subscriptions changed. Inserted items have the feed item shape and honour
+    ``?fields=``/``?body=``.
+    """
+    permission_classes = [IsReader]
+
+    def get(self, request):
+        fields, body_mode = parse_field_selection(request.query_params)
+        token = request.query_params.get("since")
+        if not token:
+            return Response(
+                {
+                    "since": latest_token(),
+                    "has_more": False,
+                    "resync": True,
+                    "inserted": [],
+                    "removed": [],
+                }
             )
-            .order_by("-created_at")
-        )
+
+        try:
+            changes = reader_changes(request.user, token)
+        except ValueError:
+            raise ValidationError({"since": "Invalid sync token."})
+
+        changes["inserted"] = FeedArticleSerializer(
+            with_feed_columns(changes["inserted"], fields, body_mode),
+            many=True,
+            context={"fields": fields, "body_mode": body_mode},
+        ).data
+        return Response(changes)
 
 
-class MyJournalistArticlesAPIView(ListAPIView):
+class ArticleSearchAPIView(APIView):
     """
-    Returns APPROVED articles from journalists the user follows.
+    Ranked full-text search over APPROVED articles.
+
+    ``GET /api/articles/search/?q=<query>`` returns the best matches first,
+    each item in the feed item shape plus its ``score``, read from the search
+    index (see ``core.search``). Page with ``?limit=`` (at most
+    ``SEARCH_MAX_LIMIT``) and ``?offset=``; ``count`` is the number of
+    matches and ``next`` links to the following page. Items honour
+    ``?fields=``/``?body=``.
     """
-    serializer_class = ArticleSerializer
     permission_classes = [IsReader]
 
-    def get_queryset(self):
-        user = self.request.user
-        return (
+    def get_page_bounds(self, params):
+        """
+        Read ``limit`` and ``offset``.
+
+        Returns:
+            tuple[int, int]: The page size and offset.
+
+        Raises:
+            ValidationError: On non-numeric or negative values.
+        """
+        max_limit = getattr(settings, "SEARCH_MAX_LIMIT", 50)
+        default = settings.REST_FRAMEWORK.get("PAGE_SIZE", 20)
+        try:
+            limit = int(params.get("limit", default))
+            offset = int(params.get("offset", 0))
+        except ValueError:
+            raise ValidationError({"limit": "limit and offset must be integers."})
+        if limit < 1 or offset < 0:
+            raise ValidationError({"limit": "limit must be positive and offset not negative."})
+        return min(limit, max_limit), offset
+
+    def get(self, request):
+        query = request.query_params.get("q", "").strip()
+        if not query:
+            raise ValidationError({"q": "A search query is required."})
+        fields, body_mode = parse_field_selection(request.query_params)
+        limit, offset = self.get_page_bounds(request.query_params)
+
+        ranked, count = search_articles(query, limit=limit, offset=offset)
+        articles = with_feed_columns(
             Article.objects.filter(
-                status=Article.Status.APPROVED,
-                author__in=user.subscribed_journalists.all(),
+                pk__in=[pk for pk, _ in ranked], status=Article.Status.APPROVED
+            ),
+            fields,
+            body_mode,
+        )
+        by_pk = {article.pk: article for article in articles}
+        serializer = FeedArticleSerializer(
+            context={"fields": fields, "body_mode": body_mode}
+        )
+        results = [
+            {**serializer.to_representation(by_pk[pk]), "score": round(score, 6)}
+            for pk, score in ranked
+            if pk in by_pk
+        ]
+
+        next_url = None
+        if offset + limit < count:
+            next_url = replace_query_param(
+                request.build_absolute_uri(), "offset", offset + limit
             )
-            .order_by("-created_at")
-        )
\ No newline at end of file
+        return Response({"query": query, "count": count, "next": next_url, "results": results})
@@ -0,0 +1,24 @@
+from django.urls import path
+
+from . import async_views
+
+app_name = "async"
+
+urlpatterns = [
+    # Public
+    path("", async_views.article_list, name="article_list"),
+    path("articles/<int:pk>/", async_views.article_detail, name="article_detail"),
+
+    # Reader feed API
+    path("api/articles/feed/", async_views.my_feed, name="api_my_feed"),
+    path(
+        "api/articles/feed/publishers/",
+        async_views.my_publisher_feed,
+        name="api_my_publisher_feed",
+    ),
+    path(
+        "api/articles/feed/journalists/",
+        async_views.my_journalist_feed,
+        name="api_my_journalist_feed",
+    ),
+]
\ No newline at end of file
@@ -0,0 +1,216 @@
+"""
+Async (ASGI) versions of the reader feed API and the public article pages.
+
+These views run natively on an ASGI server (e.g. ``uvicorn
+config.asgi:application``) and read the database through Django's async ORM,
+so a worker can hold many slow client connections without a thread each. They
+are mounted under ``/async/`` and return the same bodies and headers as their
+sync counterparts:
+
+- ``/async/api/articles/feed/`` (+ ``publishers/`` and ``journalists/``)
+  mirror ``core.api_views.ReaderFeedAPIView`` including keyset pagination,
+  ``?fields=``/``?body=``, ETag/Last-Modified and the feed page cache.
+- ``/async/`` and ``/async/articles/<pk>/`` mirror ``article_list`` and
+  ``article_detail``.
+
+Authentication is session-based (``request.auser()``); the async API views do
+not run DRF authentication classes or the browsable API renderer.
+"""
+
+from django.http import Http404, HttpResponse
+from django.shortcuts import render
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+from django.utils.safestring import mark_safe
+from rest_framework.exceptions import APIException
+from rest_framework.renderers import JSONRenderer
+
+from .api_permissions import IsReader
+from .detail_cache import aget_article_page
+from .feed_cache import acached_page
+from .feeds import (
+    afeed_validators,
+    areader_feed_queryset,
+    journalist_feed_queryset,
+    publisher_feed_queryset,
+)
+from .homepage import ahomepage_fragment
+from .models import User
+from .pagination import KeysetPagination
+from .serializers import (
+    FeedArticleSerializer,
+    parse_field_selection,
+    with_feed_columns,
+)
+
+
+def _json_response(data, status: int = 200) -> HttpResponse:
+    """
+    Render data exactly like DRF's ``JSONRenderer`` does for the sync API.
+
+    Args:
+        data: JSON-serializable response data.
+        status (int): HTTP status code.
+
+    Returns:
+        HttpResponse: The JSON response.
+    """
+    renderer = JSONRenderer()
+    return HttpResponse(
+        renderer.render(data), status=status, content_type=renderer.media_type
+    )
+
+
+class AsyncReaderFeed:
+    """
+    Async request handler for one reader feed.
+
+    Mirrors ``ReaderFeedAPIView.list``: validate the field selection, answer
+    conditional requests from the feed validators, otherwise serve the page
+    from the feed page cache.
+
+    Args:
+        get_feed_queryset: Coroutine function returning the feed for a reader.
+        feed_sources: Source types the feed's validators depend on.
+        keyset_fields: Keyset columns to page on, or None for the default.
+    """
+
+    def __init__(self, get_feed_queryset, feed_sources, keyset_fields=None):
+        self.get_feed_queryset = get_feed_queryset
+        self.feed_sources = feed_sources
+        self.keyset_fields = keyset_fields
+
+    async def render_page(self, request, user: User, fields, body_mode):
+        """
+        Query and serialize the requested page (a feed cache miss).
+
+        Returns:
+            dict: The paginated response data.
+        """
+        queryset = with_feed_columns(await self.get_feed_queryset(user), fields, body_mode)
+        paginator = KeysetPagination()
+        page = await paginator.apaginate_queryset(queryset, request, view=self)
+        serializer = FeedArticleSerializer(
+            page, many=True, context={"fields": fields, "body_mode": body_mode}
+        )
+        return paginator.get_paginated_response(serializer.data).data
+
+    async def serve(self, request):
+        """
+        Handle one feed request.
+
+        Args:
+            request: Django HttpRequest.
+
+        Returns:
+            HttpResponse: The page, a 304, or a 400/403 error body.
+        """
+        user = await request.auser()
+        request.user = user
+        if not (user.is_authenticated and user.role == User.Role.READER):
+            detail = IsReader.message if user.is_authenticated else (
+                "Authentication credentials were not provided."
+            )
+            return _json_response({"detail": detail}, status=403)
+
+        try:
+            fields, body_mode = parse_field_selection(request.GET)
+        except APIException as exc:
+            return _json_response(exc.detail, status=exc.status_code)
+
+        etag, last_modified = await afeed_validators(
+            user, self.feed_sources, request.get_full_path()
+        )
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+
+        response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+        if response is None:
+            try:
+                data, hit = await acached_page(
+                    etag, lambda: self.render_page(request, user, fields, body_mode)
+                )
+            except APIException as exc:
+                return _json_response(exc.detail, status=exc.status_code)
+            response = _json_response(data)
+            response["X-Feed-Cache"] = "HIT" if hit else "MISS"
+
+        response["ETag"] = etag
+        if timestamp is not None:
+            response["Last-Modified"] = http_date(timestamp)
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+
+async def _publisher_feed(user: User):
+    return publisher_feed_queryset(user)
+
+
+async def _journalist_feed(user: User):
+    return journalist_feed_queryset(user)
+
+
+_MY_FEED = AsyncReaderFeed(
+    areader_feed_queryset,
+    ("publishers", "journalists"),
+    keyset_fields=("feed_created_at", "feed_article_id"),
+)
+_MY_PUBLISHER_FEED = AsyncReaderFeed(_publisher_feed, ("publishers",))
+_MY_JOURNALIST_FEED = AsyncReaderFeed(_journalist_feed, ("journalists",))
+
+
+async def my_feed(request):
+    """
+    Async version of ``MyFeedArticlesAPIView``.
+    """
+    return await _MY_FEED.serve(request)
+
+
+async def my_publisher_feed(request):
+    """
+    Async version of ``MyPublisherArticlesAPIView``.
+    """
+    return await _MY_PUBLISHER_FEED.serve(request)
+
+
+async def my_journalist_feed(request):
+    """
+    Async version of ``MyJournalistArticlesAPIView``.
+    """
+    return await _MY_JOURNALIST_FEED.serve(request)
+
+
+async def article_list(request):
+    """
+    Async version of ``core.views.article_list``.
+
+    Args:
+        request: Django HttpRequest.
+
+    Returns:
+        HttpResponse: Rendered article list.
+    """
+    request.user = await request.auser()
+    page_html, _ = await ahomepage_fragment(request)
+    return render(request, "core/article_list.html", {"page_html": page_html})
+
+
+async def article_detail(request, pk: int):
+    """
+    Async version of ``core.views.article_detail``.
+
+    Args:
+        request: Django HttpRequest.
+        pk (int): Article primary key.
+
+    Returns:
+        HttpResponse: Rendered article detail page.
+
+    Raises:
+        Http404: If no APPROVED article has this primary key.
+    """
+    request.user = await request.auser()
+    page = await aget_article_page(pk)
+    if page is None:
+        raise Http404("No Article matches the given query.")
+    context = {"title": page["title"], "article_html": mark_safe(page["html"])}
+    return render(request, "core/article_detail.html", context)
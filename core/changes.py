@@ -0,0 +1,186 @@
+"""
+Delta sync for reader feeds, driven by the article status event log.
+
+A sync token records the id of the last ``ArticleStatusEvent`` a client has
+seen and when the token was issued. ``reader_changes`` reads only the events
+after it for the reader's subscribed publishers and followed journalists
+(one ``(publisher, id)`` / ``(author, id)`` index range each) and collapses
+them per article into:
+
+- ``inserted``: articles that are APPROVED after the last event (edits of
+  approved articles are logged as APPROVED -> APPROVED events)
+- ``removed``: ids of articles that left APPROVED (retracted or rejected)
+
+so a client applies O(changes) rather than re-downloading its feed. When the
+reader's subscriptions changed after the token was issued the delta cannot
+describe the new sources' back catalogue, and ``resync`` tells the client to
+reload the full feed.
+
+Event ids are allocated when a transaction inserts the row but become visible
+when it commits, so a slow transaction can commit an event below ids that
+readers have already passed. Readers of the log therefore only advance to
+``settled_event_id()``: events younger than ``STATUS_EVENT_SETTLE_SECONDS``
+are left for the next sync.
+"""
+
+import heapq
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from .models import Article, ArticleStatusEvent, User
+from .pagination import FORWARD, decode_cursor, encode_cursor
+
+CHANGES_BATCH_SIZE = 500
+
+
+def encode_token(event_id: int, issued_at) -> str:
+    """
+    Encode a sync position as an opaque token.
+
+    Args:
+        event_id (int): Id of the last event the client has seen.
+        issued_at (datetime): When the position was read.
+
+    Returns:
+        str: The encoded token.
+    """
+    return encode_cursor(FORWARD, issued_at, event_id)
+
+
+def decode_token(token: str):
+    """
+    Decode a token produced by ``encode_token``.
+
+    Args:
+        token (str): The ``?since=`` value.
+
+    Returns:
+        tuple[int, datetime]: Event id and issue time.
+
+    Raises:
+        ValueError: If the token is malformed.
+    """
+    _, issued_at, event_id = decode_cursor(token)
+    return event_id, issued_at
+
+
+def settled_event_id() -> int:
+    """
+    Return the newest event id that every reader of the log may advance to.
+
+    That is the newest event logged at least ``STATUS_EVENT_SETTLE_SECONDS``
+    ago: a lower id still uncommitted would need a transaction open for
+    longer than that. The scan walks the primary key down from the newest
+    event, so it only reads the events of the settle window.
+
+    Returns:
+        int: Event id, or 0 when no event has settled.
+    """
+    settle = getattr(settings, "STATUS_EVENT_SETTLE_SECONDS", 30)
+    cutoff = timezone.now() - timedelta(seconds=settle)
+    return (
+        ArticleStatusEvent.objects.filter(created_at__lte=cutoff)
+        .order_by("-pk")
+        .values_list("pk", flat=True)
+        .first()
+        or 0
+    )
+
+
+def latest_token() -> str:
+    """
+    Return a token positioned after every settled event.
+
+    Returns:
+        str: The sync token.
+    """
+    issued_at = timezone.now()
+    return encode_token(settled_event_id(), issued_at)
+
+
+def _reader_events(reader: User, since: int, until: int, limit: int):
+    """
+    Return the reader's events in ``(since, until]`` in id order.
+
+    Args:
+        reader (User): The reader syncing.
+        since (int): Last event id the client has seen.
+        until (int): Last event id to include.
+        limit (int): Maximum number of events.
+
+    Returns:
+        list[tuple]: ``(id, article_id, previous_status, status)`` rows.
+    """
+    publishers = list(reader.subscribed_publishers.values_list("pk", flat=True))
+    authors = list(reader.subscribed_journalists.values_list("pk", flat=True))
+
+    events = ArticleStatusEvent.objects.filter(pk__gt=since, pk__lte=until).order_by("pk")
+    columns = ("pk", "article_id", "previous_status", "status")
+    streams = []
+    if publishers:
+        streams.append(events.filter(publisher__in=publishers).values_list(*columns)[:limit])
+    if authors:
+        streams.append(events.filter(author__in=authors).values_list(*columns)[:limit])
+
+    rows = []
+    last_pk = None
+    for row in heapq.merge(*streams):
+        if row[0] != last_pk:
+            rows.append(row)
+            last_pk = row[0]
+        if len(rows) == limit:
+            break
+    return rows
+
+
+def reader_changes(reader: User, token: str, limit: int = CHANGES_BATCH_SIZE):
+    """
+    Collect the feed changes relevant to ``reader`` since ``token``.
+
+    Args:
+        reader (User): The reader syncing.
+        token (str): Token from a previous sync.
+        limit (int): Maximum number of events to consume.
+
+    Returns:
+        dict: ``since`` (the next token), ``has_more``, ``resync``,
+        ``inserted`` (article queryset, newest first) and ``removed`` (ids).
+
+    Raises:
+        ValueError: If the token is malformed.
+    """
+    since, issued_at = decode_token(token)
+    now = timezone.now()
+    until = settled_event_id()
+    events = _reader_events(reader, since, until, limit + 1)
+    has_more = len(events) > limit
+    events = events[:limit]
+
+    final_status = {}
+    was_approved = set()
+    for _, article_id, previous_status, status in events:
+        final_status[article_id] = status
+        if Article.Status.APPROVED in (previous_status, status):
+            was_approved.add(article_id)
+
+    inserted = [pk for pk, status in final_status.items() if status == Article.Status.APPROVED]
+    removed = sorted(pk for pk in was_approved if final_status[pk] != Article.Status.APPROVED)
+
+    # Once caught up, the next token skips past every settled event
+    # (including other readers'), and restarts the resync clock.
+    if has_more:
+        next_token = encode_token(events[-1][0], issued_at)
+    else:
+        next_token = encode_token(max(since, until), now)
+
+    return {
+        "since": next_token,
+        "has_more": has_more,
+        "resync": bool(reader.feed_updated_at and reader.feed_updated_at > issued_at),
+        "inserted": Article.objects.filter(
+            pk__in=inserted, status=Article.Status.APPROVED
+        ).order_by("-created_at", "-pk"),
+        "removed": removed,
+    }
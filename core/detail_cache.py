@@ -0,0 +1,384 @@
+"""
+Two-tier read-through cache for article detail pages.
+
+Rendered article content (everything in the detail page's content block,
+including the precomputed related-articles list) is kept in:
+
+1. an in-process LRU with a short TTL (``DETAIL_CACHE_LOCAL_MAX_ENTRIES`` /
+   ``DETAIL_CACHE_LOCAL_TTL``), so hot articles are served without any network
+   round trip, and
+2. the shared feed cache backend (``settings.FEED_CACHE_ALIAS``) for
+   ``DETAIL_CACHE_TIMEOUT`` seconds, so every worker shares one render.
+
+The page shell (navigation, CSRF token) is still rendered per request because
+it depends on the visitor; it needs no queries for anonymous visitors.
+
+Invalidation: saving or deleting an approved article (status or content
+change) stamps a per-article version in the shared cache and drops the local
+entry (``invalidate_article_page``). Shared entries carry the version they
+were built under and are ignored once it changes. A missing version (never
+stamped, or evicted) makes every entry stale; the next build writes a fresh
+one. Other workers' local entries expire within ``DETAIL_CACHE_LOCAL_TTL``.
+
+Stampede protection: within a process, concurrent misses for one article wait
+for a single builder. Across processes, the builder holds a short ``add()``
+lock in the shared cache while the others poll for its result.
+"""
+
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.template.loader import render_to_string
+
+from .feed_cache import get_feed_cache
+from .models import Article
+
+LOCK_TIMEOUT = 5
+POLL_INTERVAL = 0.05
+FRAGMENT_TEMPLATE = "core/article_detail_body.html"
+
+
+class LocalLRU:
+    """
+    Thread-safe in-process LRU cache with a per-entry TTL.
+
+    Args:
+        max_entries (int): Entries kept before the least recently used is evicted.
+        ttl (float): Seconds an entry stays valid.
+    """
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """
+        Return the live value for ``key``, or None.
+        """
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return None
+            expires_at, value = item
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value) -> None:
+        """
+        Store ``value`` under ``key``, evicting the least recently used entry.
+        """
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key) -> None:
+        """
+        Drop ``key`` if present.
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """
+        Drop every entry.
+        """
+        with self._lock:
+            self._entries.clear()
+
+
+local_cache = LocalLRU(
+    getattr(settings, "DETAIL_CACHE_LOCAL_MAX_ENTRIES", 1024),
+    getattr(settings, "DETAIL_CACHE_LOCAL_TTL", 5),
+)
+_inflight = {}
+_inflight_lock = threading.Lock()
+
+
+def _page_key(pk: int) -> str:
+    """
+    Return the shared-cache key of an article's page.
+    """
+    return f"article-page:{pk}"
+
+
+def _version_key(pk: int) -> str:
+    """
+    Return the shared-cache key of an article's version stamp.
+    """
+    return f"article-page-version:{pk}"
+
+
+def _lock_key(pk: int) -> str:
+    """
+    Return the shared-cache key of an article's render lock.
+    """
+    return f"article-page-lock:{pk}"
+
+
+def _timeout() -> int:
+    """
+    Return how long shared-cache pages are kept.
+
+    Returns:
+        int: Seconds.
+    """
+    return getattr(settings, "DETAIL_CACHE_TIMEOUT", 600)
+
+
+def invalidate_article_page(*pks: int) -> None:
+    """
+    Invalidate the cached detail pages of the given articles.
+
+    Args:
+        *pks (int): Article primary keys.
+
+    Returns:
+        None
+    """
+    stamp = time.time_ns()
+    get_feed_cache().set_many({_version_key(pk): stamp for pk in pks}, timeout=None)
+    for pk in pks:
+        local_cache.delete(pk)
+
+
+def detail_queryset():
+    """
+    Return APPROVED articles with publisher and author joined.
+
+    Returns:
+        QuerySet[Article]: The detail page rows.
+    """
+    return Article.objects.filter(status=Article.Status.APPROVED).select_related(
+        "publisher", "author"
+    )
+
+
+def related_queryset(pk: int):
+    """
+    Return the APPROVED articles on an article's related-articles list.
+
+    Reads the list precomputed by ``core.related`` through its unique
+    (article, rank) index.
+
+    Args:
+        pk (int): Article primary key.
+
+    Returns:
+        QuerySet[Article]: Linked articles (pk and title), most similar first.
+    """
+    return (
+        Article.objects.filter(status=Article.Status.APPROVED, linked_from__article_id=pk)
+        .order_by("linked_from__rank")
+        .only("pk", "title")
+    )
+
+
+def _ensure_version(cache, values, pk: int):
+    """
+    Return the article's version stamp, writing a fresh one if it is missing.
+
+    Args:
+        cache: The shared cache.
+        values (dict): Keys already read with ``get_many``.
+        pk (int): Article primary key.
+
+    Returns:
+        int | None: The stamp the page is built under, None if it was evicted
+        again before it could be read back.
+    """
+    version = values.get(_version_key(pk))
+    if version is None:
+        version = time.time_ns()
+        if not cache.add(_version_key(pk), version, timeout=None):
+            version = cache.get(_version_key(pk))
+    return version
+
+
+async def _aensure_version(cache, values, pk: int):
+    """
+    Async version of ``_ensure_version``.
+    """
+    version = values.get(_version_key(pk))
+    if version is None:
+        version = time.time_ns()
+        if not await cache.aadd(_version_key(pk), version, timeout=None):
+            version = await cache.aget(_version_key(pk))
+    return version
+
+
+def _build_entry(article, version, related=()) -> dict:
+    """
+    Render the cacheable part of a detail page.
+
+    Args:
+        article (Article | None): The article, or None if it is not visible.
+        version: Version stamp read before the article was loaded.
+        related (list[Article]): The article's related articles.
+
+    Returns:
+        dict: ``title``, ``html`` and ``version``. Missing articles are cached
+        too (``html`` None) so concurrent 404s also share one query.
+    """
+    if article is None:
+        return {"title": None, "html": None, "version": version}
+    return {
+        "title": article.title,
+        "html": render_to_string(
+            FRAGMENT_TEMPLATE, {"article": article, "related": related}
+        ),
+        "version": version,
+    }
+
+
+def _visible(entry):
+    """
+    Map a cache entry to the public result.
+
+    Returns:
+        dict | None: The entry, or None if it records a missing article.
+    """
+    if entry is None or entry["html"] is None:
+        return None
+    return entry
+
+
+def _fresh(values, pk: int):
+    """
+    Return the shared entry in ``values`` if its version is current.
+
+    An entry is never current without a version stamp: the stamp may have
+    been evicted after an invalidation.
+
+    Returns:
+        dict | None: The entry.
+    """
+    entry = values.get(_page_key(pk))
+    version = values.get(_version_key(pk))
+    if entry is not None and version is not None and entry["version"] == version:
+        return entry
+    return None
+
+
+def _read_through_shared(pk: int):
+    """
+    Fetch an article page from the shared cache, building it on a miss.
+
+    Returns:
+        dict: The page entry.
+    """
+    cache = get_feed_cache()
+    keys = [_page_key(pk), _version_key(pk)]
+    values = cache.get_many(keys)
+    entry = _fresh(values, pk)
+    if entry is not None:
+        return entry
+
+    locked = cache.add(_lock_key(pk), 1, timeout=LOCK_TIMEOUT)
+    if not locked:
+        # Another process is rendering this page; wait for its result.
+        deadline = time.monotonic() + LOCK_TIMEOUT
+        while time.monotonic() < deadline:
+            time.sleep(POLL_INTERVAL)
+            values = cache.get_many(keys)
+            entry = _fresh(values, pk)
+            if entry is not None:
+                return entry
+
+    try:
+        version = _ensure_version(cache, values, pk)
+        article = detail_queryset().filter(pk=pk).first()
+        related = list(related_queryset(pk)) if article is not None else []
+        entry = _build_entry(article, version, related)
+        cache.set(_page_key(pk), entry, timeout=_timeout())
+        return entry
+    finally:
+        if locked:
+            cache.delete(_lock_key(pk))
+
+
+def get_article_page(pk: int):
+    """
+    Return the rendered detail page entry for an APPROVED article.
+
+    Args:
+        pk (int): Article primary key.
+
+    Returns:
+        dict | None: ``title`` and ``html``; None if no APPROVED article has ``pk``.
+    """
+    entry = local_cache.get(pk)
+    if entry is not None:
+        return _visible(entry)
+
+    with _inflight_lock:
+        done = _inflight.get(pk)
+        leader = done is None
+        if leader:
+            done = _inflight[pk] = threading.Event()
+
+    if not leader:
+        done.wait(LOCK_TIMEOUT)
+        return _visible(local_cache.get(pk) or _read_through_shared(pk))
+
+    try:
+        entry = _read_through_shared(pk)
+        local_cache.set(pk, entry)
+        return _visible(entry)
+    finally:
+        with _inflight_lock:
+            _inflight.pop(pk, None)
+        done.set()
+
+
+async def aget_article_page(pk: int):
+    """
+    Async version of ``get_article_page`` using the async ORM and cache API.
+
+    Concurrent misses within the process are not coalesced; the shared-cache
+    lock still allows only one render at a time per article.
+
+    Returns:
+        dict | None: ``title`` and ``html``; None if no APPROVED article has ``pk``.
+    """
+    entry = local_cache.get(pk)
+    if entry is not None:
+        return _visible(entry)
+
+    cache = get_feed_cache()
+    keys = [_page_key(pk), _version_key(pk)]
+    values = await cache.aget_many(keys)
+    entry = _fresh(values, pk)
+
+    locked = False
+    if entry is None:
+        locked = await cache.aadd(_lock_key(pk), 1, timeout=LOCK_TIMEOUT)
+        if not locked:
+            deadline = time.monotonic() + LOCK_TIMEOUT
+            while entry is None and time.monotonic() < deadline:
+                await asyncio.sleep(POLL_INTERVAL)
+                values = await cache.aget_many(keys)
+                entry = _fresh(values, pk)
+
+    if entry is None:
+        try:
+            version = await _aensure_version(cache, values, pk)
+            article = await detail_queryset().filter(pk=pk).afirst()
+            related = [item async for item in related_queryset(pk)] if article else []
+            entry = _build_entry(article, version, related)
+            await cache.aset(_page_key(pk), entry, timeout=_timeout())
+        finally:
+            if locked:
+                await cache.adelete(_lock_key(pk))
+
+    local_cache.set(pk, entry)
+    return _visible(entry)
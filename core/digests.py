@@ -0,0 +1,201 @@
+"""
+Hourly and daily notification digests.
+
+Readers whose ``notification_delivery`` is HOURLY or DAILY are left out of
+the per-approval emails (``core.moderation.notification_audience`` only
+selects IMMEDIATE readers). Nothing is written per reader when an article is
+approved: the approval's row in the article status event log is the only
+record a digest needs.
+
+``send_digests`` (run from cron through ``manage.py send_digests``) takes the
+APPROVED events logged since the schedule's previous run, up to
+``core.changes.settled_event_id`` (a late-committing event waits for the next
+run instead of being skipped), loads the articles that are still APPROVED
+once, then walks that schedule's readers in id order in batches of
+``DIGEST_READER_BATCH_SIZE``: one audience query per batch yields each
+reader's articles, and the batch's messages (one per reader) go out over a
+single shared mail connection. Memory is bounded by the articles
+in the window plus one reader batch. Progress is kept in ``DigestCursor``
+after every sent batch.
+"""
+
+from datetime import timedelta
+from itertools import groupby
+from operator import itemgetter
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.utils import timezone
+
+from .changes import settled_event_id
+from .mailer import send_batched
+from .models import Article, ArticleStatusEvent, DigestCursor, User
+from .moderation import notification_audience
+
+DIGEST_PERIODS = {
+    User.Delivery.HOURLY: timedelta(hours=1),
+    User.Delivery.DAILY: timedelta(days=1),
+}
+
+
+def _get_cursor(delivery: str) -> DigestCursor:
+    """
+    Return the schedule's cursor; a new schedule starts one period back.
+
+    Returns:
+        DigestCursor: The cursor.
+    """
+    cursor = DigestCursor.objects.filter(delivery=delivery).first()
+    if cursor is not None:
+        return cursor
+    before = (
+        ArticleStatusEvent.objects.filter(created_at__lt=timezone.now() - DIGEST_PERIODS[delivery])
+        .order_by("-pk")
+        .values_list("pk", flat=True)
+        .first()
+    )
+    cursor, _ = DigestCursor.objects.get_or_create(
+        delivery=delivery, defaults={"last_event_id": before or 0}
+    )
+    return cursor
+
+
+def _window_articles(since: int, until: int) -> dict:
+    """
+    Load the articles approved by events in ``(since, until]``.
+
+    Articles that have since left APPROVED are dropped.
+
+    Returns:
+        dict[int, Article]: Articles by pk (publisher/author loaded).
+    """
+    article_ids = set(
+        ArticleStatusEvent.objects.filter(
+            pk__gt=since, pk__lte=until, status=Article.Status.APPROVED
+        ).values_list("article_id", flat=True)
+    )
+    articles = Article.objects.filter(
+        pk__in=article_ids, status=Article.Status.APPROVED
+    ).select_related("publisher", "author")
+    return {article.pk: article for article in articles}
+
+
+def _reader_batches(delivery: str, after: int, size: int):
+    """
+    Yield ids of the readers on a digest schedule, in batches, by id.
+
+    Args:
+        delivery (str): The schedule.
+        after (int): Resume after this reader id.
+        size (int): Readers per batch.
+
+    Returns:
+        Iterator[list[int]]: Reader id batches.
+    """
+    readers = User.objects.filter(notification_delivery=delivery).order_by("pk")
+    while batch := list(readers.filter(pk__gt=after).values_list("pk", flat=True)[:size]):
+        yield batch
+        after = batch[-1]
+
+
+def render_digest(delivery: str, email: str, articles) -> EmailMessage:
+    """
+    Render one reader's digest, newest articles first.
+
+    Args:
+        delivery (str): HOURLY or DAILY.
+        email (str): The reader's address.
+        articles (list[Article]): Articles to include.
+
+    Returns:
+        EmailMessage: The digest.
+    """
+    articles = sorted(articles, key=lambda a: (a.created_at, a.pk), reverse=True)
+    limit = getattr(settings, "DIGEST_MAX_ARTICLES", 50)
+    lines = "\n".join(
+        f"- {a.title} by {a.author.username} ({a.publisher.name}): "
+        f"http://127.0.0.1:8000/articles/{a.pk}/"
+        for a in articles[:limit]
+    )
+    if len(articles) > limit:
+        lines += f"\n… and {len(articles) - limit} more on http://127.0.0.1:8000/"
+    period = "hourly" if delivery == User.Delivery.HOURLY else "daily"
+    return EmailMessage(
+        f"Your {period} digest: {len(articles)} new article(s)",
+        f"Hi,\n\nNew articles from publishers and journalists you follow:\n\n{lines}\n\n"
+        "Regards,\nNews App",
+        settings.DEFAULT_FROM_EMAIL,
+        [email],
+    )
+
+
+def _batch_messages(delivery: str, articles: dict, reader_ids) -> list:
+    """
+    Render the digests of one reader batch.
+
+    Returns:
+        list[EmailMessage]: One message per reader with news.
+    """
+    rows = notification_audience(list(articles), delivery=delivery, reader_ids=reader_ids)
+    return [
+        render_digest(delivery, email, [articles[pk] for _, _, pk in matches])
+        for (_, email), matches in groupby(rows, key=itemgetter(0, 1))
+    ]
+
+
+def send_digests(delivery: str, batch_size: int | None = None) -> dict:
+    """
+    Send the digests due on one schedule.
+
+    Call once per period (hourly or daily); each run covers the approvals
+    logged since the previous completed run (the first run covers the last
+    period). An interrupted run is resumed
+    with the same window and skips the reader batches already sent.
+
+    Args:
+        delivery (str): HOURLY or DAILY.
+        batch_size (int): Readers per database pass; defaults to
+            ``DIGEST_READER_BATCH_SIZE``.
+
+    Returns:
+        dict: ``articles`` in the window, ``messages``, ``recipients``,
+        ``batches`` (send calls), ``seconds`` and ``per_second``.
+
+    Raises:
+        ValueError: If ``delivery`` is not a digest schedule.
+    """
+    if delivery not in DIGEST_PERIODS:
+        raise ValueError(f"Not a digest schedule: {delivery}")
+    batch_size = batch_size or getattr(settings, "DIGEST_READER_BATCH_SIZE", 1000)
+
+    cursor = _get_cursor(delivery)
+    if cursor.pending_event_id is None:
+        cursor.pending_event_id = max(cursor.last_event_id, settled_event_id())
+        cursor.last_reader_id = 0
+        cursor.save(update_fields=["pending_event_id", "last_reader_id"])
+
+    articles = _window_articles(cursor.last_event_id, cursor.pending_event_id)
+    totals = {"messages": 0, "recipients": 0, "batches": 0, "seconds": 0.0}
+    if articles:
+        with get_connection() as connection:
+            for reader_ids in _reader_batches(delivery, cursor.last_reader_id, batch_size):
+                stats = send_batched(
+                    _batch_messages(delivery, articles, reader_ids), connection=connection
+                )
+                for key in totals:
+                    totals[key] += stats[key]
+                cursor.last_reader_id = reader_ids[-1]
+                cursor.save(update_fields=["last_reader_id"])
+
+    cursor.last_event_id = cursor.pending_event_id
+    cursor.pending_event_id = None
+    cursor.last_reader_id = 0
+    cursor.completed_at = timezone.now()
+    cursor.save()
+
+    seconds = totals["seconds"]
+    return {
+        "articles": len(articles),
+        **totals,
+        "per_second": totals["messages"] / seconds if seconds else 0.0,
+    }
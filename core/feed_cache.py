@@ -0,0 +1,143 @@
+"""
+Rendered-page cache for the reader feed API.
+
+Pages are stored under their ETag (see ``core.feeds.feed_validators``), which
+already hashes the reader, the page URL and the feed versions of every source
+the page depends on. Events that change a feed (approvals, retractions and
+edits of approved articles, subscription toggles) bump those versions, so the
+next request computes a new key and stale pages are simply never read again;
+they age out via ``FEED_CACHE_TIMEOUT``. Nothing has to enumerate and delete
+the affected readers' entries.
+
+The backend is the ``settings.FEED_CACHE_ALIAS`` entry of ``CACHES``
+(local-memory by default; point it at Redis/Memcached to share it between
+workers). Hit and miss counters live in the same backend.
+"""
+
+from django.conf import settings
+from django.core.cache import caches
+
+HITS_KEY = "feed-cache:hits"
+MISSES_KEY = "feed-cache:misses"
+
+
+def get_feed_cache():
+    """
+    Return the configured feed cache backend.
+
+    Returns:
+        BaseCache: The Django cache used for feed pages.
+    """
+    return caches[getattr(settings, "FEED_CACHE_ALIAS", "default")]
+
+
+def _count(key: str) -> None:
+    """
+    Increment a hit/miss counter, creating it on first use.
+
+    Args:
+        key (str): Counter key.
+
+    Returns:
+        None
+    """
+    cache = get_feed_cache()
+    cache.add(key, 0, timeout=None)
+    try:
+        cache.incr(key)
+    except ValueError:
+        # Evicted between add() and incr(); start counting again.
+        cache.set(key, 1, timeout=None)
+
+
+def cached_page(etag: str, build):
+    """
+    Return the cached page data for ``etag``, building and storing it on a miss.
+
+    Args:
+        etag (str): The page's quoted ETag.
+        build: Callable returning the serialized page data.
+
+    Returns:
+        tuple[object, bool]: The page data and whether it was a cache hit.
+    """
+    cache = get_feed_cache()
+    key = f"feed-page:{etag.strip(chr(34))}"
+
+    data = cache.get(key)
+    if data is not None:
+        _count(HITS_KEY)
+        return data, True
+
+    _count(MISSES_KEY)
+    data = build()
+    cache.set(key, data, timeout=getattr(settings, "FEED_CACHE_TIMEOUT", 300))
+    return data, False
+
+
+async def _acount(key: str) -> None:
+    """
+    Async version of ``_count``.
+
+    Returns:
+        None
+    """
+    cache = get_feed_cache()
+    await cache.aadd(key, 0, timeout=None)
+    try:
+        await cache.aincr(key)
+    except ValueError:
+        await cache.aset(key, 1, timeout=None)
+
+
+async def acached_page(etag: str, build):
+    """
+    Async version of ``cached_page``.
+
+    Args:
+        etag (str): The page's quoted ETag.
+        build: Coroutine function returning the serialized page data.
+
+    Returns:
+        tuple[object, bool]: The page data and whether it was a cache hit.
+    """
+    cache = get_feed_cache()
+    key = f"feed-page:{etag.strip(chr(34))}"
+
+    data = await cache.aget(key)
+    if data is not None:
+        await _acount(HITS_KEY)
+        return data, True
+
+    await _acount(MISSES_KEY)
+    data = await build()
+    await cache.aset(key, data, timeout=getattr(settings, "FEED_CACHE_TIMEOUT", 300))
+    return data, False
+
+
+def cache_stats() -> dict:
+    """
+    Return hit/miss counters for sizing the cache.
+
+    Returns:
+        dict: ``hits``, ``misses`` and ``hit_ratio`` (None before any lookup).
+    """
+    counters = get_feed_cache().get_many([HITS_KEY, MISSES_KEY])
+    hits = counters.get(HITS_KEY, 0)
+    misses = counters.get(MISSES_KEY, 0)
+    total = hits + misses
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_ratio": round(hits / total, 4) if total else None,
+    }
+
+
+def reset_stats() -> None:
+    """
+    Reset the hit/miss counters.
+
+    Returns:
+        None
+    """
+    get_feed_cache().delete_many([HITS_KEY, MISSES_KEY])
@@ -0,0 +1,718 @@
+"""
+Materialized reader timelines for the News App.
+
+Approved articles are pushed into a per-reader ``TimelineEntry`` table when
+they are approved (fan-out on write). Publishers and journalists whose audience
+exceeds ``settings.FEED_FANOUT_MAX_AUDIENCE`` are switched to pull mode
+(``fan_out_on_read``): their articles are not copied into every timeline and
+are merged in when the feed is read instead.
+
+Feed versions: every publisher and journalist carries a ``feed_version``
+counter bumped when its approved articles change, and every reader one bumped
+when their subscriptions change. ``feed_validators`` combines them into an
+ETag/Last-Modified pair without reading the Article table.
+
+Pulled sources are read as separate newest-first streams, each on its own
+index range, and combined with a k-way merge (``MergedFeed``) rather than one
+OR query that needs DISTINCT and a temporary-table sort.
+"""
+
+import hashlib
+import heapq
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F, Q
+from django.utils import timezone
+
+from .models import Article, Publisher, TimelineEntry, User
+
+FANOUT_BATCH_SIZE = 1000
+
+
+def _max_audience() -> int:
+    """
+    Return the audience size above which a source is merged at read time.
+
+    Returns:
+        int: Maximum number of readers a single approval fans out to.
+    """
+    return getattr(settings, "FEED_FANOUT_MAX_AUDIENCE", 10000)
+
+
+def _switch_to_pull_if_large(source, audience) -> None:
+    """
+    Flag a publisher or journalist as pull-mode once its audience is too large.
+
+    Switching only ever goes push -> pull here; existing timeline rows for the
+    source stay valid and are deduplicated against the pulled articles.
+    ``rebuild_timelines`` recomputes the flags in both directions.
+
+    Args:
+        source: A Publisher or journalist User.
+        audience: Related manager of readers following the source.
+
+    Returns:
+        None
+    """
+    if source.fan_out_on_read or audience.count() <= _max_audience():
+        return
+    type(source).objects.filter(pk=source.pk).update(fan_out_on_read=True)
+    source.fan_out_on_read = True
+
+
+def keyset_batches(*querysets, size: int = FANOUT_BATCH_SIZE):
+    """
+    Read ``values_list`` querysets (``pk`` first) in pk order, in batches.
+
+    Every batch is its own bounded keyset query (``pk > last ORDER BY pk
+    LIMIT size``) rather than one ``QuerySet.iterator()``, which mysqlclient
+    buffers whole client-side. Several querysets are UNIONed (duplicates
+    removed) with the same bound applied to each.
+
+    Args:
+        *querysets: ``values_list`` querysets selecting ``pk`` first.
+        size (int): Rows per batch.
+
+    Returns:
+        Iterator[list[tuple]]: Row batches.
+    """
+    after = 0
+    while True:
+        branches = [queryset.filter(pk__gt=after) for queryset in querysets]
+        query = branches[0].union(*branches[1:]) if len(branches) > 1 else branches[0]
+        batch = list(query.order_by("pk")[:size])
+        if not batch:
+            return
+        yield batch
+        after = batch[-1][0]
+
+
+def _bulk_insert(rows) -> int:
+    """
+    Insert timeline rows in bounded batches, skipping rows that already exist.
+
+    Args:
+        rows: Iterable of unsaved TimelineEntry instances.
+
+    Returns:
+        int: Number of rows handed to the database.
+    """
+    total = 0
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= FANOUT_BATCH_SIZE:
+            TimelineEntry.objects.bulk_create(batch, ignore_conflicts=True)
+            total += len(batch)
+            batch = []
+    if batch:
+        TimelineEntry.objects.bulk_create(batch, ignore_conflicts=True)
+        total += len(batch)
+    return total
+
+
+def fan_out_article(article: Article) -> int:
+    """
+    Push a newly approved article into the timelines of its audience.
+
+    The audience is the subscribers of the article's publisher plus the
+    followers of its author, skipping any source in pull mode.
+
+    Args:
+        article (Article): An APPROVED article.
+
+    Returns:
+        int: Number of timeline rows written.
+    """
+    publisher = article.publisher
+    author = article.author
+
+    _switch_to_pull_if_large(publisher, publisher.subscribers)
+    _switch_to_pull_if_large(author, author.followers)
+
+    audiences = []
+    if not publisher.fan_out_on_read:
+        audiences.append(publisher.subscribers.values_list("pk"))
+    if not author.fan_out_on_read:
+        audiences.append(author.followers.values_list("pk"))
+    if not audiences:
+        return 0
+
+    rows = (
+        TimelineEntry(reader_id=reader_id, article=article, created_at=article.created_at)
+        for batch in keyset_batches(*audiences)
+        for (reader_id,) in batch
+    )
+    return _bulk_insert(rows)
+
+
+def retract_article(*articles: Article) -> None:
+    """
+    Remove articles that left the APPROVED state from every timeline.
+
+    Args:
+        *articles (Article): The articles that are no longer approved.
+
+    Returns:
+        None
+    """
+    TimelineEntry.objects.filter(article__in=[article.pk for article in articles]).delete()
+
+
+def rebuild_reader_timeline(reader: User) -> int:
+    """
+    Recompute one reader's timeline from their current subscriptions.
+
+    Called by ``rebuild_timelines`` and the seeding helpers; subscription
+    toggles only touch the toggled source's rows (``note_subscriptions_changed``).
+
+    Args:
+        reader (User): The reader whose timeline is rebuilt.
+
+    Returns:
+        int: Number of timeline rows written.
+    """
+    articles = (
+        Article.objects.filter(status=Article.Status.APPROVED)
+        .filter(
+            Q(publisher__in=reader.subscribed_publishers.filter(fan_out_on_read=False))
+            | Q(author__in=reader.subscribed_journalists.filter(fan_out_on_read=False))
+        )
+        .values_list("pk", "created_at")
+    )
+    rows = (
+        TimelineEntry(reader=reader, article_id=pk, created_at=created_at)
+        for batch in keyset_batches(articles)
+        for pk, created_at in batch
+    )
+    with transaction.atomic():
+        TimelineEntry.objects.filter(reader=reader).delete()
+        return _bulk_insert(rows)
+
+
+def recompute_fan_out_modes() -> None:
+    """
+    Re-evaluate push/pull mode for every publisher and journalist.
+
+    Unlike the approval path this can switch a source back to push mode, so
+    it must be followed by a full timeline rebuild.
+
+    Returns:
+        None
+    """
+    limit = _max_audience()
+    for model, audience in ((Publisher, "subscribers"), (User, "followers")):
+        large_ids = list(
+            model.objects.alias(n=Count(audience, distinct=True))
+            .filter(n__gt=limit)
+            .values_list("pk", flat=True)
+        )
+        model.objects.filter(pk__in=large_ids).update(fan_out_on_read=True)
+        model.objects.exclude(pk__in=large_ids).update(fan_out_on_read=False)
+
+
+def _bump_version(queryset) -> None:
+    """
+    Increment ``feed_version`` and stamp ``feed_updated_at`` on matching rows.
+
+    Args:
+        queryset: Publisher or User rows to bump.
+
+    Returns:
+        None
+    """
+    queryset.update(feed_version=F("feed_version") + 1, feed_updated_at=timezone.now())
+
+
+def bump_source_versions(*articles: Article) -> None:
+    """
+    Record that the published content of the articles' sources changed.
+
+    Called when articles are approved, retracted or edited while approved.
+    Costs one UPDATE per source type however many articles are given.
+
+    Args:
+        *articles (Article): The changed articles.
+
+    Returns:
+        None
+    """
+    _bump_version(Publisher.objects.filter(pk__in={a.publisher_id for a in articles}))
+    _bump_version(User.objects.filter(pk__in={a.author_id for a in articles}))
+
+
+def _source_field(source) -> str:
+    """
+    Return the Article field that points at a publisher or journalist.
+
+    Returns:
+        str: ``"publisher"`` or ``"author"``.
+    """
+    return "publisher" if isinstance(source, Publisher) else "author"
+
+
+def add_source_to_timeline(reader: User, source) -> int:
+    """
+    Backfill a newly followed source's approved articles into a timeline.
+
+    Pull-mode sources are merged at read time and write nothing.
+
+    Args:
+        reader (User): The reader who subscribed or followed.
+        source: The Publisher or journalist User.
+
+    Returns:
+        int: Number of timeline rows handed to the database.
+    """
+    if source.fan_out_on_read:
+        return 0
+    articles = Article.objects.filter(
+        status=Article.Status.APPROVED, **{_source_field(source): source}
+    ).values_list("pk", "created_at")
+    return _bulk_insert(
+        TimelineEntry(reader=reader, article_id=pk, created_at=created_at)
+        for batch in keyset_batches(articles)
+        for pk, created_at in batch
+    )
+
+
+def remove_source_from_timeline(reader: User, source) -> int:
+    """
+    Drop an unfollowed source's articles from a timeline.
+
+    Rows still covered by another subscription (the article's publisher or
+    author is still followed) are kept.
+
+    Args:
+        reader (User): The reader who unsubscribed or unfollowed.
+        source: The Publisher or journalist User.
+
+    Returns:
+        int: Number of timeline rows deleted.
+    """
+    deleted, _ = (
+        TimelineEntry.objects.filter(reader=reader, **{f"article__{_source_field(source)}": source})
+        .exclude(article__publisher__in=reader.subscribed_publishers.all())
+        .exclude(article__author__in=reader.subscribed_journalists.all())
+        .delete()
+    )
+    return deleted
+
+
+def note_subscriptions_changed(reader: User, source, subscribed: bool) -> None:
+    """
+    Update a reader's timeline and feed version after a subscription change.
+
+    Only the toggled source's rows are inserted or deleted; the full rebuild
+    is left to ``rebuild_timelines``.
+
+    Args:
+        reader (User): The reader who subscribed/unsubscribed or (un)followed.
+        source: The Publisher or journalist User that was toggled.
+        subscribed (bool): True for a new subscription/follow.
+
+    Returns:
+        None
+    """
+    with transaction.atomic():
+        if subscribed:
+            add_source_to_timeline(reader, source)
+        else:
+            remove_source_from_timeline(reader, source)
+        _bump_version(User.objects.filter(pk=reader.pk))
+
+
+def _validator_source_rows(reader: User, source: str):
+    """
+    Return the (pk, feed_version, feed_updated_at) query for one source type.
+
+    Args:
+        reader (User): The reader requesting the feed.
+        source (str): ``"publishers"`` or ``"journalists"``.
+
+    Returns:
+        QuerySet: Version rows of the reader's subscribed sources.
+    """
+    related = {
+        "publishers": reader.subscribed_publishers,
+        "journalists": reader.subscribed_journalists,
+    }
+    return related[source].order_by("pk").values_list("pk", "feed_version", "feed_updated_at")
+
+
+def _combine_validators(reader: User, source_rows, key: str):
+    """
+    Hash the reader's and sources' versions into an ETag/Last-Modified pair.
+
+    Args:
+        reader (User): The reader requesting the feed.
+        source_rows: ``(source, rows)`` pairs of loaded version rows.
+        key (str): Extra request detail that selects the page (path + query).
+
+    Returns:
+        tuple[str, datetime | None]: Quoted ETag and Last-Modified time.
+    """
+    parts = [str(reader.pk), str(reader.feed_version), str(reader.feed_updated_at), key]
+    timestamps = [reader.feed_updated_at]
+
+    for source, rows in source_rows:
+        for pk, version, updated_at in rows:
+            parts.append(f"{source[0]}{pk}.{version}.{updated_at}")
+            timestamps.append(updated_at)
+
+    etag = hashlib.md5("|".join(parts).encode("utf-8"), usedforsecurity=False).hexdigest()
+    last_modified = max((ts for ts in timestamps if ts is not None), default=None)
+    return f'"{etag}"', last_modified
+
+
+def feed_validators(reader: User, sources, key: str = ""):
+    """
+    Compute conditional-GET validators for one of the reader's feeds.
+
+    Reads only the reader row (already loaded for authentication) and the
+    versions of the subscribed sources, never the Article table.
+
+    Args:
+        reader (User): The reader requesting the feed.
+        sources: Any of ``"publishers"`` and ``"journalists"``.
+        key (str): Extra request detail that selects the page (path + query).
+
+    Returns:
+        tuple[str, datetime | None]: Quoted ETag and Last-Modified time.
+    """
+    source_rows = [
+        (source, list(_validator_source_rows(reader, source))) for source in sources
+    ]
+    return _combine_validators(reader, source_rows, key)
+
+
+async def afeed_validators(reader: User, sources, key: str = ""):
+    """
+    Async version of ``feed_validators`` using the async ORM.
+
+    Returns:
+        tuple[str, datetime | None]: Quoted ETag and Last-Modified time.
+    """
+    source_rows = [
+        (source, [row async for row in _validator_source_rows(reader, source)])
+        for source in sources
+    ]
+    return _combine_validators(reader, source_rows, key)
+
+
+class MergedFeed:
+    """
+    Newest-first union of several Article querysets, merged in Python.
+
+    Each stream is read on its own index range (``ORDER BY ... LIMIT n``) and
+    the rows are combined with a heap-based k-way merge that drops duplicate
+    article ids and stops once the requested slice is full.
+
+    Supports the part of the QuerySet API that the feed views use:
+    ``filter()``, ``order_by()``, ``select_related()``, ``only()``,
+    ``annotate()``, ``[:n]`` and iteration.
+    Every stream must expose the same two ordering attributes.
+    """
+
+    def __init__(self, streams, order=("-feed_created_at", "-feed_article_id")):
+        """
+        Args:
+            streams: Article querysets to merge.
+            order (tuple[str, str]): Ordering applied to every stream.
+        """
+        self.order = tuple(order)
+        self.streams = [stream.order_by(*self.order) for stream in streams]
+
+    def filter(self, *args, **kwargs) -> "MergedFeed":
+        """
+        Apply the same filter to every stream.
+
+        Returns:
+            MergedFeed: A new merged feed.
+        """
+        return MergedFeed([s.filter(*args, **kwargs) for s in self.streams], self.order)
+
+    def select_related(self, *fields) -> "MergedFeed":
+        """
+        Apply the same ``select_related`` to every stream.
+
+        Returns:
+            MergedFeed: A new merged feed.
+        """
+        return MergedFeed([s.select_related(*fields) for s in self.streams], self.order)
+
+    def only(self, *fields) -> "MergedFeed":
+        """
+        Apply the same ``only`` to every stream.
+
+        Returns:
+            MergedFeed: A new merged feed.
+        """
+        return MergedFeed([s.only(*fields) for s in self.streams], self.order)
+
+    def annotate(self, **annotations) -> "MergedFeed":
+        """
+        Apply the same annotations to every stream.
+
+        Returns:
+            MergedFeed: A new merged feed.
+        """
+        return MergedFeed([s.annotate(**annotations) for s in self.streams], self.order)
+
+    def order_by(self, *fields) -> "MergedFeed":
+        """
+        Reorder every stream; all fields must share one direction.
+
+        Returns:
+            MergedFeed: A new merged feed.
+        """
+        return MergedFeed(self.streams, fields)
+
+    def _merge(self, iterables, limit=None):
+        """
+        Heap-merge sorted row iterables, skipping repeated article ids.
+
+        Args:
+            iterables: Row iterables, each sorted by ``self.order``.
+            limit (int | None): Stop after this many unique rows.
+
+        Yields:
+            Article: Unique rows in merged order.
+        """
+        names = [field.lstrip("-") for field in self.order]
+        descending = self.order[0].startswith("-")
+        seen = set()
+        merged = heapq.merge(
+            *iterables,
+            key=lambda row: tuple(getattr(row, name) for name in names),
+            reverse=descending,
+        )
+        for row in merged:
+            if row.pk in seen:
+                continue
+            seen.add(row.pk)
+            yield row
+            if limit is not None and len(seen) >= limit:
+                return
+
+    def __getitem__(self, item):
+        """
+        Return the first ``item.stop`` merged rows (only ``[:n]`` is supported).
+
+        Returns:
+            list[Article]: The merged rows.
+        """
+        if not isinstance(item, slice) or item.start or item.step or item.stop is None:
+            raise TypeError("MergedFeed only supports [:n] slicing.")
+        return list(self._merge([s[: item.stop] for s in self.streams], item.stop))
+
+    async def afetch(self, limit: int):
+        """
+        Async equivalent of ``self[:limit]`` using the async ORM.
+
+        Args:
+            limit (int): Maximum number of merged rows.
+
+        Returns:
+            list[Article]: The merged rows.
+        """
+        fetched = [[row async for row in s[:limit]] for s in self.streams]
+        return list(self._merge(fetched, limit))
+
+    def __iter__(self):
+        """
+        Iterate the full merged feed, streaming rows from each source.
+
+        Yields:
+            Article: Unique rows in merged order.
+        """
+        return self._merge([s.iterator() for s in self.streams])
+
+
+def _timeline_stream(reader: User):
+    """
+    Return the reader's fanned-out articles, keyed on the timeline columns.
+
+    Returns:
+        QuerySet[Article]: APPROVED articles annotated with the feed keyset.
+    """
+    return Article.objects.filter(
+        status=Article.Status.APPROVED,
+        timeline_entries__reader=reader,
+    ).annotate(
+        feed_created_at=F("timeline_entries__created_at"),
+        feed_article_id=F("timeline_entries__article_id"),
+    )
+
+
+def _source_stream(**source_filter):
+    """
+    Return APPROVED articles from pulled sources, keyed on the article columns.
+
+    Args:
+        **source_filter: ``publisher__in=...`` or ``author__in=...``.
+
+    Returns:
+        QuerySet[Article]: Articles annotated with the feed keyset.
+    """
+    return Article.objects.filter(
+        status=Article.Status.APPROVED, **source_filter
+    ).annotate(feed_created_at=F("created_at"), feed_article_id=F("pk"))
+
+
+def _pulled_sources(reader: User):
+    """
+    Return queries for the reader's subscribed sources that are in pull mode.
+
+    Returns:
+        tuple[QuerySet, QuerySet]: Publisher ids and journalist ids.
+    """
+    return (
+        reader.subscribed_publishers.filter(fan_out_on_read=True).values_list("pk", flat=True),
+        reader.subscribed_journalists.filter(fan_out_on_read=True).values_list("pk", flat=True),
+    )
+
+
+def _build_reader_feed(reader: User, pulled_publishers, pulled_authors):
+    """
+    Assemble the combined feed from the timeline and any pulled sources.
+
+    Args:
+        reader (User): The reader requesting the feed.
+        pulled_publishers (list[int]): Subscribed publishers in pull mode.
+        pulled_authors (list[int]): Followed journalists in pull mode.
+
+    Returns:
+        QuerySet[Article] | MergedFeed: APPROVED articles ordered newest first.
+    """
+    order = ("-feed_created_at", "-feed_article_id")
+    if not pulled_publishers and not pulled_authors:
+        return _timeline_stream(reader).order_by(*order)
+
+    streams = [_timeline_stream(reader)]
+    if pulled_publishers:
+        streams.append(_source_stream(publisher__in=pulled_publishers))
+    if pulled_authors:
+        streams.append(_source_stream(author__in=pulled_authors))
+    return MergedFeed(streams, order)
+
+
+def reader_feed_queryset(reader: User):
+    """
+    Return the reader's combined feed of APPROVED articles, newest first.
+
+    Reads the reader's timeline range. If the reader follows sources in pull
+    mode, their articles are read as separate streams and merged in with
+    ``MergedFeed``.
+
+    Rows are annotated with ``feed_created_at``/``feed_article_id`` (the
+    keyset columns ``MyFeedArticlesAPIView`` pages on). For timeline rows these
+    come from the timeline itself, so the range predicate and ORDER BY are
+    served by ``timeline_reader_recent_idx``.
+
+    Args:
+        reader (User): The reader requesting the feed.
+
+    Returns:
+        QuerySet[Article] | MergedFeed: APPROVED articles ordered newest first.
+    """
+    publishers, authors = _pulled_sources(reader)
+    return _build_reader_feed(reader, list(publishers), list(authors))
+
+
+async def areader_feed_queryset(reader: User):
+    """
+    Async version of ``reader_feed_queryset`` using the async ORM.
+
+    Returns:
+        QuerySet[Article] | MergedFeed: APPROVED articles ordered newest first.
+    """
+    publishers, authors = _pulled_sources(reader)
+    return _build_reader_feed(
+        reader,
+        [pk async for pk in publishers],
+        [pk async for pk in authors],
+    )
+
+
+def publisher_feed_queryset(reader: User):
+    """
+    Return APPROVED articles from publishers the reader subscribes to.
+
+    Args:
+        reader (User): The reader requesting the feed.
+
+    Returns:
+        QuerySet[Article]: Articles ordered newest first.
+    """
+    return Article.objects.filter(
+        status=Article.Status.APPROVED,
+        publisher__in=reader.subscribed_publishers.all(),
+    ).order_by("-created_at", "-pk")
+
+
+def journalist_feed_queryset(reader: User):
+    """
+    Return APPROVED articles by journalists the reader follows.
+
+    Args:
+        reader (User): The reader requesting the feed.
+
+    Returns:
+        QuerySet[Article]: Articles ordered newest first.
+    """
+    return Article.objects.filter(
+        status=Article.Status.APPROVED,
+        author__in=reader.subscribed_journalists.all(),
+    ).order_by("-created_at", "-pk")
+
+
+# Reason tags for the sections endpoint, keyed by the section each source fills.
+SECTION_REASONS = {
+    "publishers": "subscribed_publisher",
+    "journalists": "followed_journalist",
+}
+
+
+def feed_sections(publisher_rows, journalist_rows, limit: int):
+    """
+    Split the reader's candidate articles into the three feed sections.
+
+    The candidates are the first ``limit + 1`` rows of the publisher and
+    journalist feeds, which together contain the first page of all three
+    feeds. They are merged newest first in one pass; each article is tagged
+    with every reason it matched and added to each section it belongs to.
+
+    Args:
+        publisher_rows (list[Article]): ``publisher_feed_queryset`` rows.
+        journalist_rows (list[Article]): ``journalist_feed_queryset`` rows.
+        limit (int): Page size of each section.
+
+    Returns:
+        tuple[dict, dict]: ``{section: (articles, has_more)}`` for ``"feed"``,
+        ``"publishers"`` and ``"journalists"``, and ``{article_id: reasons}``.
+    """
+    tagged = [
+        ((row.created_at, row.pk), row, SECTION_REASONS[section])
+        for section, rows in (("publishers", publisher_rows), ("journalists", journalist_rows))
+        for row in rows
+    ]
+    tagged.sort(key=lambda item: item[0], reverse=True)
+
+    sections = {"feed": [], "publishers": [], "journalists": []}
+    reasons = {}
+    for _, row, reason in tagged:
+        if row.pk in reasons:
+            reasons[row.pk].append(reason)
+        else:
+            reasons[row.pk] = [reason]
+            sections["feed"].append(row)
+        for section, section_reason in SECTION_REASONS.items():
+            if reason == section_reason:
+                sections[section].append(row)
+
+    return (
+        {name: (rows[:limit], len(rows) > limit) for name, rows in sections.items()},
+        reasons,
+    )
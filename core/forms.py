@@ -21,6 +21,18 @@ class PublisherForm(forms.ModelForm):
         fields = ["name", "description"]
 
 
+class NotificationPreferencesForm(forms.ModelForm):
+    """Form for users to choose which new-article emails they receive."""
+
+    class Meta:
+        model = User
+        fields = [
+            "notify_subscribed_publishers",
+            "notify_followed_journalists",
+            "notification_delivery",
+        ]
+
+
 class RegistrationForm(UserCreationForm):
     """
     Registration form for creating a new user account.
@@ -0,0 +1,309 @@
+"""
+Paginated, fragment-cached homepage article list.
+
+The homepage lists APPROVED articles newest first in keyset pages (see
+``core.pagination``), with publishers joined into the same query. Each page's
+rendered HTML fragment is cached together with the ``created_at`` range it
+covers.
+
+Invalidation is per time range rather than global: every APPROVED article
+belongs to a day bucket of its ``created_at``, and approvals, retractions and
+edits of approved articles stamp that bucket (``bump_homepage``). A cached
+page is served only while the stamps of the buckets its range spans are
+unchanged, so approving an older article leaves the newer pages cached and
+vice versa. Pages whose range is open at the old end (the last page) or spans
+more than ``MAX_BUCKETS`` days depend on a global stamp instead. Stamps live
+in an evictable cache, so a missing stamp never matches: the page is rebuilt
+and the build writes a fresh stamp for it.
+
+Cache hits cost two cache round trips and no database queries. Entries live in
+the feed cache backend (``settings.FEED_CACHE_ALIAS``) and expire after
+``FEED_CACHE_TIMEOUT``, which also bounds staleness from publisher renames.
+"""
+
+import hashlib
+import time
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.http import Http404
+from django.template.loader import render_to_string
+from django.utils import timezone
+from django.utils.safestring import mark_safe
+from rest_framework.exceptions import NotFound
+
+from .feed_cache import get_feed_cache
+from .models import Article
+from .pagination import FORWARD, KeysetPagination, decode_cursor
+
+BUCKET_SECONDS = 86400
+MAX_BUCKETS = 366
+ALL_KEY = "homepage-stamp:all"
+FRAGMENT_TEMPLATE = "core/article_list_page.html"
+
+
+def _bucket(moment) -> int:
+    """
+    Return the day bucket of a timestamp.
+
+    Returns:
+        int: Bucket number.
+    """
+    return int(moment.timestamp()) // BUCKET_SECONDS
+
+
+def bump_homepage(*articles: Article) -> None:
+    """
+    Invalidate the cached homepage pages whose range includes the articles.
+
+    Args:
+        *articles (Article): Articles entering, leaving or edited in APPROVED.
+
+    Returns:
+        None
+    """
+    stamp = time.time_ns()
+    stamps = {f"homepage-stamp:{_bucket(article.created_at)}": stamp for article in articles}
+    stamps[ALL_KEY] = stamp
+    get_feed_cache().set_many(stamps, timeout=None)
+
+
+def _stamp_keys(low, high) -> list:
+    """
+    Return the stamp keys a page covering ``[low, high]`` depends on.
+
+    Args:
+        low (datetime | None): Oldest ``created_at`` on the page; None when the
+            page runs to the end of the list.
+        high (datetime | None): Newest bound; None for "up to now".
+
+    Returns:
+        list[str]: Cache keys of the stamps.
+    """
+    if low is None:
+        return [ALL_KEY]
+    first, last = _bucket(low), _bucket(high or timezone.now())
+    if last - first >= MAX_BUCKETS:
+        return [ALL_KEY]
+    return [f"homepage-stamp:{bucket}" for bucket in range(first, last + 1)]
+
+
+def _is_fresh(entry, keys, stamps) -> bool:
+    """
+    Check a cached entry against the current stamps of its range.
+
+    Args:
+        entry (dict): The cached page.
+        keys (list[str]): Stamp keys the page currently depends on.
+        stamps (dict): Current stamp values; missing (evicted) keys are stale.
+
+    Returns:
+        bool: True if no covered bucket changed since the entry was built.
+    """
+    return all(key in stamps and stamps[key] == entry["stamps"].get(key) for key in keys)
+
+
+def _current_stamps(cache, keys) -> dict:
+    """
+    Read stamps, writing a fresh one for each key that is missing.
+
+    Overwriting a stamp that a concurrent ``bump_homepage`` just wrote is
+    safe: any new value invalidates the pages built under the old one.
+
+    Args:
+        cache: The feed cache.
+        keys (list[str]): Stamp keys.
+
+    Returns:
+        dict: A value for every key.
+    """
+    stamps = cache.get_many(keys)
+    missing = dict.fromkeys((key for key in keys if key not in stamps), time.time_ns())
+    if missing:
+        cache.set_many(missing, timeout=None)
+    return {**stamps, **missing}
+
+
+async def _acurrent_stamps(cache, keys) -> dict:
+    """
+    Async version of ``_current_stamps``.
+    """
+    stamps = await cache.aget_many(keys)
+    missing = dict.fromkeys((key for key in keys if key not in stamps), time.time_ns())
+    if missing:
+        await cache.aset_many(missing, timeout=None)
+    return {**stamps, **missing}
+
+
+def _page_key(request, paginator: KeysetPagination) -> str:
+    """
+    Return the cache key of the requested page.
+
+    Returns:
+        str: Cache key.
+    """
+    cursor = request.GET.get(paginator.cursor_query_param, "")
+    raw = f"{paginator.get_page_size(request)}|{cursor}"
+    return "homepage-page:" + hashlib.md5(raw.encode("utf-8"), usedforsecurity=False).hexdigest()
+
+
+def homepage_queryset():
+    """
+    Return APPROVED articles with their publisher joined, newest first.
+
+    Returns:
+        QuerySet[Article]: The homepage rows.
+    """
+    return (
+        Article.objects.filter(status=Article.Status.APPROVED)
+        .select_related("publisher")
+        .only("pk", "title", "created_at", "publisher__name")
+        .order_by("-created_at", "-pk")
+    )
+
+
+def _page_range(request, paginator: KeysetPagination, rows):
+    """
+    Return the ``created_at`` range a rendered page covers.
+
+    Returns:
+        tuple[datetime | None, datetime | None]: Low and high bounds.
+    """
+    token = request.GET.get(paginator.cursor_query_param)
+    direction, cursor_time = FORWARD, None
+    if token:
+        direction, cursor_time, _ = decode_cursor(token)
+
+    oldest = rows[-1].created_at if rows else None
+    newest = rows[0].created_at if rows else None
+    if direction == FORWARD:
+        return (oldest if paginator.has_next else None), cursor_time
+    return cursor_time, (newest if paginator.has_previous else None)
+
+
+def _relative(url):
+    """
+    Strip scheme and host so cached links work behind any host name.
+
+    Returns:
+        str | None: Path and query string.
+    """
+    if url is None:
+        return None
+    parts = urlsplit(url)
+    return f"{parts.path}?{parts.query}" if parts.query else parts.path
+
+
+def _render_fragment(paginator: KeysetPagination, rows) -> str:
+    """
+    Render the list fragment for one page.
+
+    Returns:
+        str: The fragment HTML.
+    """
+    return render_to_string(
+        FRAGMENT_TEMPLATE,
+        {
+            "articles": rows,
+            "next_url": _relative(paginator.get_next_link()),
+            "previous_url": _relative(paginator.get_previous_link()),
+        },
+    )
+
+
+def _entry(request, paginator: KeysetPagination, rows):
+    """
+    Build a cache entry for a freshly rendered page.
+
+    Returns:
+        tuple[dict, list[str]]: The entry and the stamp keys it depends on.
+    """
+    low, high = _page_range(request, paginator, rows)
+    return {
+        "html": _render_fragment(paginator, rows),
+        "low": low,
+        "high": high,
+    }, _stamp_keys(low, high)
+
+
+def _timeout() -> int:
+    """
+    Return how long rendered pages are kept.
+
+    Returns:
+        int: Seconds.
+    """
+    return getattr(settings, "FEED_CACHE_TIMEOUT", 300)
+
+
+def homepage_fragment(request):
+    """
+    Return the rendered article list fragment for the requested page.
+
+    Args:
+        request: Django HttpRequest (``?cursor=`` / ``?page_size=``).
+
+    Returns:
+        tuple[str, bool]: Safe fragment HTML and whether it was a cache hit.
+
+    Raises:
+        Http404: If the cursor is malformed.
+    """
+    cache = get_feed_cache()
+    paginator = KeysetPagination()
+    key = _page_key(request, paginator)
+
+    entry = cache.get(key)
+    if entry is not None:
+        keys = _stamp_keys(entry["low"], entry["high"])
+        if _is_fresh(entry, keys, cache.get_many(keys)):
+            return mark_safe(entry["html"]), True
+
+    stamp_before = _current_stamps(cache, [ALL_KEY])[ALL_KEY]
+    try:
+        rows = paginator.paginate_queryset(homepage_queryset(), request)
+    except NotFound:
+        raise Http404("Invalid cursor.")
+    entry, keys = _entry(request, paginator, rows)
+
+    stamps = _current_stamps(cache, keys + [ALL_KEY])
+    # Skip storing if anything was approved or retracted while rendering:
+    # the rows may predate the stamps just read.
+    if stamps[ALL_KEY] == stamp_before:
+        entry["stamps"] = {name: stamps[name] for name in keys}
+        cache.set(key, entry, timeout=_timeout())
+    return mark_safe(entry["html"]), False
+
+
+async def ahomepage_fragment(request):
+    """
+    Async version of ``homepage_fragment`` using the async ORM and cache API.
+
+    Returns:
+        tuple[str, bool]: Safe fragment HTML and whether it was a cache hit.
+
+    Raises:
+        Http404: If the cursor is malformed.
+    """
+    cache = get_feed_cache()
+    paginator = KeysetPagination()
+    key = _page_key(request, paginator)
+
+    entry = await cache.aget(key)
+    if entry is not None:
+        keys = _stamp_keys(entry["low"], entry["high"])
+        if _is_fresh(entry, keys, await cache.aget_many(keys)):
+            return mark_safe(entry["html"]), True
+
+    stamp_before = (await _acurrent_stamps(cache, [ALL_KEY]))[ALL_KEY]
+    try:
+        rows = await paginator.apaginate_queryset(homepage_queryset(), request)
+    except NotFound:
+        raise Http404("Invalid cursor.")
+    entry, keys = _entry(request, paginator, rows)
+
+    stamps = await _acurrent_stamps(cache, keys + [ALL_KEY])
+    if stamps[ALL_KEY] == stamp_before:
+        entry["stamps"] = {name: stamps[name] for name in keys}
+        await cache.aset(key, entry, timeout=_timeout())
+    return mark_safe(entry["html"]), False
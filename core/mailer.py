@@ -0,0 +1,98 @@
+"""
+Fan-out mailer for notifications with many recipients.
+
+Messages are produced lazily (callers stream recipients from the database)
+and sent over a single connection of the configured ``EMAIL_BACKEND`` with
+``send_messages`` in batches of ``MAIL_SEND_BATCH_SIZE``, so neither the
+recipient list nor the rendered messages are held in memory at once and the
+SMTP session is reused across batches. The locmem backend works unchanged,
+which makes fan-outs testable via ``django.core.mail.outbox``.
+
+Recipients never see each other: messages go either to one recipient each,
+or, for identical content, to BCC chunks of at most ``MAIL_BCC_CHUNK_SIZE``
+addresses (keeping each message under typical SMTP recipient limits).
+"""
+
+import time
+from itertools import islice
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+
+
+def chunked(iterable, size: int):
+    """
+    Yield lists of up to ``size`` consecutive items.
+
+    Args:
+        iterable: Any iterable.
+        size (int): Chunk length.
+
+    Returns:
+        Iterator[list]: The chunks.
+    """
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def bcc_messages(subject: str, body: str, recipients, chunk_size: int | None = None):
+    """
+    Yield one message per BCC chunk of ``recipients``.
+
+    Args:
+        subject (str): Message subject.
+        body (str): Message body.
+        recipients: Iterable of email addresses.
+        chunk_size (int): Addresses per message; defaults to
+            ``MAIL_BCC_CHUNK_SIZE``.
+
+    Returns:
+        Iterator[EmailMessage]: Messages with an empty To: header.
+    """
+    chunk_size = chunk_size or getattr(settings, "MAIL_BCC_CHUNK_SIZE", 50)
+    for chunk in chunked(recipients, chunk_size):
+        yield EmailMessage(subject, body, settings.DEFAULT_FROM_EMAIL, bcc=chunk)
+
+
+def send_batched(messages, *, batch_size: int | None = None, connection=None) -> dict:
+    """
+    Send messages over one reused connection in bounded batches.
+
+    Args:
+        messages: Iterable of ``EmailMessage``; consumed lazily.
+        batch_size (int): Messages per ``send_messages`` call; defaults to
+            ``MAIL_SEND_BATCH_SIZE``.
+        connection: Email backend owned (opened and closed) by the caller,
+            for sharing one connection across several calls; by default a
+            connection from ``get_connection()`` (the ``EMAIL_BACKEND``
+            setting) is opened for this call.
+
+    Returns:
+        dict: ``messages`` and ``recipients`` sent, ``batches``, ``seconds``
+        and ``per_second`` (messages per second). Backends only report how
+        many messages of a batch went out, so ``recipients`` counts batches
+        sent in full.
+    """
+    batch_size = batch_size or getattr(settings, "MAIL_SEND_BATCH_SIZE", 100)
+    if connection is None:
+        with get_connection() as connection:
+            return send_batched(messages, batch_size=batch_size, connection=connection)
+
+    sent = recipients = batches = 0
+    started = time.perf_counter()
+    for batch in chunked(messages, batch_size):
+        count = connection.send_messages(batch) or 0
+        sent += count
+        if count == len(batch):
+            recipients += sum(len(message.recipients()) for message in batch)
+        batches += 1
+    seconds = time.perf_counter() - started
+
+    return {
+        "messages": sent,
+        "recipients": recipients,
+        "batches": batches,
+        "seconds": seconds,
+        "per_second": sent / seconds if seconds else 0.0,
+    }
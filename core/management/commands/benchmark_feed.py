@@ -0,0 +1,148 @@
+import time
+from statistics import median
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import F
+
+from core.feeds import reader_feed_queryset
+from core.management.seeding import seed_articles
+from core.models import Article, Publisher, User
+from core.pagination import older_than
+
+
+def legacy_feed_queryset(reader: User):
+    """
+    The original combined-feed query: one OR over both subscriptions + DISTINCT.
+
+    Kept here as the benchmark baseline.
+
+    Returns:
+        QuerySet[Article]: The legacy feed queryset.
+    """
+    qs = Article.objects.filter(status=Article.Status.APPROVED)
+    qs = qs.filter(publisher__in=reader.subscribed_publishers.all()) | qs.filter(
+        author__in=reader.subscribed_journalists.all()
+    )
+    return qs.distinct().annotate(
+        feed_created_at=F("created_at"), feed_article_id=F("pk")
+    )
+
+
+class Command(BaseCommand):
+    """
+    Compare the legacy OR+DISTINCT feed query with the merged-stream engine.
+
+    For the duration of the run every publisher and journalist is switched to
+    pull mode, so the engine reads the "subscribed publishers" and "followed
+    journalists" streams separately and merges them; the sources that were in
+    push mode are switched back afterwards, even if the run fails. Both
+    variants fetch the same keyset pages and the command checks that their
+    output is identical before reporting timings.
+
+    Use ``--seed 1000000`` on a scratch database for a 1M-article run.
+    """
+
+    help = "Benchmark the merged-stream reader feed against the legacy OR query."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=0,
+            help="Insert this many synthetic articles first (scratch databases only).",
+        )
+        parser.add_argument("--pages", type=int, default=5, help="Pages to walk per run.")
+        parser.add_argument("--page-size", type=int, default=20)
+        parser.add_argument("--runs", type=int, default=5, help="Timed runs per variant.")
+
+    def handle(self, *args, **options):
+        if options["seed"]:
+            seed_articles(options["seed"], build_timelines=False)
+            self.stdout.write(f"Seeded {options['seed']} article(s).")
+
+        reader = (
+            User.objects.filter(subscribed_publishers__isnull=False)
+            .filter(subscribed_journalists__isnull=False)
+            .order_by("-pk")
+            .first()
+        )
+        if reader is None:
+            raise CommandError("No reader with subscriptions; seed the database first.")
+
+        pushed_publishers = list(
+            Publisher.objects.filter(fan_out_on_read=False).values_list("pk", flat=True)
+        )
+        pushed_journalists = list(
+            User.objects.filter(role=User.Role.JOURNALIST, fan_out_on_read=False).values_list(
+                "pk", flat=True
+            )
+        )
+        Publisher.objects.filter(pk__in=pushed_publishers).update(fan_out_on_read=True)
+        User.objects.filter(pk__in=pushed_journalists).update(fan_out_on_read=True)
+        try:
+            results = self.measure(reader, options)
+        finally:
+            Publisher.objects.filter(pk__in=pushed_publishers).update(fan_out_on_read=False)
+            User.objects.filter(pk__in=pushed_journalists).update(fan_out_on_read=False)
+
+        (legacy_pages, legacy_time), (merged_pages, merged_time) = results.values()
+        if legacy_pages != merged_pages:
+            raise CommandError("Merged feed output differs from the legacy query.")
+
+        for name, (_, elapsed) in results.items():
+            self.stdout.write(
+                f"{name:<20} {elapsed * 1000:9.1f} ms for {options['pages']} page(s)"
+            )
+        self.stdout.write(self.style.SUCCESS(f"speedup: {legacy_time / merged_time:.1f}x"))
+
+    def measure(self, reader: User, options) -> dict:
+        """
+        Time both feed variants over the same keyset pages.
+
+        Args:
+            reader (User): The reader whose feed is walked.
+            options (dict): Command options (``runs``, ``pages``, ``page_size``).
+
+        Returns:
+            dict: ``(pages, median seconds)`` per variant name.
+        """
+        variants = {
+            "legacy OR+DISTINCT": lambda: legacy_feed_queryset(reader),
+            "merged streams": lambda: reader_feed_queryset(reader),
+        }
+
+        results = {}
+        for name, build in variants.items():
+            timings = []
+            for _ in range(options["runs"]):
+                started = time.perf_counter()
+                pages = self.walk(build, options["pages"], options["page_size"])
+                timings.append(time.perf_counter() - started)
+            results[name] = (pages, median(timings))
+        return results
+
+    def walk(self, build, pages: int, page_size: int):
+        """
+        Fetch consecutive keyset pages the way KeysetPagination does.
+
+        Args:
+            build: Callable returning a fresh feed queryset.
+            pages (int): Number of pages to fetch.
+            page_size (int): Rows per page.
+
+        Returns:
+            list[list[int]]: Article ids per page.
+        """
+        fields = ("feed_created_at", "feed_article_id")
+        result = []
+        cursor = None
+        for _ in range(pages):
+            qs = build()
+            if cursor is not None:
+                qs = qs.filter(older_than(*cursor, fields))
+            rows = list(qs.order_by("-feed_created_at", "-feed_article_id")[:page_size])
+            if not rows:
+                break
+            result.append([row.pk for row in rows])
+            cursor = (rows[-1].feed_created_at, rows[-1].feed_article_id)
+        return result
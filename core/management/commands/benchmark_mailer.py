@@ -0,0 +1,98 @@
+from django.contrib.auth.hashers import make_password
+from django.core import mail
+from django.core.management.base import BaseCommand
+from django.test.utils import override_settings
+
+from core.models import Article, Publisher, User
+from core.moderation import APPROVE, send_decision_notifications
+
+LOCMEM_BACKEND = "django.core.mail.backends.locmem.EmailBackend"
+
+
+def seed_subscribers(publisher: Publisher, count: int) -> int:
+    """
+    Make sure ``publisher`` has at least ``count`` benchmark subscribers.
+
+    Args:
+        publisher (Publisher): The publisher to subscribe readers to.
+        count (int): Required number of subscribers.
+
+    Returns:
+        int: Number of readers created.
+    """
+    missing = count - publisher.subscribers.count()
+    if missing <= 0:
+        return 0
+
+    start = User.objects.filter(username__startswith="fanout_reader_").count()
+    password = make_password(None)
+    readers = User.objects.bulk_create(
+        User(
+            username=f"fanout_reader_{i}",
+            email=f"fanout_reader_{i}@example.com",
+            password=password,
+            role=User.Role.READER,
+        )
+        for i in range(start, start + missing)
+    )
+    Through = User.subscribed_publishers.through
+    Through.objects.bulk_create(
+        (Through(user_id=reader.pk, publisher_id=publisher.pk) for reader in readers),
+        batch_size=5000,
+    )
+    return missing
+
+
+class Command(BaseCommand):
+    """
+    Measure subscriber fan-out throughput for one approved article.
+
+    Subscribes ``--subscribers`` synthetic readers to a benchmark publisher
+    (scratch databases only), then sends the approval notifications once per
+    fan-out mode through ``send_decision_notifications``: subscriber rows are
+    streamed from the database and sent over one connection in batches. The
+    locmem backend is used unless ``--backend`` names another one (e.g. an
+    SMTP sink).
+    """
+
+    help = "Benchmark the chunked subscriber notification mailer."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--subscribers", type=int, default=10000)
+        parser.add_argument("--backend", default=LOCMEM_BACKEND, help="EMAIL_BACKEND to use.")
+        parser.add_argument("--batch-size", type=int, default=100, help="Messages per batch.")
+        parser.add_argument("--bcc-chunk", type=int, default=50, help="Addresses per BCC.")
+
+    def handle(self, *args, **options):
+        publisher, _ = Publisher.objects.get_or_create(name="Fan-out Benchmark")
+        created = seed_subscribers(publisher, options["subscribers"])
+        if created:
+            self.stdout.write(f"Seeded {created} subscriber(s).")
+
+        author, _ = User.objects.get_or_create(
+            username="fanout_journalist",
+            defaults={"email": "fanout_journalist@example.com", "role": User.Role.JOURNALIST},
+        )
+        article, _ = Article.objects.get_or_create(
+            title="Fan-out benchmark",
+            publisher=publisher,
+            author=author,
+            defaults={"body": "Body"},
+        )
+        article = Article.objects.select_related("publisher", "author").get(pk=article.pk)
+
+        for mode in ("recipient", "bcc"):
+            with override_settings(
+                EMAIL_BACKEND=options["backend"],
+                MAIL_FANOUT_MODE=mode,
+                MAIL_SEND_BATCH_SIZE=options["batch_size"],
+                MAIL_BCC_CHUNK_SIZE=options["bcc_chunk"],
+            ):
+                stats = send_decision_notifications([article], APPROVE)
+            mail.outbox = []
+            self.stdout.write(
+                f"{mode:<10} {stats['messages']:7d} msg  {stats['recipients']:7d} rcpt  "
+                f"{stats['batches']:5d} batches  {stats['seconds']:7.2f} s  "
+                f"{stats['per_second']:9.1f} msg/s  "
+                f"{stats['recipients'] / stats['seconds'] if stats['seconds'] else 0:9.1f} rcpt/s"
+            )
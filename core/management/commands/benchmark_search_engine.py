@@ -0,0 +1,135 @@
+import itertools
+import os
+import random
+import tempfile
+import time
+from statistics import median, quantiles
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.search_engine import BM25Index
+
+
+def zipf_weights(vocabulary: int, exponent: float) -> list:
+    """
+    Return cumulative Zipf weights for ``random.choices``.
+
+    Returns:
+        list[float]: Cumulative weight of ranks 1..vocabulary.
+    """
+    return list(itertools.accumulate(1 / rank**exponent for rank in range(1, vocabulary + 1)))
+
+
+class Command(BaseCommand):
+    """
+    Benchmark the in-process BM25 engine on a synthetic corpus.
+
+    Documents draw their terms from a Zipf-distributed vocabulary, like
+    natural text, so common terms have long postings lists. Nothing touches
+    the database. The command reports indexing throughput, query latency
+    (p50/p95) for one- to three-term queries, snapshot size and write time,
+    mmap load time, queries against the mapped snapshot and incremental
+    add/remove throughput on top of it.
+
+    The default reproduces the 1M-article benchmark; it needs several GB of
+    memory and a few minutes, so try ``--docs 100000`` first.
+    """
+
+    help = "Benchmark the BM25 search engine on a synthetic corpus."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--docs", type=int, default=1_000_000)
+        parser.add_argument("--vocabulary", type=int, default=50_000)
+        parser.add_argument("--length", type=int, default=80, help="Terms per document.")
+        parser.add_argument("--queries", type=int, default=200)
+        parser.add_argument("--top", type=int, default=20, help="Results per query.")
+        parser.add_argument("--updates", type=int, default=10_000)
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument(
+            "--snapshot", default="", help="Snapshot path (default: a temporary file)."
+        )
+
+    def handle(self, *args, **options):
+        if options["docs"] < 1 or options["vocabulary"] < 1:
+            raise CommandError("--docs and --vocabulary must be positive.")
+        rng = random.Random(options["seed"])
+        vocabulary = [f"w{rank}" for rank in range(options["vocabulary"])]
+        cum_weights = zipf_weights(len(vocabulary), 1.07)
+
+        def document():
+            return rng.choices(vocabulary, cum_weights=cum_weights, k=options["length"])
+
+        # Queries mix mid-frequency terms (selective) with head terms (long postings).
+        head = vocabulary[: max(1, len(vocabulary) // 100)]
+        queries = [
+            rng.sample(head, 1) + rng.sample(vocabulary, rng.randint(0, 2))
+            for _ in range(options["queries"])
+        ]
+
+        index = BM25Index()
+        started = time.perf_counter()
+        for pk in range(1, options["docs"] + 1):
+            index.add(pk, document(), approved=rng.random() < 0.9)
+        self.report("build", time.perf_counter() - started, options["docs"], "docs")
+        self.measure_queries("queries (memory)", index, queries, options["top"])
+
+        path = options["snapshot"]
+        if not path:
+            handle, path = tempfile.mkstemp(suffix=".bm25")
+            os.close(handle)
+        try:
+            started = time.perf_counter()
+            size = index.write_snapshot(path)
+            self.stdout.write(
+                f"{'snapshot write':<20} {time.perf_counter() - started:9.2f} s  "
+                f"({size / 2**20:.1f} MiB)"
+            )
+            del index
+
+            started = time.perf_counter()
+            mapped = BM25Index.load_snapshot(path)
+            self.stdout.write(
+                f"{'snapshot load':<20} {(time.perf_counter() - started) * 1000:9.1f} ms"
+            )
+            self.measure_queries("queries (mmap)", mapped, queries, options["top"])
+
+            updates = min(options["updates"], options["docs"])
+            started = time.perf_counter()
+            for pk in range(options["docs"] + 1, options["docs"] + updates + 1):
+                mapped.add(pk, document())
+            self.report("incremental add", time.perf_counter() - started, updates, "docs")
+            started = time.perf_counter()
+            for pk in rng.sample(range(1, options["docs"] + 1), updates):
+                mapped.remove(pk)
+            self.report("remove", time.perf_counter() - started, updates, "docs")
+            self.measure_queries("queries (mixed)", mapped, queries, options["top"])
+        finally:
+            if not options["snapshot"]:
+                os.unlink(path)
+
+    def report(self, name: str, elapsed: float, count: int, unit: str) -> None:
+        """
+        Print a throughput line.
+
+        Returns:
+            None
+        """
+        self.stdout.write(f"{name:<20} {elapsed:9.2f} s  ({count / elapsed:,.0f} {unit}/s)")
+
+    def measure_queries(self, name: str, index: BM25Index, queries: list, top: int) -> None:
+        """
+        Run every query once and print latency percentiles.
+
+        Returns:
+            None
+        """
+        timings = []
+        for terms in queries:
+            started = time.perf_counter()
+            index.search(terms, top)
+            timings.append((time.perf_counter() - started) * 1000)
+        p95 = quantiles(timings, n=20)[-1] if len(timings) > 1 else timings[0]
+        self.stdout.write(
+            f"{name:<20} p50 {median(timings):8.2f} ms  p95 {p95:8.2f} ms  "
+            f"({len(timings)} queries)"
+        )
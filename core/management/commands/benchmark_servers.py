@@ -0,0 +1,131 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from statistics import median
+
+import requests
+from django.core.management.base import BaseCommand, CommandError
+
+# (sync path, async path) pairs hit by every simulated client.
+ENDPOINTS = [
+    ("/api/articles/feed/", "/async/api/articles/feed/"),
+    ("/api/articles/publishers/", "/async/api/articles/feed/publishers/"),
+    ("/", "/async/"),
+]
+
+
+def login_session(base_url: str, username: str, password: str) -> requests.Session:
+    """
+    Open an HTTP session logged in through the regular login form.
+
+    Args:
+        base_url (str): Server root, e.g. ``http://127.0.0.1:8000``.
+        username (str): Reader username.
+        password (str): Reader password.
+
+    Returns:
+        requests.Session: Session carrying the session cookie.
+
+    Raises:
+        CommandError: If the login is rejected.
+    """
+    session = requests.Session()
+    login_url = f"{base_url}/accounts/login/"
+    session.get(login_url, timeout=10)
+    response = session.post(
+        login_url,
+        data={
+            "username": username,
+            "password": password,
+            "csrfmiddlewaretoken": session.cookies.get("csrftoken", ""),
+        },
+        headers={"Referer": login_url},
+        allow_redirects=False,
+        timeout=10,
+    )
+    if response.status_code != 302:
+        raise CommandError(f"Login to {base_url} failed (HTTP {response.status_code}).")
+    return session
+
+
+class Command(BaseCommand):
+    """
+    Compare concurrent-client throughput of the WSGI and ASGI deployments.
+
+    Start the same project twice against the same database, e.g.::
+
+        gunicorn config.wsgi -w 4 -b 127.0.0.1:8000
+        uvicorn config.asgi:application --workers 4 --port 8001
+
+    then run ``benchmark_servers --wsgi http://127.0.0.1:8000 --asgi
+    http://127.0.0.1:8001 --username <reader> --password <pw>``. The WSGI
+    server is driven through the sync views and the ASGI server through the
+    async views under ``/async/``; both serve identical responses. Each client
+    thread keeps its own logged-in session and issues requests back to back.
+    """
+
+    help = "Measure WSGI vs ASGI throughput with concurrent HTTP clients."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--wsgi", required=True, help="Base URL of the WSGI server.")
+        parser.add_argument("--asgi", required=True, help="Base URL of the ASGI server.")
+        parser.add_argument("--username", required=True, help="Reader account to log in as.")
+        parser.add_argument("--password", required=True)
+        parser.add_argument("--clients", type=int, default=32, help="Concurrent clients.")
+        parser.add_argument(
+            "--requests", type=int, default=50, help="Requests per client per run."
+        )
+        parser.add_argument("--runs", type=int, default=3, help="Timed runs per mode.")
+
+    def handle(self, *args, **options):
+        modes = {
+            "WSGI (sync views)": (options["wsgi"].rstrip("/"), 0),
+            "ASGI (async views)": (options["asgi"].rstrip("/"), 1),
+        }
+
+        results = {}
+        for name, (base_url, column) in modes.items():
+            paths = [f"{base_url}{pair[column]}" for pair in ENDPOINTS]
+            sessions = [
+                login_session(base_url, options["username"], options["password"])
+                for _ in range(options["clients"])
+            ]
+            runs = [
+                self.run(sessions, paths, options["requests"]) for _ in range(options["runs"])
+            ]
+            results[name] = (median(rps for rps, _ in runs), max(errors for _, errors in runs))
+
+        for name, (rps, errors) in results.items():
+            self.stdout.write(f"{name:<20} {rps:9.1f} req/s  errors: {errors}")
+
+        (wsgi_rps, _), (asgi_rps, _) = results.values()
+        self.stdout.write(self.style.SUCCESS(f"ASGI/WSGI throughput: {asgi_rps / wsgi_rps:.2f}x"))
+
+    def run(self, sessions, paths, per_client: int):
+        """
+        Drive all clients concurrently once.
+
+        Args:
+            sessions (list[requests.Session]): One logged-in session per client.
+            paths (list[str]): URLs each client cycles through.
+            per_client (int): Requests issued by each client.
+
+        Returns:
+            tuple[float, int]: Requests per second and non-2xx/3xx responses.
+        """
+        errors = 0
+        lock = threading.Lock()
+
+        def client(session):
+            nonlocal errors
+            for i in range(per_client):
+                response = session.get(paths[i % len(paths)], timeout=30)
+                if response.status_code >= 400:
+                    with lock:
+                        errors += 1
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=len(sessions)) as pool:
+            list(pool.map(client, sessions))
+        elapsed = time.perf_counter() - started
+        return len(sessions) * per_client / elapsed, errors
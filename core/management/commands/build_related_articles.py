@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand
+
+from core.related import update_related_articles
+
+
+class Command(BaseCommand):
+    """
+    Compute the "related articles" lists shown on article detail pages.
+
+    Schedule it from cron, e.g.::
+
+        */5 * * * * python manage.py build_related_articles
+        30 3 * * *  python manage.py build_related_articles --full
+
+    Regular runs only compare newly approved articles with the saved TF-IDF
+    model (``RELATED_ARTICLES_MODEL``); ``--full`` rebuilds the model and
+    every list.
+    """
+
+    help = "Update the related-article lists of approved articles."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--full",
+            action="store_true",
+            help="Rebuild the vocabulary and every list instead of updating incrementally.",
+        )
+
+    def handle(self, *args, **options):
+        stats = update_related_articles(full=options["full"])
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Updated {stats['updated']} related-article list(s) "
+                f"({stats['added']} added, {stats['removed']} removed, "
+                f"{stats['articles']} article(s) in the model)."
+            )
+        )
@@ -0,0 +1,138 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+
+from core.feeds import (
+    MergedFeed,
+    journalist_feed_queryset,
+    publisher_feed_queryset,
+    reader_feed_queryset,
+)
+from core.homepage import homepage_queryset
+from core.management.seeding import seed_articles
+from core.models import Article, User
+from core.moderation import claim_candidates
+
+
+class Command(BaseCommand):
+    """
+    EXPLAIN the hot Article queries and fail if any plan regresses.
+
+    A plan fails when it reads a table with a full scan or sorts outside an
+    index (MySQL ``type=ALL`` / ``Using filesort``; SQLite ``SCAN <table>`` /
+    ``USE TEMP B-TREE FOR ORDER BY``). Run it against a seeded database;
+    ``--seed`` inserts synthetic rows first and should only be used on a
+    scratch database.
+    """
+
+    help = "EXPLAIN hot Article queries and fail on full scans or filesorts."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=0,
+            help="Insert this many synthetic articles before explaining.",
+        )
+
+    def handle(self, *args, **options):
+        if options["seed"]:
+            seed_articles(options["seed"])
+            self.stdout.write(f"Seeded {options['seed']} article(s).")
+
+        failures = []
+        for name, queryset in self.hot_queries():
+            problems = self.explain(queryset)
+            if problems:
+                failures.append(name)
+                self.stdout.write(self.style.ERROR(f"FAIL {name}: {'; '.join(problems)}"))
+            else:
+                self.stdout.write(self.style.SUCCESS(f"ok   {name}"))
+
+        if failures:
+            raise CommandError(f"Query plan regression in: {', '.join(failures)}")
+
+    def hot_queries(self):
+        """
+        Build the hot queries exactly as the views run them.
+
+        Returns:
+            list[tuple[str, QuerySet]]: Query name and queryset pairs.
+        """
+        reader = (
+            User.objects.filter(subscribed_publishers__isnull=False)
+            .filter(subscribed_journalists__isnull=False)
+            .first()
+        )
+        journalist = User.objects.filter(
+            role=User.Role.JOURNALIST, articles__isnull=False
+        ).first()
+        if reader is None or journalist is None:
+            raise CommandError(
+                "Need a reader with subscriptions and a journalist with articles; "
+                "seed the database first (--seed)."
+            )
+
+        page = settings.REST_FRAMEWORK.get("PAGE_SIZE", 20) + 1
+
+        feed = reader_feed_queryset(reader)
+        if isinstance(feed, MergedFeed):
+            feed_queries = [
+                (f"api_feed[stream {i}]", stream[:page])
+                for i, stream in enumerate(feed.streams)
+            ]
+        else:
+            feed_queries = [("api_feed", feed[:page])]
+
+        return [
+            ("article_list", homepage_queryset()[:page]),
+            ("editor_queue_claim", claim_candidates(timezone.now())[:page]),
+            (
+                "journalist_dashboard",
+                Article.objects.filter(author=journalist).order_by("-created_at"),
+            ),
+            *feed_queries,
+            ("api_feed_publishers", publisher_feed_queryset(reader)[:page]),
+            ("api_feed_journalists", journalist_feed_queryset(reader)[:page]),
+        ]
+
+    def explain(self, queryset):
+        """
+        Run EXPLAIN for a queryset and describe any bad plan steps.
+
+        Args:
+            queryset: The queryset to explain.
+
+        Returns:
+            list[str]: Human-readable problems; empty when the plan is fine.
+
+        Raises:
+            CommandError: On an unsupported database backend.
+        """
+        sql, params = queryset.query.sql_with_params()
+        problems = []
+
+        with connection.cursor() as cursor:
+            if connection.vendor == "mysql":
+                cursor.execute(f"EXPLAIN {sql}", params)
+                columns = [col[0].lower() for col in cursor.description]
+                for values in cursor.fetchall():
+                    row = dict(zip(columns, values))
+                    extra = row.get("extra") or ""
+                    if row.get("type") == "ALL":
+                        problems.append(f"full scan of {row.get('table')}")
+                    if "Using filesort" in extra:
+                        problems.append(f"filesort on {row.get('table')}")
+            elif connection.vendor == "sqlite":
+                cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+                for row in cursor.fetchall():
+                    detail = row[-1]
+                    if detail.startswith("SCAN ") and " USING " not in detail:
+                        problems.append(f"full scan ({detail})")
+                    if "TEMP B-TREE FOR ORDER BY" in detail:
+                        problems.append(f"filesort ({detail})")
+            else:
+                raise CommandError(f"Unsupported database backend: {connection.vendor}")
+
+        return problems
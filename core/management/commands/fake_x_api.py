@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+
+from core.services.fake_x import FakeXServer
+
+
+class Command(BaseCommand):
+    """
+    Serve a local fake of the X post endpoint with X-style rate limiting.
+
+    Accepts ``--limit`` posts per ``--window`` seconds and answers 429 (with
+    ``x-rate-limit-*`` headers) beyond that, for trying ``post_to_x`` end to
+    end: set ``X_API_URL`` to the printed URL.
+    """
+
+    help = "Run a rate-limited fake X API for local testing."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--host", default="127.0.0.1")
+        parser.add_argument("--port", type=int, default=8765)
+        parser.add_argument("--limit", type=int, default=5, help="Posts per window.")
+        parser.add_argument("--window", type=float, default=60, help="Window in seconds.")
+
+    def handle(self, *args, **options):
+        fake = FakeXServer(
+            options["host"], options["port"], limit=options["limit"], window=options["window"]
+        )
+        self.stdout.write(f"Fake X API on {fake.url} ({options['limit']} posts / {options['window']:g} s)")
+        try:
+            fake.server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            fake.server.server_close()
+        accepted = sum(1 for request in fake.received if request["status"] == 201)
+        self.stdout.write(f"{len(fake.received)} request(s), {accepted} accepted.")
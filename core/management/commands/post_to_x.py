@@ -0,0 +1,54 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.models import XPost
+from core.services.x_scheduler import XPostScheduler
+
+
+class Command(BaseCommand):
+    """
+    Post queued approved articles to X at the rate X allows.
+
+    Drains the ``XPost`` queue freshest-first, pacing posts with a token
+    bucket synced from X's ``x-rate-limit-*`` response headers (see
+    ``core.services.x_scheduler``). Run a single instance per X app. Use
+    ``--once`` (e.g. from cron or in tests) to post what is due, waiting out
+    rate limits, and exit.
+    """
+
+    help = "Post queued articles to X, respecting X's rate limits."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=getattr(settings, "OUTBOX_POLL_INTERVAL", 1.0),
+            help="Seconds to sleep when nothing is due.",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Exit once no post is due instead of polling.",
+        )
+
+    def handle(self, *args, **options):
+        if not getattr(settings, "X_POST_ENABLED", False):
+            raise CommandError("X posting is disabled (X_POST_ENABLED).")
+        if not getattr(settings, "X_BEARER_TOKEN", "") or not getattr(settings, "X_API_URL", ""):
+            raise CommandError("X_BEARER_TOKEN and X_API_URL must be set.")
+
+        scheduler = XPostScheduler()
+        counts = {status: 0 for status in XPost.Status.values}
+        try:
+            counts = scheduler.run(once=options["once"], poll_interval=options["poll_interval"])
+        except KeyboardInterrupt:
+            pass
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Posted {counts[XPost.Status.POSTED]}, "
+                f"retrying {counts[XPost.Status.QUEUED]}, "
+                f"failed {counts[XPost.Status.FAILED]}, "
+                f"cancelled {counts[XPost.Status.CANCELLED]}."
+            )
+        )
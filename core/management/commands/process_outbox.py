@@ -0,0 +1,78 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core.models import OutboxMessage
+from core.outbox import process_batch
+
+
+class Command(BaseCommand):
+    """
+    Deliver queued side effects (notification emails, X posts) from the outbox.
+
+    Polls the ``OutboxMessage`` table of the configured database; no broker is
+    needed. Several workers may run at once, since each claims its own rows.
+    Failed deliveries are retried with exponential backoff and dead-lettered
+    after ``OUTBOX_MAX_ATTEMPTS`` attempts. Use ``--once`` (e.g. from cron or
+    in tests) to drain what is due and exit. The summary includes the emails
+    sent by the notification handlers and their send rate.
+    """
+
+    help = "Drain the transactional outbox with a pool of delivery threads."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--threads",
+            type=int,
+            default=getattr(settings, "OUTBOX_WORKER_THREADS", 4),
+            help="Concurrent deliveries.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=getattr(settings, "OUTBOX_BATCH_SIZE", 50),
+            help="Messages claimed per round.",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=getattr(settings, "OUTBOX_POLL_INTERVAL", 1.0),
+            help="Seconds to sleep when nothing is due.",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Exit once no message is due instead of polling.",
+        )
+
+    def handle(self, *args, **options):
+        totals = {status: 0 for status in OutboxMessage.Status.values}
+        stats = {}
+        try:
+            while True:
+                counts = process_batch(options["batch_size"], options["threads"], stats)
+                for status, count in counts.items():
+                    totals[status] += count
+                if any(counts.values()):
+                    continue
+                if options["once"]:
+                    break
+                time.sleep(options["poll_interval"])
+        except KeyboardInterrupt:
+            pass
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Delivered {totals[OutboxMessage.Status.DONE]}, "
+                f"retrying {totals[OutboxMessage.Status.PENDING]}, "
+                f"dead-lettered {totals[OutboxMessage.Status.DEAD]}."
+            )
+        )
+        if stats.get("messages"):
+            seconds = stats["seconds"]
+            self.stdout.write(
+                f"Sent {stats['messages']} email(s) to {stats['recipients']} recipient(s) "
+                f"in {stats['batches']} batch(es), "
+                f"{stats['messages'] / seconds if seconds else 0.0:.0f} msg/s per thread."
+            )
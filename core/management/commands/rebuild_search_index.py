@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from core.search import get_search_backend
+
+
+class Command(BaseCommand):
+    """
+    Re-index every article in the configured search backend.
+
+    The index is kept current as articles are saved, approved and retracted;
+    run this once after enabling search, after bulk imports that bypass
+    ``save()`` and after changing the tokenizer or weights.
+    """
+
+    help = "Rebuild the article search index."
+
+    def handle(self, *args, **options):
+        backend = get_search_backend()
+        count = backend.rebuild()
+        self.stdout.write(
+            self.style.SUCCESS(f"Indexed {count} article(s) with {type(backend).__name__}.")
+        )
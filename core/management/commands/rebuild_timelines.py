@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from core.feeds import keyset_batches, rebuild_reader_timeline, recompute_fan_out_modes
+from core.models import TimelineEntry, User
+
+
+class Command(BaseCommand):
+    """
+    Rebuild every reader's materialized feed timeline from scratch.
+
+    Re-evaluates push/pull mode for all publishers and journalists first, then
+    recomputes each subscribed user's timeline. Safe to run at any time; use it
+    after bulk imports, admin edits or a change to FEED_FANOUT_MAX_AUDIENCE.
+    """
+
+    help = "Rebuild reader feed timelines from current subscriptions."
+
+    def handle(self, *args, **options):
+        recompute_fan_out_modes()
+
+        readers = (
+            User.objects.filter(
+                Q(subscribed_publishers__isnull=False)
+                | Q(subscribed_journalists__isnull=False)
+            )
+            .distinct()
+            .only("pk")
+        )
+
+        TimelineEntry.objects.exclude(reader__in=readers).delete()
+
+        reader_count = 0
+        row_count = 0
+        for batch in keyset_batches(readers.values_list("pk")):
+            for (pk,) in batch:
+                row_count += rebuild_reader_timeline(User(pk=pk))
+                reader_count += 1
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Rebuilt {reader_count} timeline(s) with {row_count} entr(ies)."
+            )
+        )
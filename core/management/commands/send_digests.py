@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand
+
+from core.digests import send_digests
+from core.models import User
+
+
+class Command(BaseCommand):
+    """
+    Send the hourly or daily new-article digests.
+
+    Schedule it from cron, e.g.::
+
+        5 * * * *  python manage.py send_digests --delivery hourly
+        15 6 * * * python manage.py send_digests --delivery daily
+
+    Each run covers the approvals logged since the previous run of the same
+    schedule; an interrupted run resumes where it stopped.
+    """
+
+    help = "Send notification digests to readers on an hourly or daily schedule."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--delivery",
+            required=True,
+            choices=["hourly", "daily"],
+            help="Which digest schedule to send.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=None,
+            help="Readers per database pass (default: DIGEST_READER_BATCH_SIZE).",
+        )
+
+    def handle(self, *args, **options):
+        delivery = {"hourly": User.Delivery.HOURLY, "daily": User.Delivery.DAILY}
+        stats = send_digests(delivery[options["delivery"]], options["batch_size"])
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Sent {stats['messages']} {options['delivery']} digest(s) covering "
+                f"{stats['articles']} article(s) in {stats['seconds']:.2f} s "
+                f"({stats['per_second']:.1f} msg/s)."
+            )
+        )
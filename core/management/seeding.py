@@ -0,0 +1,114 @@
+"""
+Synthetic data helpers for the query-plan check and benchmark commands.
+
+These insert real rows; only run them against a scratch database.
+"""
+
+import uuid
+
+from django.db import connection
+
+from core.feeds import rebuild_reader_timeline
+from core.models import Article, Publisher, User
+
+ARTICLE_STATUSES = [Article.Status.APPROVED] * 8 + [
+    Article.Status.PENDING,
+    Article.Status.REJECTED,
+]
+
+
+def seed_articles(
+    article_count: int,
+    *,
+    publisher_count: int = 20,
+    journalist_count: int = 50,
+    reader_count: int = 20,
+    build_timelines: bool = True,
+):
+    """
+    Insert synthetic publishers, users, subscriptions and articles.
+
+    Each reader subscribes to 3 publishers and follows 5 journalists, with
+    overlapping audiences so feeds contain articles matched both ways.
+
+    Args:
+        article_count (int): Number of articles to create (80% APPROVED).
+        publisher_count (int): Number of publishers to create.
+        journalist_count (int): Number of journalists to create.
+        reader_count (int): Number of readers to create.
+        build_timelines (bool): Whether to materialize reader timelines.
+
+    Returns:
+        list[User]: The seeded readers.
+    """
+    prefix = f"seed-{uuid.uuid4().hex[:8]}-"
+    Publisher.objects.bulk_create(
+        Publisher(name=f"{prefix}pub-{i}") for i in range(publisher_count)
+    )
+    User.objects.bulk_create(
+        User(
+            username=f"{prefix}journ-{i}",
+            email=f"{prefix}journ-{i}@example.com",
+            role=User.Role.JOURNALIST,
+        )
+        for i in range(journalist_count)
+    )
+    User.objects.bulk_create(
+        User(
+            username=f"{prefix}reader-{i}",
+            email=f"{prefix}reader-{i}@example.com",
+            role=User.Role.READER,
+        )
+        for i in range(reader_count)
+    )
+
+    # Re-read the rows: MySQL does not return primary keys from bulk_create.
+    publishers = list(Publisher.objects.filter(name__startswith=prefix).order_by("pk"))
+    users = User.objects.filter(username__startswith=prefix).order_by("pk")
+    journalists = list(users.filter(role=User.Role.JOURNALIST))
+    readers = list(users.filter(role=User.Role.READER))
+
+    for i, reader in enumerate(readers):
+        start = i % max(1, publisher_count - 3)
+        reader.subscribed_publishers.add(*publishers[start : start + 3])
+        start = i % max(1, journalist_count - 5)
+        reader.subscribed_journalists.add(*journalists[start : start + 5])
+
+    batch = []
+    for i in range(article_count):
+        batch.append(
+            Article(
+                title=f"Seeded article {i}",
+                body="Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 3,
+                publisher=publishers[i % len(publishers)],
+                author=journalists[(i * 7) % len(journalists)],
+                status=ARTICLE_STATUSES[i % len(ARTICLE_STATUSES)],
+            )
+        )
+        if len(batch) >= 5000:
+            Article.objects.bulk_create(batch)
+            batch = []
+    if batch:
+        Article.objects.bulk_create(batch)
+
+    if build_timelines:
+        for reader in readers:
+            rebuild_reader_timeline(reader)
+
+    analyze_tables()
+    return readers
+
+
+def analyze_tables() -> None:
+    """
+    Refresh optimizer statistics after a bulk load.
+
+    Returns:
+        None
+    """
+    with connection.cursor() as cursor:
+        if connection.vendor == "mysql":
+            cursor.execute(f"ANALYZE TABLE {Article._meta.db_table}")
+            cursor.fetchall()
+        elif connection.vendor == "sqlite":
+            cursor.execute("ANALYZE")
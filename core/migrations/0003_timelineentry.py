@@ -0,0 +1,38 @@
+# Generated by Django 6.0.2 on 2026-10-18 09:00
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_alter_publisher_name_alter_user_email'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='publisher',
+            name='fan_out_on_read',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='fan_out_on_read',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.CreateModel(
+            name='TimelineEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField()),
+                ('article', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='timeline_entries', to='core.article')),
+                ('reader', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='timeline_entries', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['reader', '-created_at', '-article'], name='timeline_reader_recent_idx')],
+                'constraints': [models.UniqueConstraint(fields=('reader', 'article'), name='timeline_unique_reader_article')],
+            },
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 6.0.2 on 2026-10-18 10:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_timelineentry'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='article',
+            index=models.Index(fields=['status', '-created_at', '-id'], name='article_status_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='article',
+            index=models.Index(fields=['publisher', 'status', '-created_at', '-id'], name='article_pub_status_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='article',
+            index=models.Index(fields=['author', 'status', '-created_at', '-id'], name='article_auth_status_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='article',
+            index=models.Index(fields=['author', '-created_at'], name='article_author_recent_idx'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 6.0.2 on 2026-10-18 11:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_article_hot_query_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='publisher',
+            name='feed_updated_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='publisher',
+            name='feed_version',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='feed_updated_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='feed_version',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
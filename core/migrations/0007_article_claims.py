@@ -0,0 +1,25 @@
+# Generated by Django 6.0.2 on 2026-10-18 12:10
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_articlestatusevent'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='article',
+            name='claim_expires_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='article',
+            name='claimed_by',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='claimed_articles', to=settings.AUTH_USER_MODEL),
+        ),
+    ]
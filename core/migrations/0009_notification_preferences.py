@@ -0,0 +1,23 @@
+# Generated by Django 6.0.2 on 2026-10-18 13:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_outboxmessage'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='notify_followed_journalists',
+            field=models.BooleanField(default=True, verbose_name='email me new articles from journalists I follow'),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='notify_subscribed_publishers',
+            field=models.BooleanField(default=True, verbose_name='email me new articles from publishers I subscribe to'),
+        ),
+    ]
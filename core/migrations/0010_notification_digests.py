@@ -0,0 +1,34 @@
+# Generated by Django 6.0.2 on 2026-10-18 14:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('core', '0009_notification_preferences'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DigestCursor',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('delivery', models.CharField(choices=[('IMMEDIATE', 'As each article is approved'), ('HOURLY', 'Hourly digest'), ('DAILY', 'Daily digest')], max_length=20, unique=True)),
+                ('last_event_id', models.BigIntegerField(default=0)),
+                ('pending_event_id', models.BigIntegerField(blank=True, null=True)),
+                ('last_reader_id', models.BigIntegerField(default=0)),
+                ('completed_at', models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='notification_delivery',
+            field=models.CharField(choices=[('IMMEDIATE', 'As each article is approved'), ('HOURLY', 'Hourly digest'), ('DAILY', 'Daily digest')], default='IMMEDIATE', max_length=20, verbose_name='send new-article emails'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['notification_delivery', 'id'], name='user_delivery_idx'),
+        ),
+    ]
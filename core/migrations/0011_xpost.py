@@ -0,0 +1,35 @@
+# Generated by Django 6.0.2 on 2026-10-18 15:10
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_notification_digests'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='XPost',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('url', models.URLField(max_length=500)),
+                ('status', models.CharField(choices=[('QUEUED', 'Queued'), ('POSTED', 'Posted'), ('FAILED', 'Failed'), ('CANCELLED', 'Cancelled')], default='QUEUED', max_length=20)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('queued_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('available_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('posted_at', models.DateTimeField(blank=True, null=True)),
+                ('post_id', models.CharField(blank=True, max_length=64)),
+                ('response_ms', models.PositiveIntegerField(blank=True, null=True)),
+                ('latency_ms', models.PositiveIntegerField(blank=True, null=True)),
+                ('last_error', models.TextField(blank=True)),
+                ('article', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='x_post', to='core.article')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['status', '-queued_at', '-id'], name='xpost_queue_idx')],
+            },
+        ),
+    ]
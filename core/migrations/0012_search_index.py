@@ -0,0 +1,43 @@
+# Generated by Django 6.0.2 on 2026-10-18 15:55
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def create_fulltext_index(apps, schema_editor):
+    """Add the FULLTEXT index used by core.search.FullTextSearchBackend (MySQL only)."""
+    if schema_editor.connection.vendor == "mysql":
+        schema_editor.execute(
+            "CREATE FULLTEXT INDEX article_fulltext_idx ON core_article (title, body)"
+        )
+
+
+def drop_fulltext_index(apps, schema_editor):
+    """Drop the FULLTEXT index (MySQL only)."""
+    if schema_editor.connection.vendor == "mysql":
+        schema_editor.execute("DROP INDEX article_fulltext_idx ON core_article")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_xpost'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchTerm',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(max_length=40)),
+                ('weight', models.FloatField()),
+                ('approved', models.BooleanField(default=False)),
+                ('article', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_terms', to='core.article')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['term', 'approved', 'article', 'weight'], name='search_term_idx')],
+                'constraints': [models.UniqueConstraint(fields=('term', 'article'), name='search_term_article_uniq')],
+            },
+        ),
+        migrations.RunPython(create_fulltext_index, drop_fulltext_index),
+    ]
@@ -5,6 +5,12 @@ This module defines the core data structures used by the application:
 - Publisher: organizations that publish articles
 - User: custom user model with a role (Reader, Journalist, Editor) and subscription relations
 - Article: news article workflow with PENDING/APPROVED/REJECTED states
+- TimelineEntry: materialized per-reader feed rows filled when articles are approved
+- ArticleStatusEvent: append-only log of article status transitions
+- OutboxMessage: side effects queued in the transaction that caused them
+- DigestCursor: progress of the hourly/daily notification digests
+- XPost: rate-limited queue and delivery record of posts to X
+- SearchTerm: inverted index postings behind article search
 """
 
 from django.contrib.auth.models import AbstractUser
@@ -19,10 +25,18 @@ class Publisher(models.Model):
     Attributes:
         name (str): Human-readable publisher name.
         description (str): Optional description/bio for the publisher.
+        fan_out_on_read (bool): True when the audience is too large to fan out
+            on approval; articles are merged into reader feeds at read time.
+        feed_version (int): Bumped whenever the publisher's set of approved
+            articles changes; part of reader feed ETags.
+        feed_updated_at (datetime): When ``feed_version`` last changed.
     """
 
     name = models.CharField(max_length=150, unique=True)
     description = models.TextField(blank=True)
+    fan_out_on_read = models.BooleanField(default=False)
+    feed_version = models.PositiveIntegerField(default=0)
+    feed_updated_at = models.DateTimeField(null=True, blank=True)
 
     def __str__(self) -> str:
         """
@@ -48,6 +62,17 @@ class User(AbstractUser):
         bio (str): Optional user bio.
         subscribed_publishers (ManyToMany[Publisher]): Publishers this user subscribes to.
         subscribed_journalists (ManyToMany[User]): Journalists this user follows.
+        fan_out_on_read (bool): For journalists, True when the follower count is
+            too large to fan out on approval; articles are merged at read time.
+        feed_version (int): Bumped when feeds derived from this user change:
+            their subscriptions (readers) or their approved articles (journalists).
+        feed_updated_at (datetime): When ``feed_version`` last changed.
+        notify_subscribed_publishers (bool): Email this user when a subscribed
+            publisher has a new approved article.
+        notify_followed_journalists (bool): Email this user when a followed
+            journalist has a new approved article.
+        notification_delivery (str): Send those emails per article
+            (IMMEDIATE) or collected in an HOURLY or DAILY digest.
     """
 
     class Role(models.TextChoices):
@@ -57,6 +82,13 @@ class User(AbstractUser):
         JOURNALIST = "JOURNALIST", "Journalist"
         EDITOR = "EDITOR", "Editor"
 
+    class Delivery(models.TextChoices):
+        """When new-article notifications are sent."""
+
+        IMMEDIATE = "IMMEDIATE", "As each article is approved"
+        HOURLY = "HOURLY", "Hourly digest"
+        DAILY = "DAILY", "Daily digest"
+
     role = models.CharField(
         max_length=20,
         choices=Role.choices,
@@ -79,6 +111,29 @@ class User(AbstractUser):
         blank=True,
     )
 
+    fan_out_on_read = models.BooleanField(default=False)
+    feed_version = models.PositiveIntegerField(default=0)
+    feed_updated_at = models.DateTimeField(null=True, blank=True)
+
+    notify_subscribed_publishers = models.BooleanField(
+        "email me new articles from publishers I subscribe to", default=True
+    )
+    notify_followed_journalists = models.BooleanField(
+        "email me new articles from journalists I follow", default=True
+    )
+    notification_delivery = models.CharField(
+        "send new-article emails",
+        max_length=20,
+        choices=Delivery.choices,
+        default=Delivery.IMMEDIATE,
+    )
+
+    class Meta(AbstractUser.Meta):
+        # The digest command walks each delivery mode's readers in id order.
+        indexes = [
+            models.Index(fields=["notification_delivery", "id"], name="user_delivery_idx"),
+        ]
+
     def __str__(self) -> str:
         """
         Return a human-readable string representation.
@@ -104,6 +159,9 @@ class Article(models.Model):
         status (str): One of Status choices.
         decision_reason (str): Optional reason provided when rejecting.
         decided_at (datetime): Timestamp when approved/rejected.
+        claimed_by (User): Editor currently holding the review lease, if any.
+        claim_expires_at (datetime): When that lease lapses; expired leases
+            count as unclaimed.
         created_at (datetime): Created timestamp.
         updated_at (datetime): Updated timestamp.
     """
@@ -140,9 +198,67 @@ class Article(models.Model):
     decision_reason = models.TextField(blank=True)
     decided_at = models.DateTimeField(null=True, blank=True)
 
+    claimed_by = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        related_name="claimed_articles",
+        null=True,
+        blank=True,
+    )
+    claim_expires_at = models.DateTimeField(null=True, blank=True)
+
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        # Every hot query filters on status (plus publisher/author) and reads
+        # newest-first; ``id`` is the keyset tie-breaker used by the API feeds.
+        # ``manage.py check_query_plans`` verifies the plans use these.
+        indexes = [
+            models.Index(
+                fields=["status", "-created_at", "-id"],
+                name="article_status_recent_idx",
+            ),
+            models.Index(
+                fields=["publisher", "status", "-created_at", "-id"],
+                name="article_pub_status_recent_idx",
+            ),
+            models.Index(
+                fields=["author", "status", "-created_at", "-id"],
+                name="article_auth_status_recent_idx",
+            ),
+            models.Index(
+                fields=["author", "-created_at"],
+                name="article_author_recent_idx",
+            ),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """
+        Remember the status the row was loaded with.
+
+        The post_save handler in ``core.signals`` compares it with the saved
+        status to detect workflow transitions (e.g. PENDING -> APPROVED).
+
+        Returns:
+            Article: The loaded instance.
+        """
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_status = instance.__dict__.get("status")
+        return instance
+
+    def refresh_from_db(self, using=None, fields=None, **kwargs) -> None:
+        """
+        Reload fields from the database and re-remember the loaded status.
+
+        Returns:
+            None
+        """
+        super().refresh_from_db(using=using, fields=fields, **kwargs)
+        if fields is None or "status" in fields:
+            self._loaded_status = self.status
+
     def approve(self) -> None:
         """
         Mark the article as approved and set the decision timestamp.
@@ -176,4 +292,353 @@ class Article(models.Model):
         Returns:
             str: The article title.
         """
-        return self.title
\ No newline at end of file
+        return self.title
+
+
+class TimelineEntry(models.Model):
+    """
+    A materialized row in a reader's feed.
+
+    Rows are written when an article is approved (fan-out on write) so the
+    feed endpoint reads one indexed range per reader instead of re-evaluating
+    every subscription on each request. Sources flagged ``fan_out_on_read``
+    are not fanned out; their articles are merged in at read time.
+
+    Attributes:
+        reader (User): The user whose feed this row belongs to.
+        article (Article): The approved article.
+        created_at (datetime): Copy of ``Article.created_at`` used for ordering.
+    """
+
+    reader = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="timeline_entries",
+    )
+    article = models.ForeignKey(
+        Article,
+        on_delete=models.CASCADE,
+        related_name="timeline_entries",
+    )
+    created_at = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["reader", "article"],
+                name="timeline_unique_reader_article",
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=["reader", "-created_at", "-article"],
+                name="timeline_reader_recent_idx",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        """
+        Return a human-readable string representation.
+
+        Returns:
+            str: Reader and article identifiers.
+        """
+        return f"{self.reader_id} -> {self.article_id}"
+
+
+class ArticleStatusEvent(models.Model):
+    """
+    An append-only record of one Article status transition.
+
+    Written for every transition (editor decisions, ``Article.approve()`` /
+    ``reject()`` and admin edits) by the ``article_status_changed`` receiver,
+    and as an APPROVED -> APPROVED event when an approved article's text is
+    edited.
+    The publisher and author are copied from the article at the time of the
+    event so the delta-sync endpoint can select a reader's events without
+    joining Article. Event ids increase monotonically and double as sync
+    tokens.
+
+    Attributes:
+        article (Article): The article whose status changed.
+        publisher (Publisher): The article's publisher when the event happened.
+        author (User): The article's author when the event happened.
+        previous_status (str): Status before the transition; blank for new rows.
+        status (str): Status after the transition.
+        created_at (datetime): When the transition happened.
+    """
+
+    article = models.ForeignKey(
+        Article,
+        on_delete=models.CASCADE,
+        related_name="status_events",
+    )
+    publisher = models.ForeignKey(
+        Publisher,
+        on_delete=models.CASCADE,
+        related_name="+",
+    )
+    author = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="+",
+    )
+    previous_status = models.CharField(
+        max_length=20,
+        choices=Article.Status.choices,
+        blank=True,
+    )
+    status = models.CharField(max_length=20, choices=Article.Status.choices)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["publisher", "id"], name="status_event_pub_idx"),
+            models.Index(fields=["author", "id"], name="status_event_author_idx"),
+        ]
+
+    def __str__(self) -> str:
+        """
+        Return a human-readable string representation.
+
+        Returns:
+            str: Article identifier and the transition.
+        """
+        return f"{self.article_id}: {self.previous_status or '-'} -> {self.status}"
+
+
+class OutboxMessage(models.Model):
+    """
+    A side effect (notification emails, X post) waiting to be delivered.
+
+    Rows are written in the same transaction as the change that caused them,
+    so a side effect is queued if and only if the change commits. The
+    ``process_outbox`` worker claims due rows, runs the handler registered for
+    ``topic`` (see ``core.outbox``) and retries failures with backoff until
+    ``OUTBOX_MAX_ATTEMPTS`` is reached, after which the row is dead-lettered.
+
+    Attributes:
+        topic (str): Handler name.
+        payload (dict): JSON arguments for the handler.
+        status (str): One of Status choices.
+        attempts (int): Deliveries started so far.
+        available_at (datetime): When the row may next be claimed; pushed
+            forward while a worker holds it and after each failure.
+        last_error (str): Error from the most recent failed attempt.
+        created_at (datetime): When the row was queued.
+        processed_at (datetime): When it was delivered or dead-lettered.
+    """
+
+    class Status(models.TextChoices):
+        """Delivery states."""
+
+        PENDING = "PENDING", "Pending"
+        DONE = "DONE", "Done"
+        DEAD = "DEAD", "Dead-lettered"
+
+    topic = models.CharField(max_length=50)
+    payload = models.JSONField(default=dict)
+    status = models.CharField(
+        max_length=20,
+        choices=Status.choices,
+        default=Status.PENDING,
+    )
+    attempts = models.PositiveIntegerField(default=0)
+    available_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "available_at", "id"], name="outbox_due_idx"),
+        ]
+
+    def __str__(self) -> str:
+        """
+        Return a human-readable string representation.
+
+        Returns:
+            str: Topic, id and status.
+        """
+        return f"{self.topic} #{self.pk} ({self.status})"
+
+
+class DigestCursor(models.Model):
+    """
+    Progress of one digest schedule through the article status event log.
+
+    A digest run covers the APPROVED events in ``(last_event_id,
+    pending_event_id]`` and walks readers in id order, recording the last
+    reader done after every batch so an interrupted run resumes where it
+    stopped instead of mailing anyone twice.
+
+    Attributes:
+        delivery (str): ``User.Delivery`` value (HOURLY or DAILY).
+        last_event_id (int): Last event covered by a completed run.
+        pending_event_id (int): Upper bound of the run in progress, if any.
+        last_reader_id (int): Last reader mailed by the run in progress.
+        completed_at (datetime): When the last run finished.
+    """
+
+    delivery = models.CharField(max_length=20, choices=User.Delivery.choices, unique=True)
+    last_event_id = models.BigIntegerField(default=0)
+    pending_event_id = models.BigIntegerField(null=True, blank=True)
+    last_reader_id = models.BigIntegerField(default=0)
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self) -> str:
+        """
+        Return a human-readable string representation.
+
+        Returns:
+            str: Delivery mode and position.
+        """
+        return f"{self.delivery} digest after event {self.last_event_id}"
+
+
+class XPost(models.Model):
+    """
+    One approved article's post to X: its place in the posting queue and
+    the outcome.
+
+    Rows are written in the approval's transaction and drained by the
+    ``post_to_x`` scheduler (see ``core.services.x_scheduler``) at the rate
+    X allows, freshest first.
+
+    Attributes:
+        article (Article): The article to post.
+        url (str): Absolute URL of the article page.
+        status (str): One of Status choices.
+        attempts (int): Posts tried (rate-limited tries are not counted).
+        queued_at (datetime): When the article was (re)queued.
+        available_at (datetime): When the row may next be claimed.
+        posted_at (datetime): When X accepted the post.
+        post_id (str): Id of the post on X.
+        response_ms (int): Duration of the successful request.
+        latency_ms (int): Time from queueing to posting.
+        last_error (str): Error from the most recent failed attempt.
+    """
+
+    class Status(models.TextChoices):
+        """Posting states."""
+
+        QUEUED = "QUEUED", "Queued"
+        POSTED = "POSTED", "Posted"
+        FAILED = "FAILED", "Failed"
+        CANCELLED = "CANCELLED", "Cancelled"
+
+    article = models.OneToOneField(Article, on_delete=models.CASCADE, related_name="x_post")
+    url = models.URLField(max_length=500)
+    status = models.CharField(
+        max_length=20,
+        choices=Status.choices,
+        default=Status.QUEUED,
+    )
+    attempts = models.PositiveIntegerField(default=0)
+    queued_at = models.DateTimeField(default=timezone.now)
+    available_at = models.DateTimeField(default=timezone.now)
+    posted_at = models.DateTimeField(null=True, blank=True)
+    post_id = models.CharField(max_length=64, blank=True)
+    response_ms = models.PositiveIntegerField(null=True, blank=True)
+    latency_ms = models.PositiveIntegerField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "-queued_at", "-id"], name="xpost_queue_idx"),
+        ]
+
+    def __str__(self) -> str:
+        """
+        Return a human-readable string representation.
+
+        Returns:
+            str: Article id and status.
+        """
+        return f"X post of article {self.article_id} ({self.status})"
+
+
+class SearchTerm(models.Model):
+    """
+    One posting of the article search index: a term occurring in an article.
+
+    Maintained by ``core.search.DatabaseSearchBackend``: an article's rows are
+    rewritten when its title or body is saved, and ``approved`` follows the
+    article's status (one UPDATE per approval or retraction), so reader
+    searches only read the postings of APPROVED articles.
+
+    Attributes:
+        term (str): Normalized token (see ``core.search.tokenize``).
+        article (Article): The article containing the term.
+        weight (float): Length-normalized log term frequency; title
+            occurrences count ``SEARCH_TITLE_WEIGHT`` times.
+        approved (bool): Whether the article is APPROVED.
+    """
+
+    term = models.CharField(max_length=40)
+    article = models.ForeignKey(
+        Article, on_delete=models.CASCADE, related_name="search_terms"
+    )
+    weight = models.FloatField()
+    approved = models.BooleanField(default=False)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["term", "article"], name="search_term_article_uniq"),
+        ]
+        indexes = [
+            # Covers the ranking query: postings of the query terms, approved
+            # only, with their weights, without touching the table rows.
+            models.Index(
+                fields=["term", "approved", "article", "weight"], name="search_term_idx"
+            ),
+        ]
+
+    def __str__(self) -> str:
+        """
+        Return a human-readable string representation.
+
+        Returns:
+            str: Term and article id.
+        """
+        return f"{self.term} in article {self.article_id}"
+
+
+class RelatedArticle(models.Model):
+    """
+    One entry of an article's precomputed "related articles" list.
+
+    Written by ``core.related.update_related_articles``; the detail page reads
+    an article's list with one indexed query.
+
+    Attributes:
+        article (Article): The article whose page shows the link.
+        related (Article): The linked article.
+        rank (int): Position in the list, 0 for the most similar.
+        score (float): Cosine similarity of the two TF-IDF vectors.
+    """
+
+    article = models.ForeignKey(
+        Article, on_delete=models.CASCADE, related_name="related_links"
+    )
+    related = models.ForeignKey(
+        Article, on_delete=models.CASCADE, related_name="linked_from"
+    )
+    rank = models.PositiveSmallIntegerField()
+    score = models.FloatField()
+
+    class Meta:
+        constraints = [
+            # Also the index the detail page reads a list through.
+            models.UniqueConstraint(fields=["article", "rank"], name="related_article_rank_uniq"),
+        ]
+
+    def __str__(self) -> str:
+        """
+        Return a human-readable string representation.
+
+        Returns:
+            str: Both article ids.
+        """
+        return f"article {self.related_id} related to {self.article_id}"
@@ -0,0 +1,670 @@
+"""
+Editorial decisions and review-queue leases for the editor queue and the admin.
+
+Editors do not share one queue view: ``claim_articles`` leases the next
+``EDITOR_CLAIM_BATCH_SIZE`` unclaimed PENDING articles to an editor for
+``EDITOR_CLAIM_TTL`` seconds. Candidates are locked with ``SELECT ... FOR
+UPDATE SKIP LOCKED`` so concurrent claims pick disjoint rows instead of
+queueing behind each other; leases that lapse count as unclaimed again.
+
+``decide`` applies one decision as a compare-and-set: the UPDATE only matches
+while the article still has the status the editor saw and is not leased to
+another editor, so a lost race changes nothing and is reported to the caller.
+
+``bulk_decide`` applies one decision to many articles inside a transaction
+with a single UPDATE, then runs the usual post-decision side effects
+(timelines, feed/homepage/detail cache invalidation, status event log) in
+batches via the ``articles_status_changed`` signal.
+
+Both write their notifications to the outbox (``core.outbox``) and approved
+articles to the X post queue (``core.services.x_scheduler``) in the
+decision's transaction; the ``process_outbox`` worker and the ``post_to_x``
+scheduler deliver them.
+Notifications are coalesced and streamed through the fan-out mailer
+(``core.mailer``): each author receives one message listing all of their
+decided articles, and each reader one message (or BCC chunk) listing all
+newly approved articles from publishers they subscribe to and journalists
+they follow, as allowed by their notification preferences. The worker splits
+a decision's notifications into one outbox message for the authors and one
+per ``OUTBOX_NOTIFICATION_BATCH_SIZE`` readers, so a failed send is retried
+for its own batch only.
+"""
+
+from collections import defaultdict
+from datetime import timedelta
+from itertools import chain, groupby
+from operator import itemgetter
+
+from django.conf import settings
+from django.core.mail import EmailMessage
+from django.db import transaction
+from django.db.models import F, Q
+from django.urls import reverse
+from django.utils import timezone
+
+from .mailer import bcc_messages, send_batched
+from .models import Article, User
+from .outbox import DECISION_NOTIFICATIONS, complete_current, enqueue
+from .services.x_scheduler import queue_x_posts
+from .signals import articles_status_changed
+
+AUDIENCE_CHANNELS = [
+    ("publisher__subscribers", "notify_subscribed_publishers"),
+    ("author__followers", "notify_followed_journalists"),
+]
+
+APPROVE = "approve"
+REJECT = "reject"
+ACTION_STATUS = {
+    APPROVE: Article.Status.APPROVED,
+    REJECT: Article.Status.REJECTED,
+}
+
+
+def _claim_ttl() -> timedelta:
+    """
+    Return how long a review lease lasts.
+
+    Returns:
+        timedelta: Lease duration.
+    """
+    return timedelta(seconds=getattr(settings, "EDITOR_CLAIM_TTL", 900))
+
+
+def _unclaimed(now) -> Q:
+    """
+    Match articles nobody holds a live lease on.
+
+    Returns:
+        Q: The filter.
+    """
+    return Q(claimed_by__isnull=True) | Q(claim_expires_at__lte=now)
+
+
+def _open_to(editor: User, now) -> Q:
+    """
+    Match articles ``editor`` may decide: unclaimed or leased to them.
+
+    Returns:
+        Q: The filter.
+    """
+    return _unclaimed(now) | Q(claimed_by=editor)
+
+
+def claim_candidates(now):
+    """
+    Return unclaimed pending articles, oldest first.
+
+    Args:
+        now (datetime): Leases expiring at or before this count as unclaimed.
+
+    Returns:
+        QuerySet[Article]: The claimable rows.
+    """
+    return (
+        Article.objects.filter(status=Article.Status.PENDING)
+        .filter(_unclaimed(now))
+        .order_by("created_at", "pk")
+    )
+
+
+def claim_articles(editor: User, limit: int | None = None) -> list:
+    """
+    Lease pending articles to an editor, oldest first.
+
+    Leases the editor already holds are renewed and count towards ``limit``;
+    the rest is topped up from unclaimed articles, skipping rows another
+    editor is claiming at the same moment.
+
+    Args:
+        editor (User): The editor pulling work.
+        limit (int): Batch size; defaults to ``EDITOR_CLAIM_BATCH_SIZE``.
+
+    Returns:
+        list[Article]: The editor's leased articles (author/publisher loaded).
+    """
+    limit = limit or getattr(settings, "EDITOR_CLAIM_BATCH_SIZE", 10)
+    now = timezone.now()
+    expires_at = now + _claim_ttl()
+    pending = Article.objects.filter(status=Article.Status.PENDING)
+
+    with transaction.atomic():
+        held = pending.filter(claimed_by=editor).update(claim_expires_at=expires_at)
+        if held < limit:
+            candidates = list(
+                claim_candidates(now)
+                .select_for_update(skip_locked=True)
+                .values_list("pk", flat=True)[: limit - held]
+            )
+            # Re-check the lease in the UPDATE for backends without row locks.
+            pending.filter(_unclaimed(now), pk__in=candidates).update(
+                claimed_by=editor, claim_expires_at=expires_at
+            )
+
+    return list(
+        pending.filter(claimed_by=editor, claim_expires_at__gt=now)
+        .select_related("author", "publisher")
+        .order_by("created_at", "pk")
+    )
+
+
+def release_claims(editor: User) -> int:
+    """
+    Hand an editor's leased articles back to the queue.
+
+    Args:
+        editor (User): The editor releasing their leases.
+
+    Returns:
+        int: Number of leases released.
+    """
+    return Article.objects.filter(claimed_by=editor).update(
+        claimed_by=None, claim_expires_at=None
+    )
+
+
+def _mark_decided(article: Article, status: str, reason: str, now) -> None:
+    """
+    Mirror a decision UPDATE onto an in-memory article.
+
+    Returns:
+        None
+    """
+    article.status = status
+    article.decision_reason = reason
+    article.decided_at = now
+    article.updated_at = now
+    article.claimed_by = None
+    article.claim_expires_at = None
+    article._loaded_status = status
+
+
+def _enqueue_side_effects(articles, action: str, reason: str, request) -> None:
+    """
+    Queue the notifications and X posts for decided articles.
+
+    Call inside the decision's transaction.
+
+    Args:
+        articles (list[Article]): The decided articles.
+        action (str): ``"approve"`` or ``"reject"``.
+        reason (str): Rejection reason.
+        request: The current request (used to build links for X posts).
+
+    Returns:
+        None
+    """
+    enqueue(
+        DECISION_NOTIFICATIONS,
+        {"article_ids": [article.pk for article in articles], "action": action, "reason": reason},
+    )
+    if action == APPROVE:
+        queue_x_posts(
+            {
+                article.pk: request.build_absolute_uri(
+                    reverse("core:article_detail", args=[article.pk])
+                )
+                for article in articles
+            }
+        )
+
+
+def decide(
+    article: Article,
+    action: str,
+    *,
+    request,
+    expected_status: str,
+    editor: User | None = None,
+    reason: str = "",
+) -> bool:
+    """
+    Approve or reject one article with a compare-and-set on its status.
+
+    Sends ``articles_status_changed`` for the usual side effects and queues
+    the notifications (and the X post on approval) in the same transaction;
+    a decision that leaves the status unchanged queues nothing.
+
+    Args:
+        article (Article): The article to decide; updated in place on success.
+        action (str): ``"approve"`` or ``"reject"``.
+        request: The current request (used to build links for X posts).
+        expected_status (str): Status the editor based the decision on.
+        editor (User): The deciding editor. Articles leased to another editor
+            are not decided; None skips the lease check.
+        reason (str): Rejection reason.
+
+    Returns:
+        bool: False if the article changed status or was claimed by another
+        editor in the meantime (nothing was written).
+
+    Raises:
+        ValueError: On an unknown action or expected status.
+    """
+    if action not in ACTION_STATUS:
+        raise ValueError(f"Unknown action: {action}")
+    if expected_status not in Article.Status.values:
+        raise ValueError(f"Unknown status: {expected_status}")
+    status = ACTION_STATUS[action]
+    reason = reason if action == REJECT else ""
+    now = timezone.now()
+
+    rows = Article.objects.filter(pk=article.pk, status=expected_status)
+    if editor is not None:
+        rows = rows.filter(_open_to(editor, now))
+
+    with transaction.atomic():
+        updated = rows.update(
+            status=status,
+            decision_reason=reason,
+            decided_at=now,
+            updated_at=now,
+            claimed_by=None,
+            claim_expires_at=None,
+        )
+        if not updated:
+            return False
+        _mark_decided(article, status, reason, now)
+        if expected_status != status:
+            articles_status_changed.send(
+                sender=Article,
+                articles=[article],
+                previous_statuses={article.pk: expected_status},
+                status=status,
+            )
+            _enqueue_side_effects([article], action, reason, request)
+    return True
+
+
+def bulk_decide(
+    article_ids,
+    action: str,
+    *,
+    request,
+    reason: str = "",
+    editor: User | None = None,
+):
+    """
+    Approve or reject many articles at once.
+
+    Articles already in the target status are skipped, as are articles leased
+    to an editor other than ``editor``.
+
+    Args:
+        article_ids: Primary keys of the articles to decide.
+        action (str): ``"approve"`` or ``"reject"``.
+        reason (str): Rejection reason stored on every rejected article.
+        request: The current request (used to build links for X posts).
+        editor (User): The deciding editor; None (admin actions) ignores leases.
+
+    Returns:
+        list[Article]: The articles whose status changed.
+
+    Raises:
+        ValueError: On an unknown action.
+    """
+    if action not in ACTION_STATUS:
+        raise ValueError(f"Unknown action: {action}")
+    status = ACTION_STATUS[action]
+    reason = reason if action == REJECT else ""
+    now = timezone.now()
+
+    candidates = Article.objects.filter(pk__in=list(article_ids))
+    if editor is not None:
+        candidates = candidates.filter(_open_to(editor, now))
+
+    with transaction.atomic():
+        articles = list(
+            candidates.select_for_update(of=("self",))
+            .exclude(status=status)
+            .select_related("publisher", "author")
+            .order_by("pk")
+        )
+        if not articles:
+            return []
+
+        previous_statuses = {article.pk: article.status for article in articles}
+        Article.objects.filter(pk__in=list(previous_statuses)).update(
+            status=status,
+            decision_reason=reason,
+            decided_at=now,
+            updated_at=now,
+            claimed_by=None,
+            claim_expires_at=None,
+        )
+        for article in articles:
+            _mark_decided(article, status, reason, now)
+
+        articles_status_changed.send(
+            sender=Article,
+            articles=articles,
+            previous_statuses=previous_statuses,
+            status=status,
+        )
+        _enqueue_side_effects(articles, action, reason, request)
+    return articles
+
+
+def _author_messages(articles, action: str, reason: str):
+    """
+    Build one decision summary per author.
+
+    Returns:
+        list[EmailMessage]: Messages to send.
+    """
+    by_author = defaultdict(list)
+    for article in articles:
+        if article.author.email:
+            by_author[article.author].append(article)
+
+    messages = []
+    for author, decided in by_author.items():
+        titles = "\n".join(f"- {a.title} ({a.publisher.name})" for a in decided)
+        if len(decided) == 1:
+            article = decided[0]
+            if action == APPROVE:
+                subject = f"Article approved: {article.title}"
+                body = (
+                    f"Hi {author.username},\n\n"
+                    f"Good news — your article '{article.title}' has been approved.\n\n"
+                    f"Publisher: {article.publisher.name}\n\n"
+                    "Regards,\nNews App Editor"
+                )
+            else:
+                subject = f"Article rejected: {article.title}"
+                body = (
+                    f"Hi {author.username},\n\n"
+                    f"Your article '{article.title}' was not approved.\n\n"
+                    f"Reason:\n{reason if reason else 'No reason provided.'}\n\n"
+                    "Regards,\nNews App Editor"
+                )
+        elif action == APPROVE:
+            subject = f"{len(decided)} article(s) approved"
+            body = (
+                f"Hi {author.username},\n\n"
+                f"Good news — these articles have been approved:\n\n{titles}\n\n"
+                "Regards,\nNews App Editor"
+            )
+        else:
+            subject = f"{len(decided)} article(s) rejected"
+            body = (
+                f"Hi {author.username},\n\n"
+                f"These articles were not approved:\n\n{titles}\n\n"
+                f"Reason:\n{reason if reason else 'No reason provided.'}\n\n"
+                "Regards,\nNews App Editor"
+            )
+        messages.append(
+            EmailMessage(subject, body, settings.DEFAULT_FROM_EMAIL, [author.email])
+        )
+    return messages
+
+
+def _audience_rows(article_ids, readers: str, preference: str, delivery: str, reader_ids):
+    """
+    Select ``(reader, email, article)`` rows for one notification channel.
+
+    Args:
+        article_ids (list[int]): Approved article ids.
+        readers (str): Path from Article to the audience, e.g.
+            ``"publisher__subscribers"``.
+        preference (str): User field that opts the reader in.
+        delivery (str): Only readers with this ``notification_delivery``.
+        reader_ids (list[int] | None): Only these readers, if given.
+
+    Returns:
+        QuerySet: Articles annotated with ``reader_id``, ``reader_email`` and
+        ``article_id``, one row per article and reader.
+    """
+    # Every reader column comes from one annotation join; filtering on the
+    # relation path itself would join the audience a second time.
+    rows = (
+        Article.objects.filter(pk__in=article_ids)
+        .annotate(
+            reader_id=F(f"{readers}__id"),
+            reader_email=F(f"{readers}__email"),
+            article_id=F("id"),
+        )
+        .alias(
+            opted_in=F(f"{readers}__{preference}"),
+            delivery=F(f"{readers}__notification_delivery"),
+        )
+        .filter(opted_in=True, delivery=delivery)
+        .exclude(reader_email="")
+        .exclude(reader_id=F("author_id"))
+    )
+    if reader_ids is not None:
+        rows = rows.filter(reader_id__in=reader_ids)
+    return rows
+
+
+def notification_audience(
+    article_ids,
+    *,
+    delivery: str = User.Delivery.IMMEDIATE,
+    reader_ids=None,
+):
+    """
+    Return who to notify about newly approved articles, in one SQL query.
+
+    The audience is the UNION of the articles' publisher subscribers and
+    author followers who opted in to that kind of email (``User.notify_*``),
+    minus each article's own author. UNION removes readers reached through
+    both channels, and the rows come back ordered by reader so callers can
+    stream them.
+
+    Args:
+        article_ids (list[int]): Approved article ids.
+        delivery (str): Only readers with this delivery mode; digest readers
+            are left to ``core.digests``.
+        reader_ids (list[int] | None): Restrict to these readers.
+
+    Returns:
+        QuerySet: Distinct ``(reader_id, reader_email, article_id)`` rows.
+    """
+    publishers, followers = (
+        _audience_rows(article_ids, readers, preference, delivery, reader_ids).values_list(
+            "reader_id", "reader_email", "article_id"
+        )
+        for readers, preference in AUDIENCE_CHANNELS
+    )
+    return publishers.union(followers).order_by("reader_id", "article_id")
+
+
+def audience_reader_batches(article_ids, size: int):
+    """
+    Yield the ids of the immediate notification audience in batches, by id.
+
+    Every batch is its own bounded keyset query (``reader_id > last ORDER BY
+    reader_id LIMIT size``) rather than one ``QuerySet.iterator()``, which
+    mysqlclient buffers whole client-side, so memory stays flat however large
+    the audience is.
+
+    Args:
+        article_ids (list[int]): Approved article ids.
+        size (int): Readers per batch.
+
+    Returns:
+        Iterator[list[int]]: Reader id batches.
+    """
+    after = 0
+    while True:
+        publishers, followers = (
+            _audience_rows(article_ids, readers, preference, User.Delivery.IMMEDIATE, None)
+            .filter(reader_id__gt=after)
+            .values_list("reader_id", flat=True)
+            for readers, preference in AUDIENCE_CHANNELS
+        )
+        batch = list(publishers.union(followers).order_by("reader_id")[:size])
+        if not batch:
+            return
+        yield batch
+        after = batch[-1]
+
+
+def _subscribers(articles, reader_ids=None):
+    """
+    Stream the notification audience of the approved articles.
+
+    The audience is read in batches of ``MAIL_QUERY_CHUNK_SIZE`` readers
+    (``audience_reader_batches``), one query per batch, so memory does not
+    grow with the audience.
+
+    Args:
+        articles (list[Article]): Approved articles.
+        reader_ids (list[int] | None): Restrict to these readers.
+
+    Returns:
+        Iterator[tuple[str, list[Article]]]: Each reader's email and the
+        approved articles (by pk) they should hear about.
+    """
+    by_pk = {article.pk: article for article in articles}
+    if reader_ids is None:
+        batches = audience_reader_batches(
+            list(by_pk), getattr(settings, "MAIL_QUERY_CHUNK_SIZE", 2000)
+        )
+    else:
+        batches = [reader_ids]
+    for batch in batches:
+        rows = notification_audience(list(by_pk), reader_ids=batch)
+        for (_, email), matches in groupby(rows, key=itemgetter(0, 1)):
+            yield email, [by_pk[article_id] for _, _, article_id in matches]
+
+
+def _digest(approved) -> tuple:
+    """
+    Render the new-articles notification for a list of approved articles.
+
+    Returns:
+        tuple[str, str]: Subject and body.
+    """
+    if len(approved) == 1:
+        article = approved[0]
+        subject = f"New article from {article.publisher.name}: {article.title}"
+    else:
+        subject = f"{len(approved)} new article(s) from publishers and journalists you follow"
+    lines = "\n".join(
+        f"- {a.title} by {a.author.username} ({a.publisher.name}): "
+        f"http://127.0.0.1:8000/articles/{a.pk}/"
+        for a in approved
+    )
+    return subject, f"Hi,\n\nNew articles have been published:\n\n{lines}\n\nRegards,\nNews App"
+
+
+def _subscriber_messages(articles, reader_ids=None):
+    """
+    Stream the new-articles notifications for the approved articles.
+
+    With ``MAIL_FANOUT_MODE = "recipient"`` (default) every subscriber gets
+    their own message. With ``"bcc"`` subscribers due the same articles share
+    messages, BCC'd in chunks of ``MAIL_BCC_CHUNK_SIZE``; only one partial
+    chunk per distinct article set is buffered at a time.
+
+    Args:
+        articles (list[Article]): Approved articles.
+        reader_ids (list[int] | None): Restrict to these readers.
+
+    Returns:
+        Iterator[EmailMessage]: Messages to send.
+    """
+    if getattr(settings, "MAIL_FANOUT_MODE", "recipient") != "bcc":
+        for email, approved in _subscribers(articles, reader_ids):
+            yield EmailMessage(*_digest(approved), settings.DEFAULT_FROM_EMAIL, [email])
+        return
+
+    chunk_size = getattr(settings, "MAIL_BCC_CHUNK_SIZE", 50)
+    pending = {}
+    for email, approved in _subscribers(articles, reader_ids):
+        key = tuple(article.pk for article in approved)
+        emails = pending.setdefault(key, (approved, []))[1]
+        emails.append(email)
+        if len(emails) == chunk_size:
+            del pending[key]
+            yield from bcc_messages(*_digest(approved), emails, chunk_size)
+    for approved, emails in pending.values():
+        yield from bcc_messages(*_digest(approved), emails, chunk_size)
+
+
+def send_decision_notifications(articles, action: str, reason: str = "") -> dict:
+    """
+    Send the coalesced notifications for a decision over one connection.
+
+    Args:
+        articles (list[Article]): Decided articles (publisher/author loaded).
+        action (str): ``"approve"`` or ``"reject"``.
+        reason (str): Rejection reason.
+
+    Returns:
+        dict: Delivery statistics from ``core.mailer.send_batched``.
+    """
+    messages = _author_messages(articles, action, reason)
+    if action == APPROVE:
+        messages = chain(messages, _subscriber_messages(articles))
+    return send_batched(messages)
+
+
+def _split_decision_notifications(payload: dict) -> int:
+    """
+    Queue a decision's notifications as one message for the authors and one
+    per ``OUTBOX_NOTIFICATION_BATCH_SIZE`` readers of the audience.
+
+    Reader ids are read in keyset batches (``audience_reader_batches``) and
+    each part is queued as soon as its batch is read. The parts are written
+    in one transaction that also marks the decision's own message DONE, so
+    either every batch is queued exactly once or none is.
+
+    Args:
+        payload (dict): ``article_ids``, ``action`` and ``reason``.
+
+    Returns:
+        int: Number of messages queued.
+    """
+    batch_size = getattr(settings, "OUTBOX_NOTIFICATION_BATCH_SIZE", 500)
+    with transaction.atomic():
+        enqueue(DECISION_NOTIFICATIONS, {**payload, "authors": True})
+        queued = 1
+        if payload["action"] == APPROVE:
+            for batch in audience_reader_batches(payload["article_ids"], batch_size):
+                enqueue(DECISION_NOTIFICATIONS, {**payload, "reader_ids": batch})
+                queued += 1
+        complete_current()
+    return queued
+
+
+def deliver_decision_notifications(payload: dict) -> dict | None:
+    """
+    Outbox handler for ``decision_notifications`` messages.
+
+    A decision's message is split into parts (see
+    ``_split_decision_notifications``); each part sends the author messages
+    (``authors``) or the notifications of one batch of readers
+    (``reader_ids``) about the articles that are still APPROVED.
+
+    Args:
+        payload (dict): ``article_ids``, ``action`` and ``reason``, plus
+            ``authors`` or ``reader_ids`` on the parts.
+
+    Returns:
+        dict | None: For parts that sent mail, ``messages`` and
+        ``recipients`` sent, ``batches`` and ``seconds`` from
+        ``core.mailer.send_batched``, for the outbox worker's totals.
+    """
+    if "authors" not in payload and "reader_ids" not in payload:
+        _split_decision_notifications(payload)
+        return None
+    articles = (
+        Article.objects.filter(pk__in=payload["article_ids"])
+        .select_related("publisher", "author")
+        .order_by("pk")
+    )
+    if "reader_ids" in payload:
+        # Articles retracted since the decision are no longer news.
+        articles = list(articles.filter(status=Article.Status.APPROVED))
+        if not articles:
+            return None
+        stats = send_batched(_subscriber_messages(articles, payload["reader_ids"]))
+    else:
+        stats = send_batched(
+            _author_messages(list(articles), payload["action"], payload["reason"])
+        )
+    del stats["per_second"]  # Not additive; the worker derives it from the totals.
+    return stats
@@ -0,0 +1,254 @@
+"""
+Transactional outbox for side effects of editorial decisions.
+
+Request handlers only write ``OutboxMessage`` rows (``enqueue``), inside the
+transaction that changes the article, and never talk to the mail server.
+The ``process_outbox`` management command drains the table:
+
+1. ``claim_batch`` locks due rows with ``SELECT ... FOR UPDATE SKIP LOCKED``
+   (so several workers can run side by side), counts the attempt and hides
+   the rows for ``OUTBOX_LEASE_SECONDS``; rows of a crashed worker become due
+   again when the lease lapses.
+2. Handlers run on a thread pool; each topic maps to a dotted path in
+   ``HANDLERS``, receives the JSON payload and may return a dict of delivery
+   statistics (e.g. emails sent), which the worker adds up and reports.
+3. Successes are marked DONE. Failures are retried after an exponential,
+   jittered backoff and dead-lettered (DEAD) after ``OUTBOX_MAX_ATTEMPTS``
+   attempts; dead rows can be re-queued from the admin.
+
+X posts have their own rate-limited queue (``core.services.x_scheduler``);
+``x_post`` messages queued before it existed are moved there.
+
+Delivery is at least once: a handler may run again if a worker dies after
+the side effect but before recording it. Handlers whose side effect is a
+database write (e.g. queueing follow-up messages) call ``complete_current``
+in that write's transaction instead, so the two commit together.
+"""
+
+import random
+from contextvars import ContextVar
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import OutboxMessage
+
+DECISION_NOTIFICATIONS = "decision_notifications"
+X_POST = "x_post"
+
+# The message whose handler is running in this thread (see ``complete_current``).
+_current_message = ContextVar("outbox_message", default=None)
+
+HANDLERS = {
+    DECISION_NOTIFICATIONS: "core.moderation.deliver_decision_notifications",
+    X_POST: "core.services.x_scheduler.deliver_x_post",
+}
+
+
+def _setting(name: str, default):
+    """
+    Return an outbox setting.
+
+    Returns:
+        The configured value or ``default``.
+    """
+    return getattr(settings, name, default)
+
+
+def enqueue(topic: str, payload: dict) -> OutboxMessage:
+    """
+    Queue a side effect; call inside the transaction that causes it.
+
+    Args:
+        topic (str): A key of ``HANDLERS``.
+        payload (dict): JSON-serializable handler arguments.
+
+    Returns:
+        OutboxMessage: The queued row.
+
+    Raises:
+        ValueError: On an unknown topic.
+    """
+    if topic not in HANDLERS:
+        raise ValueError(f"Unknown outbox topic: {topic}")
+    return OutboxMessage.objects.create(topic=topic, payload=payload)
+
+
+def backoff(attempts: int) -> timedelta:
+    """
+    Return the delay before retrying a message that failed ``attempts`` times.
+
+    Exponential in the attempt count, capped at ``OUTBOX_BACKOFF_MAX`` and
+    jittered to between half and all of the delay so failed batches do not
+    retry in lockstep.
+
+    Args:
+        attempts (int): Attempts made so far (>= 1).
+
+    Returns:
+        timedelta: The delay.
+    """
+    base = _setting("OUTBOX_BACKOFF_BASE", 2)
+    delay = min(_setting("OUTBOX_BACKOFF_MAX", 900), base * 2 ** (attempts - 1))
+    return timedelta(seconds=random.uniform(delay / 2, delay))
+
+
+def claim_batch(limit: int) -> list:
+    """
+    Lease up to ``limit`` due messages to the calling worker.
+
+    Args:
+        limit (int): Maximum number of messages.
+
+    Returns:
+        list[OutboxMessage]: Claimed messages, ``attempts`` already counted.
+    """
+    now = timezone.now()
+    leased_until = now + timedelta(seconds=_setting("OUTBOX_LEASE_SECONDS", 300))
+    due = OutboxMessage.objects.filter(status=OutboxMessage.Status.PENDING)
+
+    with transaction.atomic():
+        ids = list(
+            due.filter(available_at__lte=now)
+            .select_for_update(skip_locked=True)
+            .order_by("available_at", "pk")
+            .values_list("pk", flat=True)[:limit]
+        )
+        if not ids:
+            return []
+        # Re-check due-ness in the UPDATE for backends without row locks.
+        due.filter(pk__in=ids, available_at__lte=now).update(
+            attempts=F("attempts") + 1, available_at=leased_until
+        )
+        return list(due.filter(pk__in=ids, available_at=leased_until).order_by("pk"))
+
+
+def _run(message: OutboxMessage):
+    """
+    Run one message's handler.
+
+    Returns:
+        tuple[str, dict | None]: The error description (empty on success) and
+        the handler's statistics.
+    """
+    token = _current_message.set(message)
+    try:
+        stats = import_string(HANDLERS[message.topic])(message.payload)
+    except Exception as exc:  # Any handler failure is retried.
+        return f"{type(exc).__name__}: {exc}", None
+    finally:
+        _current_message.reset(token)
+    return "", stats
+
+
+def complete_current() -> None:
+    """
+    Mark the message being handled DONE from inside its handler.
+
+    Call it in the transaction of the handler's database writes: they then
+    commit together with the DONE status, and a retry after a crash or a
+    lapsed lease finds nothing left to do instead of repeating them.
+
+    Returns:
+        None
+
+    Raises:
+        RuntimeError: Outside a handler, or when this worker's lease on the
+            message has lapsed (the caller's transaction must roll back).
+    """
+    message = _current_message.get()
+    if message is None:
+        raise RuntimeError("No outbox message is being handled.")
+    done = OutboxMessage.objects.filter(
+        pk=message.pk, status=OutboxMessage.Status.PENDING, available_at=message.available_at
+    ).update(status=OutboxMessage.Status.DONE, processed_at=timezone.now(), last_error="")
+    if not done:
+        raise RuntimeError(f"Lease on outbox message {message.pk} lapsed.")
+
+
+def _run_in_thread(message: OutboxMessage):
+    """
+    Run a handler on a pool thread, closing the thread's connections after.
+
+    Returns:
+        tuple[str, dict | None]: See ``_run``.
+    """
+    try:
+        return _run(message)
+    finally:
+        connections.close_all()
+
+
+def _record(message: OutboxMessage, error: str) -> str:
+    """
+    Store the outcome of one attempt.
+
+    Returns:
+        str: The message's new status.
+    """
+    now = timezone.now()
+    rows = OutboxMessage.objects.filter(pk=message.pk)
+    if not error:
+        # Already DONE when the handler called ``complete_current``.
+        rows.exclude(status=OutboxMessage.Status.DONE).update(
+            status=OutboxMessage.Status.DONE, processed_at=now, last_error=""
+        )
+        return OutboxMessage.Status.DONE
+    if message.attempts >= _setting("OUTBOX_MAX_ATTEMPTS", 8):
+        rows.update(status=OutboxMessage.Status.DEAD, processed_at=now, last_error=error)
+        return OutboxMessage.Status.DEAD
+    rows.update(available_at=now + backoff(message.attempts), last_error=error)
+    return OutboxMessage.Status.PENDING
+
+
+def process_batch(limit: int = 50, threads: int = 1, stats: dict | None = None) -> dict:
+    """
+    Claim and deliver one batch of due messages.
+
+    Args:
+        limit (int): Maximum number of messages to claim.
+        threads (int): Handler threads; 1 runs handlers in the calling thread.
+        stats (dict): When given, the statistics returned by the handlers are
+            added into it, key by key.
+
+    Returns:
+        dict: Count of messages per resulting status (``DONE``, ``PENDING``
+        for scheduled retries, ``DEAD``).
+    """
+    messages = claim_batch(limit)
+    if threads > 1 and len(messages) > 1:
+        with ThreadPoolExecutor(max_workers=min(threads, len(messages))) as pool:
+            results = list(pool.map(_run_in_thread, messages))
+    else:
+        results = [_run(message) for message in messages]
+
+    counts = {status: 0 for status in OutboxMessage.Status.values}
+    for message, (error, handler_stats) in zip(messages, results):
+        counts[_record(message, error)] += 1
+        if stats is not None and handler_stats:
+            for key, value in handler_stats.items():
+                stats[key] = stats.get(key, 0) + value
+    return counts
+
+
+def requeue(queryset) -> int:
+    """
+    Put dead-lettered messages back in the queue with a fresh attempt budget.
+
+    Args:
+        queryset (QuerySet[OutboxMessage]): Messages to requeue.
+
+    Returns:
+        int: Number of messages requeued.
+    """
+    return queryset.filter(status=OutboxMessage.Status.DEAD).update(
+        status=OutboxMessage.Status.PENDING,
+        attempts=0,
+        available_at=timezone.now(),
+        processed_at=None,
+    )
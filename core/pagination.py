@@ -0,0 +1,336 @@
+"""
+Pagination classes for the News App REST API.
+
+Feeds are paginated with keyset (cursor) pagination on ``(created_at, id)``:
+each page is fetched with a ``WHERE (created_at, id) < (...)`` range instead of
+an OFFSET, so page cost stays flat however deep a client scrolls and rows that
+are approved while a client pages cannot shift items between pages.
+"""
+
+import base64
+import binascii
+from datetime import datetime
+
+from django.conf import settings
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+FORWARD = "n"
+BACKWARD = "p"
+
+
+def encode_cursor(direction: str, created_at: datetime, pk: int) -> str:
+    """
+    Encode a keyset position as an opaque URL-safe token.
+
+    Args:
+        direction (str): ``FORWARD`` (older items) or ``BACKWARD`` (newer items).
+        created_at (datetime): ``created_at`` of the boundary row.
+        pk (int): Primary key of the boundary row.
+
+    Returns:
+        str: The encoded cursor.
+    """
+    raw = f"{direction}|{created_at.isoformat()}|{pk}"
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(token: str):
+    """
+    Decode a cursor produced by ``encode_cursor``.
+
+    Args:
+        token (str): The opaque cursor from the query string.
+
+    Returns:
+        tuple[str, datetime, int]: Direction, created_at and primary key.
+
+    Raises:
+        ValueError: If the token is malformed.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(token.encode("ascii")).decode("utf-8")
+        direction, created_at, pk = raw.split("|")
+        if direction not in (FORWARD, BACKWARD):
+            raise ValueError(direction)
+        return direction, datetime.fromisoformat(created_at), int(pk)
+    except (binascii.Error, UnicodeError, ValueError) as exc:
+        raise ValueError("Invalid cursor") from exc
+
+
+def older_than(created_at: datetime, pk: int, fields=("created_at", "pk")) -> Q:
+    """
+    Build the keyset predicate ``(created_at, id) < (created_at, pk)``.
+
+    Args:
+        created_at (datetime): Boundary timestamp.
+        pk (int): Boundary primary key.
+        fields (tuple[str, str]): Names of the timestamp and id keyset columns.
+
+    Returns:
+        Q: Filter selecting rows after the position in newest-first order.
+    """
+    time_field, id_field = fields
+    return Q(**{f"{time_field}__lt": created_at}) | Q(
+        **{time_field: created_at, f"{id_field}__lt": pk}
+    )
+
+
+def newer_than(created_at: datetime, pk: int, fields=("created_at", "pk")) -> Q:
+    """
+    Build the keyset predicate ``(created_at, id) > (created_at, pk)``.
+
+    Args:
+        created_at (datetime): Boundary timestamp.
+        pk (int): Boundary primary key.
+        fields (tuple[str, str]): Names of the timestamp and id keyset columns.
+
+    Returns:
+        Q: Filter selecting rows before the position in newest-first order.
+    """
+    time_field, id_field = fields
+    return Q(**{f"{time_field}__gt": created_at}) | Q(
+        **{time_field: created_at, f"{id_field}__gt": pk}
+    )
+
+
+def keyset_fields_for(view):
+    """
+    Return the keyset columns a view pages on.
+
+    Views may set ``keyset_fields`` to page on denormalized columns (e.g. the
+    reader timeline's copy of ``created_at``) so the range predicate and the
+    ORDER BY hit the same index. The named attributes must be readable on the
+    returned rows.
+
+    Args:
+        view: The calling view, or None.
+
+    Returns:
+        tuple[str, str]: Timestamp and id field names.
+    """
+    return getattr(view, "keyset_fields", None) or ("created_at", "pk")
+
+
+def _query_params(request):
+    """
+    Return the query parameters of a DRF or plain Django request.
+
+    Returns:
+        QueryDict: The query string parameters.
+    """
+    return getattr(request, "query_params", request.GET)
+
+
+class KeysetPagination(BasePagination):
+    """
+    Newest-first keyset pagination over ``(created_at, id)``.
+
+    Query parameters:
+        - cursor: opaque token taken from a previous ``next``/``previous`` link
+        - page_size: optional page size, capped at ``max_page_size``
+
+    Response body: ``{"next": url|null, "previous": url|null, "results": [...]}``
+
+    The keyset columns default to ``("created_at", "pk")``; see
+    ``keyset_fields_for``.
+    """
+
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+    max_page_size = 100
+
+    def get_page_size(self, request) -> int:
+        """
+        Return the requested page size, bounded by ``max_page_size``.
+
+        Args:
+            request: The incoming request.
+
+        Returns:
+            int: Number of items per page.
+        """
+        default = settings.REST_FRAMEWORK.get("PAGE_SIZE") or 20
+        try:
+            size = int(_query_params(request).get(self.page_size_query_param, default))
+        except (TypeError, ValueError):
+            size = default
+        return max(1, min(size, self.max_page_size))
+
+    def _page_query(self, queryset, request, view):
+        """
+        Apply the request cursor and return the query for one page.
+
+        Args:
+            queryset: An Article queryset (any existing ordering is replaced).
+            request: The incoming request.
+            view: The calling view.
+
+        Returns:
+            tuple: The ordered query (including the look-ahead row), the
+            direction, and the cursor token.
+
+        Raises:
+            NotFound: If the cursor is malformed.
+        """
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.keyset_fields = keyset_fields_for(view)
+        time_field, id_field = self.keyset_fields
+
+        token = _query_params(request).get(self.cursor_query_param)
+        direction = FORWARD
+        if token:
+            try:
+                direction, created_at, pk = decode_cursor(token)
+            except ValueError:
+                raise NotFound("Invalid cursor.")
+            if direction == FORWARD:
+                queryset = queryset.filter(older_than(created_at, pk, self.keyset_fields))
+            else:
+                queryset = queryset.filter(newer_than(created_at, pk, self.keyset_fields))
+
+        if direction == FORWARD:
+            queryset = queryset.order_by(f"-{time_field}", f"-{id_field}")
+        else:
+            queryset = queryset.order_by(time_field, id_field)
+        return queryset, direction, token
+
+    def _set_page(self, rows, direction: str, token):
+        """
+        Trim the look-ahead row and record which links exist.
+
+        Args:
+            rows (list): Up to ``page_size + 1`` rows in query order.
+            direction (str): ``FORWARD`` or ``BACKWARD``.
+            token: The request cursor, if any.
+
+        Returns:
+            list: The items on the requested page, newest first.
+        """
+        has_more = len(rows) > self.page_size
+        if direction == FORWARD:
+            self.page = rows[: self.page_size]
+            self.has_next = has_more
+            self.has_previous = bool(token)
+        else:
+            self.page = list(reversed(rows[: self.page_size]))
+            self.has_next = True
+            self.has_previous = has_more
+        return self.page
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """
+        Return one page of ``queryset`` positioned by the request cursor.
+
+        Args:
+            queryset: An Article queryset (any existing ordering is replaced).
+            request: The incoming DRF request.
+            view: The calling view.
+
+        Returns:
+            list: The items on the requested page, newest first.
+
+        Raises:
+            NotFound: If the cursor is malformed.
+        """
+        queryset, direction, token = self._page_query(queryset, request, view)
+        rows = list(queryset[: self.page_size + 1])
+        return self._set_page(rows, direction, token)
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """
+        Async version of ``paginate_queryset`` using the async ORM.
+
+        Accepts a plain Django ``HttpRequest`` as well as a DRF request, and
+        a ``MergedFeed`` as well as a queryset.
+
+        Returns:
+            list: The items on the requested page, newest first.
+
+        Raises:
+            NotFound: If the cursor is malformed.
+        """
+        queryset, direction, token = self._page_query(queryset, request, view)
+        limit = self.page_size + 1
+        if hasattr(queryset, "afetch"):
+            rows = await queryset.afetch(limit)
+        else:
+            rows = [row async for row in queryset[:limit]]
+        return self._set_page(rows, direction, token)
+
+    def _link(self, direction: str, row):
+        """
+        Build an absolute URL for the page on one side of ``row``.
+
+        Returns:
+            str: The link URL.
+        """
+        url = self.request.build_absolute_uri()
+        time_field, id_field = self.keyset_fields
+        token = encode_cursor(direction, getattr(row, time_field), getattr(row, id_field))
+        return replace_query_param(url, self.cursor_query_param, token)
+
+    def get_next_link(self):
+        """
+        Return the URL of the next (older) page, if any.
+
+        Returns:
+            str | None: The link URL.
+        """
+        if not self.has_next or not self.page:
+            return None
+        return self._link(FORWARD, self.page[-1])
+
+    def get_previous_link(self):
+        """
+        Return the URL of the previous (newer) page, if any.
+
+        Returns:
+            str | None: The link URL.
+        """
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(
+                self.request.build_absolute_uri(), self.cursor_query_param
+            )
+        return self._link(BACKWARD, self.page[0])
+
+    def get_paginated_response(self, data):
+        """
+        Wrap serialized page data with next/previous links.
+
+        Args:
+            data: Serialized page items.
+
+        Returns:
+            Response: The paginated response.
+        """
+        return Response(
+            {
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+
+    def get_paginated_response_schema(self, schema):
+        """
+        Describe the paginated response envelope for schema generation.
+
+        Returns:
+            dict: OpenAPI schema for the envelope.
+        """
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
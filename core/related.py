@@ -0,0 +1,368 @@
+"""
+Precomputed "related articles" for the article detail page.
+
+``update_related_articles`` (``manage.py build_related_articles``) stores,
+for every APPROVED article, its ``RELATED_ARTICLES_COUNT`` most similar
+approved articles as ``RelatedArticle`` rows, so the detail page reads one
+short indexed list instead of comparing anything at render time:
+
+- Articles are TF-IDF vectors in a SciPy CSR matrix: log term frequency
+  (title words counted ``SEARCH_TITLE_WEIGHT`` times, as in search), smoothed
+  idf, unit length. Terms found in a single article are dropped since they
+  cannot make two articles similar.
+- Cosine similarities are sparse matrix products over blocks of rows (at
+  most ``BLOCK_CELLS`` dense cells per block); each block's top N comes from
+  one ``numpy.argpartition``. Pairs below ``RELATED_ARTICLES_MIN_SCORE`` are
+  not linked.
+- The vocabulary, idf and matrix are saved to ``RELATED_ARTICLES_MODEL``, and
+  later runs are incremental: newly approved articles are vectorized with the
+  saved vocabulary and idf and compared with the corpus in one product. Only
+  their own lists, the lists they now rank in and the lists that linked to a
+  retracted article are recomputed.
+
+Incremental runs keep the vocabulary and idf of the last full run, and the
+lists that linked to a deleted article stay one entry short; run with
+``--full`` periodically (e.g. nightly) and after changing these settings.
+NumPy and SciPy are only needed by this job, not by the web processes.
+"""
+
+import math
+import os
+from collections import Counter
+
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+from scipy import sparse
+
+from .detail_cache import invalidate_article_page
+from .mailer import chunked
+from .models import Article, RelatedArticle
+from .search import tokenize
+
+BLOCK_CELLS = 1 << 24
+
+
+def term_counts(article) -> Counter:
+    """
+    Count an article's terms; title terms count ``SEARCH_TITLE_WEIGHT`` times.
+
+    Args:
+        article (Article): The article (``title`` and ``body`` loaded).
+
+    Returns:
+        Counter: Occurrences by term.
+    """
+    counts = Counter(tokenize(article.body))
+    title_weight = getattr(settings, "SEARCH_TITLE_WEIGHT", 3)
+    for term in tokenize(article.title):
+        counts[term] += title_weight
+    return counts
+
+
+def _approved_articles(pks=None):
+    """
+    Return APPROVED articles with their text, in pk order.
+
+    Returns:
+        Iterator[Article]: The articles.
+    """
+    articles = Article.objects.filter(status=Article.Status.APPROVED)
+    if pks is not None:
+        articles = articles.filter(pk__in=pks)
+    return articles.only("pk", "title", "body").order_by("pk").iterator(chunk_size=2000)
+
+
+class RelatedModel:
+    """
+    TF-IDF vectors of the approved articles.
+
+    Attributes:
+        pks (numpy.ndarray): Article pk of each matrix row.
+        matrix (scipy.sparse.csr_matrix): Unit-length TF-IDF rows (float32).
+        vocabulary (dict[str, int]): Column of each term.
+        idf (numpy.ndarray): Inverse document frequency of each column.
+    """
+
+    def __init__(self, pks, matrix, vocabulary: dict, idf):
+        self.pks = pks
+        self.matrix = matrix
+        self.vocabulary = vocabulary
+        self.idf = idf
+
+    @classmethod
+    def fit(cls, articles) -> "RelatedModel":
+        """
+        Build the vocabulary, idf and matrix from a corpus.
+
+        Args:
+            articles: Iterable of articles (``title`` and ``body`` loaded).
+
+        Returns:
+            RelatedModel: The model.
+        """
+        pks, rows, df = [], [], Counter()
+        for article in articles:
+            counts = term_counts(article)
+            pks.append(article.pk)
+            rows.append(counts)
+            df.update(counts.keys())
+        terms = sorted(term for term, count in df.items() if count > 1)
+        frequencies = np.array([df[term] for term in terms], dtype=np.float64)
+        idf = np.log((1 + len(rows)) / (1 + frequencies)) + 1
+        model = cls(
+            np.array(pks, dtype=np.int64),
+            None,
+            {term: column for column, term in enumerate(terms)},
+            idf.astype(np.float32),
+        )
+        model.matrix = model.vectorize(rows)
+        return model
+
+    def vectorize(self, rows):
+        """
+        Turn term counts into unit-length TF-IDF rows over the model's vocabulary.
+
+        Args:
+            rows (list[Counter]): Term counts per article.
+
+        Returns:
+            scipy.sparse.csr_matrix: One row per article (zero for no known terms).
+        """
+        indptr, indices, data = [0], [], []
+        for counts in rows:
+            for term, count in counts.items():
+                column = self.vocabulary.get(term)
+                if column is not None:
+                    indices.append(column)
+                    data.append(1 + math.log(count))
+            indptr.append(len(indices))
+        matrix = sparse.csr_matrix(
+            (
+                np.array(data, dtype=np.float32),
+                np.array(indices, dtype=np.int32),
+                np.array(indptr, dtype=np.int64),
+            ),
+            shape=(len(rows), len(self.vocabulary)),
+        )
+        matrix = matrix.multiply(self.idf[np.newaxis, :]).tocsr()
+        norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+        norms[norms == 0] = 1
+        return sparse.diags(1 / norms).astype(np.float32) @ matrix
+
+    def append(self, pks, matrix) -> None:
+        """
+        Add rows for new articles.
+
+        Returns:
+            None
+        """
+        self.pks = np.concatenate([self.pks, np.asarray(pks, dtype=np.int64)])
+        self.matrix = sparse.vstack([self.matrix, matrix], format="csr")
+
+    def drop(self, pks) -> None:
+        """
+        Remove the rows of the given articles.
+
+        Returns:
+            None
+        """
+        keep = ~np.isin(self.pks, np.fromiter(pks, dtype=np.int64))
+        self.pks = self.pks[keep]
+        self.matrix = self.matrix[keep]
+
+    def rows(self, pks):
+        """
+        Return the matrix rows of the given articles.
+
+        Args:
+            pks: Article pks in the model.
+
+        Returns:
+            tuple[numpy.ndarray, scipy.sparse.csr_matrix]: The pks (in matrix
+            order) and their rows.
+        """
+        mask = np.isin(self.pks, np.fromiter(pks, dtype=np.int64))
+        return self.pks[mask], self.matrix[mask]
+
+    def neighbors(self, row_pks, rows, count: int, min_score: float) -> dict:
+        """
+        Find each row's most similar model articles.
+
+        Args:
+            row_pks (numpy.ndarray): Article pk of each row (excluded from its
+                own list).
+            rows (scipy.sparse.csr_matrix): Unit-length TF-IDF rows.
+            count (int): List length.
+            min_score (float): Smallest cosine similarity to link.
+
+        Returns:
+            dict[int, list[tuple[int, float]]]: ``(pk, score)`` pairs per
+            row pk, most similar first.
+        """
+        corpus = self.matrix.T.tocsr()
+        columns = len(self.pks)
+        result = {}
+        if not columns or not count:
+            return {int(pk): [] for pk in row_pks}
+        position = {pk: column for column, pk in enumerate(self.pks.tolist())}
+        k = min(count, columns)
+        block = max(1, BLOCK_CELLS // columns)
+        for start in range(0, len(row_pks), block):
+            block_pks = row_pks[start : start + block].tolist()
+            scores = (rows[start : start + block] @ corpus).toarray()
+            for i, pk in enumerate(block_pks):
+                if pk in position:
+                    scores[i, position[pk]] = 0
+            if k < columns:
+                top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+            else:
+                top = np.tile(np.arange(columns), (len(block_pks), 1))
+            top_scores = np.take_along_axis(scores, top, axis=1)
+            order = np.argsort(-top_scores, axis=1, kind="stable")
+            top = np.take_along_axis(top, order, axis=1)
+            top_scores = np.take_along_axis(top_scores, order, axis=1)
+            for i, pk in enumerate(block_pks):
+                result[pk] = [
+                    (int(self.pks[column]), float(score))
+                    for column, score in zip(top[i], top_scores[i])
+                    if score >= min_score
+                ]
+        return result
+
+    def save(self, path: str) -> None:
+        """
+        Write the model to ``path`` (atomically replaced).
+
+        Returns:
+            None
+        """
+        temporary = f"{path}.tmp"
+        with open(temporary, "wb") as handle:
+            np.savez(
+                handle,
+                pks=self.pks,
+                data=self.matrix.data,
+                indices=self.matrix.indices,
+                indptr=self.matrix.indptr,
+                shape=np.array(self.matrix.shape),
+                idf=self.idf,
+                terms=np.array(list(self.vocabulary), dtype=str),
+            )
+        os.replace(temporary, path)
+
+    @classmethod
+    def load(cls, path: str) -> "RelatedModel":
+        """
+        Read a model written by ``save``.
+
+        Returns:
+            RelatedModel: The model.
+        """
+        with np.load(path) as saved:
+            matrix = sparse.csr_matrix(
+                (saved["data"], saved["indices"], saved["indptr"]), shape=tuple(saved["shape"])
+            )
+            terms = saved["terms"].tolist()
+            return cls(
+                saved["pks"],
+                matrix,
+                {term: column for column, term in enumerate(terms)},
+                saved["idf"],
+            )
+
+
+def _store(lists: dict, stale=None) -> None:
+    """
+    Replace the related-article lists of ``stale`` articles (all when None)
+    with ``lists``.
+
+    Returns:
+        None
+    """
+    with transaction.atomic():
+        if stale is None:
+            RelatedArticle.objects.all().delete()
+        else:
+            for batch in chunked(stale, 1000):
+                RelatedArticle.objects.filter(article_id__in=batch).delete()
+        RelatedArticle.objects.bulk_create(
+            (
+                RelatedArticle(article_id=pk, related_id=related, rank=rank, score=score)
+                for pk, neighbors in lists.items()
+                for rank, (related, score) in enumerate(neighbors)
+            ),
+            batch_size=1000,
+        )
+
+
+def update_related_articles(*, full: bool = False) -> dict:
+    """
+    Bring the stored related-article lists up to date.
+
+    Incremental unless ``full`` or no saved model exists (see the module
+    docstring); the detail pages of changed lists are invalidated.
+
+    Args:
+        full (bool): Rebuild the vocabulary, idf and every list.
+
+    Returns:
+        dict: ``articles`` in the model, ``added`` and ``removed`` articles
+        and ``updated`` lists.
+    """
+    count = getattr(settings, "RELATED_ARTICLES_COUNT", 5)
+    min_score = getattr(settings, "RELATED_ARTICLES_MIN_SCORE", 0.05)
+    path = getattr(settings, "RELATED_ARTICLES_MODEL", "")
+
+    if full or not path or not os.path.exists(path):
+        model = RelatedModel.fit(_approved_articles())
+        added, removed = model.pks.tolist(), set()
+        affected, stale = set(added), None
+    else:
+        model = RelatedModel.load(path)
+        approved = set(
+            Article.objects.filter(status=Article.Status.APPROVED).values_list("pk", flat=True)
+        )
+        known = set(model.pks.tolist())
+        removed = known - approved
+        model.drop(removed)
+        affected = set(
+            RelatedArticle.objects.filter(related_id__in=removed).values_list(
+                "article_id", flat=True
+            )
+        ) - removed
+
+        new_articles = list(_approved_articles(approved - known))
+        added = [article.pk for article in new_articles]
+        if added:
+            new_rows = model.vectorize([term_counts(article) for article in new_articles])
+            if len(model.pks):
+                # Existing lists a new article now ranks in: it beats the
+                # list's last entry, or the list still has room.
+                best = np.asarray((new_rows @ model.matrix.T).max(axis=0).todense()).ravel()
+                floor = np.full(len(model.pks), min_score)
+                position = {pk: column for column, pk in enumerate(model.pks.tolist())}
+                full_lists = RelatedArticle.objects.filter(rank=count - 1).values_list(
+                    "article_id", "score"
+                )
+                for pk, score in full_lists.iterator(chunk_size=5000):
+                    if pk in position:
+                        floor[position[pk]] = np.nextafter(score, np.inf)
+                affected.update(model.pks[best >= floor].tolist())
+            model.append(added, new_rows)
+            affected.update(added)
+        stale = affected | removed
+
+    row_pks, rows = model.rows(affected)
+    lists = model.neighbors(row_pks, rows, count, min_score)
+    _store(lists, stale)
+    if path:
+        model.save(path)
+    for batch in chunked(sorted(affected), 1000):
+        invalidate_article_page(*batch)
+    return {
+        "articles": len(model.pks),
+        "added": len(added),
+        "removed": len(removed),
+        "updated": len(lists),
+    }
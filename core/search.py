@@ -0,0 +1,381 @@
+"""
+Full-text article search.
+
+Readers search APPROVED articles through ``/api/articles/search/``; editors
+search every article from the admin. Both go through the configured backend
+(``get_search_backend``) instead of ``LIKE '%term%'`` scans of the body:
+
+- ``DatabaseSearchBackend`` keeps an inverted index in the ``SearchTerm``
+  table (one row per term and article, indexed by term) on every database.
+  Queries read only the postings of their terms and rank articles by the sum
+  of ``weight * idf`` over the matched terms (TF-IDF with log term frequency,
+  length normalization and a boost for title words).
+- ``FullTextSearchBackend`` uses a MySQL FULLTEXT index on title and body
+  (``MATCH ... AGAINST`` in natural language mode), which InnoDB maintains
+  itself.
+- ``core.search_engine.BM25SearchBackend`` ranks with BM25 from an inverted
+  index held in each worker process and loaded from an mmap snapshot.
+
+``SEARCH_BACKEND`` selects a backend by dotted path; by default MySQL uses
+FULLTEXT and other databases the ``SearchTerm`` table. The index is updated
+incrementally by the receivers in ``core.signals``: an article is re-indexed
+when its title or body is saved, and approvals and retractions (single or
+bulk) flip its postings in or out of reader results. ``manage.py
+rebuild_search_index`` re-indexes everything (after bulk imports or a
+tokenizer change).
+"""
+
+import math
+import re
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Case, Count, F, FloatField, Sum, Value, When
+from django.db.models.expressions import RawSQL
+from django.utils.module_loading import import_string
+
+from .feed_cache import get_feed_cache
+from .mailer import chunked
+from .models import Article, SearchTerm
+
+TOKEN_RE = re.compile(r"\w+")
+MAX_TERM_LENGTH = 40
+MAX_QUERY_TERMS = 10
+
+STOP_WORDS = frozenset(
+    """
+    a an and are as at be but by for from has have he her his i in is it its
+    of on or our she that the their them they this to was we were will with
+    you your
+    """.split()
+)
+
+
+def tokenize(text: str) -> list:
+    """
+    Split text into normalized search terms.
+
+    Lowercases, splits on non-word characters and drops stop words, single
+    characters and overlong tokens.
+
+    Args:
+        text (str): Any text.
+
+    Returns:
+        list[str]: Terms in order of occurrence (with repeats).
+    """
+    return [
+        token
+        for token in TOKEN_RE.findall(text.lower())
+        if 1 < len(token) <= MAX_TERM_LENGTH and token not in STOP_WORDS
+    ]
+
+
+def query_terms(query: str) -> list:
+    """
+    Return the distinct terms of a search query, capped at ``MAX_QUERY_TERMS``.
+
+    Returns:
+        list[str]: Terms in query order.
+    """
+    return list(dict.fromkeys(tokenize(query)))[:MAX_QUERY_TERMS]
+
+
+def term_weights(article) -> dict:
+    """
+    Compute the index weight of each term of an article.
+
+    Term frequency is log-scaled (``1 + ln tf``), title occurrences count
+    ``SEARCH_TITLE_WEIGHT`` times, and the vector is normalized to unit
+    length so long bodies do not outrank focused ones.
+
+    Args:
+        article (Article): The article (``title`` and ``body`` loaded).
+
+    Returns:
+        dict[str, float]: Weight by term.
+    """
+    counts = {}
+    title_weight = getattr(settings, "SEARCH_TITLE_WEIGHT", 3)
+    for term in tokenize(article.title):
+        counts[term] = counts.get(term, 0) + title_weight
+    for term in tokenize(article.body):
+        counts[term] = counts.get(term, 0) + 1
+    weights = {term: 1 + math.log(count) for term, count in counts.items()}
+    norm = math.sqrt(sum(w * w for w in weights.values())) or 1.0
+    return {term: w / norm for term, w in weights.items()}
+
+
+class SearchBackend:
+    """
+    Interface of the article search backends.
+
+    ``search`` ranks and pages; ``filter_queryset`` narrows an existing
+    queryset (used by the admin). The ``index``/``set_approved``/``remove``
+    hooks are called by ``core.signals`` as articles change.
+    """
+
+    def search(self, query: str, *, approved_only: bool = True, limit: int = 20, offset: int = 0):
+        """
+        Rank the articles matching ``query``.
+
+        Args:
+            query (str): Free-text query.
+            approved_only (bool): Restrict to APPROVED articles.
+            limit (int): Page size.
+            offset (int): Results to skip.
+
+        Returns:
+            tuple[list[tuple[int, float]], int]: ``(pk, score)`` pairs, best
+            first, and the total number of matches.
+        """
+        raise NotImplementedError
+
+    def filter_queryset(self, queryset, query: str):
+        """
+        Restrict an Article queryset to the articles matching ``query``.
+
+        Returns:
+            QuerySet[Article]: The filtered queryset.
+        """
+        raise NotImplementedError
+
+    def index(self, articles) -> None:
+        """
+        (Re-)index articles after their text or status changed.
+
+        Returns:
+            None
+        """
+
+    def set_approved(self, article_ids, approved: bool) -> None:
+        """
+        Record that articles entered or left APPROVED.
+
+        Returns:
+            None
+        """
+
+    def remove(self, article_ids) -> None:
+        """
+        Drop deleted articles from the index.
+
+        Returns:
+            None
+        """
+
+    def rebuild(self) -> int:
+        """
+        Re-index every article.
+
+        Returns:
+            int: Number of articles indexed.
+        """
+        return 0
+
+
+class DatabaseSearchBackend(SearchBackend):
+    """
+    Inverted index in the ``SearchTerm`` table; works on every database.
+    """
+
+    def index(self, articles) -> None:
+        articles = list(articles)
+        rows = [
+            SearchTerm(
+                term=term,
+                article_id=article.pk,
+                weight=weight,
+                approved=article.status == Article.Status.APPROVED,
+            )
+            for article in articles
+            for term, weight in term_weights(article).items()
+        ]
+        with transaction.atomic():
+            SearchTerm.objects.filter(article_id__in=[a.pk for a in articles]).delete()
+            SearchTerm.objects.bulk_create(rows, batch_size=1000)
+
+    def set_approved(self, article_ids, approved: bool) -> None:
+        SearchTerm.objects.filter(article_id__in=list(article_ids)).update(approved=approved)
+
+    def remove(self, article_ids) -> None:
+        SearchTerm.objects.filter(article_id__in=list(article_ids)).delete()
+
+    def rebuild(self) -> int:
+        count = 0
+        articles = Article.objects.only("pk", "title", "body", "status").order_by("pk")
+        for batch in chunked(articles.iterator(chunk_size=500), 500):
+            self.index(batch)
+            count += len(batch)
+        return count
+
+    def _postings(self, terms, approved_only: bool):
+        """
+        Return the postings of ``terms``.
+
+        Returns:
+            QuerySet[SearchTerm]: Matching rows.
+        """
+        postings = SearchTerm.objects.filter(term__in=terms)
+        if approved_only:
+            postings = postings.filter(approved=True)
+        return postings
+
+    def _document_count(self, approved_only: bool) -> int:
+        """
+        Return the number of searchable articles, for idf.
+
+        Cached in the feed cache for ``SEARCH_DOCUMENT_COUNT_TIMEOUT`` seconds:
+        idf barely moves with a few approvals, and counting every article per
+        query is a full index scan.
+
+        Returns:
+            int: Article count.
+        """
+        key = f"search-documents:{'approved' if approved_only else 'all'}"
+        cache = get_feed_cache()
+        count = cache.get(key)
+        if count is None:
+            documents = Article.objects.all()
+            if approved_only:
+                documents = documents.filter(status=Article.Status.APPROVED)
+            count = documents.count()
+            cache.set(key, count, getattr(settings, "SEARCH_DOCUMENT_COUNT_TIMEOUT", 60))
+        return count
+
+    def search(self, query: str, *, approved_only: bool = True, limit: int = 20, offset: int = 0):
+        terms = query_terms(query)
+        if not terms:
+            return [], 0
+        postings = self._postings(terms, approved_only)
+
+        document_frequency = dict(
+            postings.order_by().values("term").annotate(df=Count("article_id")).values_list(
+                "term", "df"
+            )
+        )
+        if not document_frequency:
+            return [], 0
+        total_documents = self._document_count(approved_only)
+
+        score = Sum(
+            Case(
+                *(
+                    When(term=term, then=F("weight") * Value(math.log(1 + total_documents / df)))
+                    for term, df in document_frequency.items()
+                ),
+                output_field=FloatField(),
+            )
+        )
+        ranked = postings.order_by().values("article_id").annotate(score=score)
+        total = ranked.count()
+        page = ranked.order_by("-score", "-article_id")[offset : offset + limit]
+        return [(row["article_id"], row["score"]) for row in page], total
+
+    def filter_queryset(self, queryset, query: str):
+        terms = query_terms(query)
+        if not terms:
+            return queryset.none()
+        # Every query term must occur, as with the admin's default search.
+        matching = (
+            self._postings(terms, approved_only=False)
+            .order_by()
+            .values("article_id")
+            .annotate(matched=Count("term"))
+            .filter(matched=len(terms))
+            .values("article_id")
+        )
+        return queryset.filter(pk__in=matching)
+
+
+class FullTextSearchBackend(SearchBackend):
+    """
+    MySQL FULLTEXT index on ``title`` and ``body`` (see migration 0012).
+    """
+
+    def _match(self, query: str, mode: str = "NATURAL LANGUAGE"):
+        """
+        Build the ``MATCH ... AGAINST`` relevance expression.
+
+        Returns:
+            RawSQL: Relevance of each row (0 when it does not match).
+        """
+        table = Article._meta.db_table
+        return RawSQL(
+            f"MATCH ({table}.title, {table}.body) AGAINST (%s IN {mode} MODE)",
+            (query,),
+            output_field=FloatField(),
+        )
+
+    def search(self, query: str, *, approved_only: bool = True, limit: int = 20, offset: int = 0):
+        if not query_terms(query):
+            return [], 0
+        matches = Article.objects.all()
+        if approved_only:
+            matches = matches.filter(status=Article.Status.APPROVED)
+        matches = matches.alias(score=self._match(query)).filter(score__gt=0)
+        total = matches.count()
+        page = matches.annotate(rank=F("score")).order_by("-rank", "-pk").values_list(
+            "pk", "rank"
+        )[offset : offset + limit]
+        return list(page), total
+
+    def filter_queryset(self, queryset, query: str):
+        terms = query_terms(query)
+        if not terms:
+            return queryset.none()
+        boolean_query = " ".join(f"+{term}" for term in terms)
+        return queryset.alias(score=self._match(boolean_query, "BOOLEAN")).filter(score__gt=0)
+
+
+_backend = None
+_backend_path = None
+
+
+def get_search_backend() -> SearchBackend:
+    """
+    Return the configured search backend instance.
+
+    ``SEARCH_BACKEND`` is a dotted path; when unset, MySQL uses
+    ``FullTextSearchBackend`` and other databases ``DatabaseSearchBackend``.
+
+    Returns:
+        SearchBackend: The shared backend.
+    """
+    global _backend, _backend_path
+    path = getattr(settings, "SEARCH_BACKEND", None) or (
+        "core.search.FullTextSearchBackend"
+        if connection.vendor == "mysql"
+        else "core.search.DatabaseSearchBackend"
+    )
+    if path != _backend_path:
+        _backend = import_string(path)()
+        _backend_path = path
+    return _backend
+
+
+def reset_search_backend() -> None:
+    """
+    Drop the shared backend instance (and any in-process index it holds).
+
+    Returns:
+        None
+    """
+    global _backend, _backend_path
+    _backend = _backend_path = None
+
+
+def search_articles(query: str, *, limit: int = 20, offset: int = 0):
+    """
+    Rank the APPROVED articles matching ``query``.
+
+    Args:
+        query (str): Free-text query.
+        limit (int): Page size.
+        offset (int): Results to skip.
+
+    Returns:
+        tuple[list[tuple[int, float]], int]: ``(pk, score)`` pairs, best
+        first, and the total number of matches.
+    """
+    return get_search_backend().search(query, limit=limit, offset=offset)
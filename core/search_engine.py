@@ -0,0 +1,700 @@
+"""
+In-process BM25 search engine for deployments without MySQL FULLTEXT.
+
+Select it with ``SEARCH_BACKEND = "core.search_engine.BM25SearchBackend"``;
+it then answers the article search API, the admin search and related-article
+lookups from an inverted index held in each worker process:
+
+- ``BM25Index`` keeps, per segment, the postings of each term (document
+  numbers and term frequencies) and the per-document columns (article pk,
+  length, flags) in compact ``array`` columns, ranks with Okapi BM25
+  (``SEARCH_BM25_K1``, ``SEARCH_BM25_B``) and keeps the top k with a heap.
+- Every article is indexed with an "approved" flag: reader searches skip the
+  others and the admin can search all of them. New and re-indexed documents
+  go to an in-memory segment; removals are tombstones.
+- ``BM25Index.write_snapshot`` writes the live documents to one file
+  (compacting away tombstones); ``BM25Index.load_snapshot`` maps it with
+  ``mmap`` and reads postings straight from the mapping, so a worker starts
+  in about the time it takes to read the term list.
+- Workers follow the status event log (``ArticleStatusEvent``): before a
+  search, the settled events (``core.changes.settled_event_id``) since the
+  last sync (at most every ``SEARCH_ENGINE_SYNC_SECONDS``) index new articles,
+  re-read the text of articles that became APPROVED and clear the approved
+  flag on retractions; edits of approved articles are logged as events too.
+  Saves and deletes made in the worker's own process are applied at once
+  through the search hooks. Deletes cascade to the event log, so those made
+  in other processes are found when they surface in results: each search
+  checks its result pks against the database and tombstones missing ones.
+
+``manage.py benchmark_search_engine`` measures indexing, queries, snapshots
+and incremental updates on a synthetic corpus (1M documents by default).
+"""
+
+import heapq
+import math
+import mmap
+import os
+import struct
+import threading
+import time
+from array import array
+from bisect import bisect_left
+from collections import Counter
+
+from django.conf import settings
+
+from .changes import settled_event_id
+from .models import Article, ArticleStatusEvent
+from .search import SearchBackend, query_terms, tokenize
+
+MAGIC = b"NEWSBM25"
+VERSION = 1
+# magic, version, reserved, documents, terms, postings, event cursor
+HEADER = struct.Struct("<8sIIQQQQ")
+LIVE = 1
+APPROVED = 2
+MAX_TF = 0xFFFF
+MAX_RELATED_TERMS = 12
+
+for _code, _size in (("q", 8), ("Q", 8), ("I", 4), ("H", 2)):
+    if array(_code).itemsize != _size:
+        raise ImportError(f"array type {_code!r} is not {_size} bytes on this platform")
+
+
+def _padding(offset: int) -> int:
+    """
+    Return the bytes needed to align ``offset`` to 8.
+
+    Returns:
+        int: 0 to 7.
+    """
+    return -offset % 8
+
+
+class _MemorySegment:
+    """
+    Appendable segment: postings per term in growable arrays.
+    """
+
+    def __init__(self):
+        self.doc_ids = array("q")
+        self.doc_lengths = array("I")
+        self.flags = bytearray()
+        self.postings_by_term = {}
+        self._docs = {}
+
+    def add(self, pk: int, counts: dict, length: int, flags: int) -> None:
+        """
+        Append one document.
+
+        Returns:
+            None
+        """
+        doc = len(self.doc_ids)
+        self.doc_ids.append(pk)
+        self.doc_lengths.append(length)
+        self.flags.append(flags)
+        self._docs[pk] = doc
+        for term, tf in counts.items():
+            postings = self.postings_by_term.get(term)
+            if postings is None:
+                postings = self.postings_by_term[term] = (array("I"), array("H"))
+            postings[0].append(doc)
+            postings[1].append(min(tf, MAX_TF))
+
+    def postings(self, term: str):
+        """
+        Return ``(documents, term frequencies)`` for a term, or None.
+        """
+        return self.postings_by_term.get(term)
+
+    def terms(self):
+        """
+        Return the segment's terms.
+        """
+        return self.postings_by_term.keys()
+
+    def locate(self, pk: int):
+        """
+        Return the document number of an article pk, or None.
+        """
+        return self._docs.get(pk)
+
+
+class _MappedSegment:
+    """
+    Read-only segment backed by a memory-mapped snapshot file.
+
+    Only the flags are copied (so documents can still be tombstoned or have
+    their approval flipped); postings and document columns are views into
+    the mapping.
+    """
+
+    def __init__(self, path: str):
+        with open(path, "rb") as handle:
+            self._mmap = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self._mmap)
+        magic, version, _, documents, terms, postings, cursor = HEADER.unpack_from(view)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} search snapshot")
+
+        offset = HEADER.size
+
+        def section(code: str, count: int):
+            nonlocal offset
+            size = count * array(code).itemsize
+            column = view[offset : offset + size].cast(code)
+            offset += size + _padding(size)
+            return column
+
+        self.doc_ids = section("q", documents)
+        self.doc_lengths = section("I", documents)
+        self.flags = bytearray(section("B", documents))
+        self._offsets = section("Q", terms + 1)
+        self._docs = section("I", postings)
+        self._tfs = section("H", postings)
+        vocabulary = bytes(view[offset:]).decode() if terms else ""
+        self._terms = (
+            {term: i for i, term in enumerate(vocabulary.split("\n"))} if terms else {}
+        )
+        self.event_cursor = cursor
+
+    def postings(self, term: str):
+        """
+        Return ``(documents, term frequencies)`` for a term, or None.
+        """
+        i = self._terms.get(term)
+        if i is None:
+            return None
+        start, end = self._offsets[i], self._offsets[i + 1]
+        return self._docs[start:end], self._tfs[start:end]
+
+    def terms(self):
+        """
+        Return the segment's terms.
+        """
+        return self._terms.keys()
+
+    def locate(self, pk: int):
+        """
+        Return the document number of an article pk, or None.
+
+        Snapshot documents are stored in pk order, so this is a binary search.
+        """
+        i = bisect_left(self.doc_ids, pk)
+        if i < len(self.doc_ids) and self.doc_ids[i] == pk:
+            return i
+        return None
+
+
+class BM25Index:
+    """
+    Segmented BM25 inverted index of article pks; safe to share between threads.
+
+    Attributes:
+        k1 (float): BM25 term-frequency saturation.
+        b (float): BM25 length normalization.
+        event_cursor (int): Last ``ArticleStatusEvent`` applied.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.segments = [_MemorySegment()]
+        self.live_count = 0
+        self.total_length = 0
+        self.event_cursor = 0
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return self.live_count
+
+    def __contains__(self, pk: int) -> bool:
+        return self._locate(pk) is not None
+
+    def _locate(self, pk: int):
+        """
+        Find the live document of an article.
+
+        Returns:
+            tuple | None: ``(segment, document number)``.
+        """
+        for segment in reversed(self.segments):
+            doc = segment.locate(pk)
+            if doc is not None and segment.flags[doc] & LIVE:
+                return segment, doc
+        return None
+
+    def add(self, pk: int, tokens, approved: bool = True) -> None:
+        """
+        Index (or re-index) an article.
+
+        Args:
+            pk (int): Article pk.
+            tokens: The article's terms, repeated per occurrence.
+            approved (bool): Whether reader searches may return it.
+
+        Returns:
+            None
+        """
+        counts = Counter(tokens)
+        length = sum(counts.values())
+        with self._lock:
+            self.remove(pk)
+            self.segments[-1].add(
+                pk, counts, length, LIVE | (APPROVED if approved else 0)
+            )
+            self.live_count += 1
+            self.total_length += length
+
+    def remove(self, pk: int) -> bool:
+        """
+        Tombstone an article's document.
+
+        Returns:
+            bool: False if the article was not indexed.
+        """
+        with self._lock:
+            found = self._locate(pk)
+            if found is None:
+                return False
+            segment, doc = found
+            segment.flags[doc] = 0
+            self.live_count -= 1
+            self.total_length -= segment.doc_lengths[doc]
+            return True
+
+    def set_approved(self, pk: int, approved: bool) -> bool:
+        """
+        Flip whether reader searches may return an article.
+
+        Returns:
+            bool: False if the article was not indexed.
+        """
+        with self._lock:
+            found = self._locate(pk)
+            if found is None:
+                return False
+            segment, doc = found
+            segment.flags[doc] = LIVE | (APPROVED if approved else 0)
+            return True
+
+    def idf(self, term: str) -> float:
+        """
+        Return the BM25 inverse document frequency of a term.
+
+        Document frequencies include tombstoned documents until the next
+        snapshot, so heavily churned terms score slightly low until then.
+
+        Returns:
+            float: The idf (0 for unknown terms).
+        """
+        with self._lock:
+            postings = (segment.postings(term) for segment in self.segments)
+            df = sum(len(p[0]) for p in postings if p)
+            if not df:
+                return 0.0
+            return self._idf(df)
+
+    def _idf(self, df: int) -> float:
+        """
+        Return the idf for a document frequency; the caller holds the lock.
+        """
+        return max(math.log(1 + (self.live_count - df + 0.5) / (df + 0.5)), 1e-6)
+
+    def search(
+        self,
+        terms,
+        k: int = 10,
+        *,
+        approved_only: bool = True,
+        require_all: bool = False,
+        exclude=(),
+    ):
+        """
+        Return the ``k`` best BM25 matches.
+
+        Args:
+            terms: Query terms (duplicates ignored).
+            k (int): Number of results.
+            approved_only (bool): Skip documents not flagged approved.
+            require_all (bool): Only documents containing every term.
+            exclude: Article pks to leave out.
+
+        Returns:
+            tuple[list[tuple[int, float]], int]: ``(pk, score)`` pairs, best
+            first (ties by higher pk), and the total number of matches.
+        """
+        terms = list(dict.fromkeys(terms))
+        required = LIVE | APPROVED if approved_only else LIVE
+        with self._lock:
+            if not self.live_count or not terms:
+                return [], 0
+            # Average document length; 1 when every live document is empty.
+            average = self.total_length / self.live_count or 1
+            per_length = self.k1 * self.b / average
+            base = self.k1 * (1 - self.b)
+            boost = self.k1 + 1
+            scores = [{} for _ in self.segments]
+            matched = [{} for _ in self.segments] if require_all else None
+
+            for term in terms:
+                lists = [segment.postings(term) for segment in self.segments]
+                df = sum(len(p[0]) for p in lists if p)
+                if not df:
+                    if require_all:
+                        return [], 0
+                    continue
+                idf = self._idf(df)
+                for i, (segment, postings) in enumerate(zip(self.segments, lists)):
+                    if not postings:
+                        continue
+                    flags, lengths, acc = segment.flags, segment.doc_lengths, scores[i]
+                    hits = matched[i] if require_all else None
+                    for doc, tf in zip(*postings):
+                        if flags[doc] & required == required:
+                            acc[doc] = acc.get(doc, 0.0) + idf * tf * boost / (
+                                tf + base + per_length * lengths[doc]
+                            )
+                            if hits is not None:
+                                hits[doc] = hits.get(doc, 0) + 1
+
+            candidates = [
+                (score, segment.doc_ids[doc])
+                for i, (segment, acc) in enumerate(zip(self.segments, scores))
+                for doc, score in acc.items()
+                if not require_all or matched[i][doc] == len(terms)
+            ]
+        if exclude:
+            exclude = set(exclude)
+            candidates = [c for c in candidates if c[1] not in exclude]
+        top = heapq.nlargest(k, candidates)
+        return [(pk, score) for score, pk in top], len(candidates)
+
+    def write_snapshot(self, path: str) -> int:
+        """
+        Write the live documents to a snapshot file (atomically replaced).
+
+        Documents are renumbered in pk order and tombstones dropped.
+
+        Args:
+            path (str): Destination file.
+
+        Returns:
+            int: Bytes written.
+        """
+        with self._lock:
+            live = sorted(
+                (segment.doc_ids[doc], i, doc)
+                for i, segment in enumerate(self.segments)
+                for doc in range(len(segment.doc_ids))
+                if segment.flags[doc] & LIVE
+            )
+            renumber = [{} for _ in self.segments]
+            doc_ids, doc_lengths, flags = array("q"), array("I"), bytearray()
+            for new_doc, (pk, i, doc) in enumerate(live):
+                renumber[i][doc] = new_doc
+                doc_ids.append(pk)
+                doc_lengths.append(self.segments[i].doc_lengths[doc])
+                flags.append(self.segments[i].flags[doc])
+
+            vocabulary, offsets = [], array("Q", [0])
+            post_docs, post_tfs = array("I"), array("H")
+            for term in sorted(
+                set().union(*(segment.terms() for segment in self.segments))
+            ):
+                merged = []
+                for i, segment in enumerate(self.segments):
+                    postings = segment.postings(term)
+                    if postings:
+                        mapping = renumber[i]
+                        merged.extend(
+                            (mapping[doc], tf)
+                            for doc, tf in zip(*postings)
+                            if doc in mapping
+                        )
+                if not merged:
+                    continue
+                merged.sort()
+                vocabulary.append(term)
+                post_docs.extend(doc for doc, _ in merged)
+                post_tfs.extend(tf for _, tf in merged)
+                offsets.append(len(post_docs))
+            cursor = self.event_cursor
+
+        header = HEADER.pack(
+            MAGIC, VERSION, 0, len(doc_ids), len(vocabulary), len(post_docs), cursor
+        )
+        temporary = f"{path}.tmp"
+        written = 0
+        with open(temporary, "wb") as handle:
+            columns = (doc_ids, doc_lengths, flags, offsets, post_docs, post_tfs)
+            for chunk in (header, *columns):
+                data = (
+                    chunk if isinstance(chunk, (bytes, bytearray)) else chunk.tobytes()
+                )
+                handle.write(data)
+                handle.write(b"\0" * _padding(len(data)))
+                written += len(data) + _padding(len(data))
+            data = "\n".join(vocabulary).encode()
+            handle.write(data)
+            written += len(data)
+        os.replace(temporary, path)
+        return written
+
+    @classmethod
+    def load_snapshot(cls, path: str, k1: float = 1.2, b: float = 0.75) -> "BM25Index":
+        """
+        Map a snapshot written by ``write_snapshot``.
+
+        Args:
+            path (str): Snapshot file.
+            k1 (float): BM25 term-frequency saturation.
+            b (float): BM25 length normalization.
+
+        Returns:
+            BM25Index: An index whose first segment reads from the mapping.
+
+        Raises:
+            ValueError: If the file is not a snapshot of this version.
+        """
+        index = cls(k1, b)
+        mapped = _MappedSegment(path)
+        index.segments.insert(0, mapped)
+        index.live_count = len(mapped.doc_ids)
+        index.total_length = sum(mapped.doc_lengths)
+        index.event_cursor = mapped.event_cursor
+        return index
+
+
+def article_tokens(article) -> list:
+    """
+    Return an article's index terms; title terms repeat ``SEARCH_TITLE_WEIGHT`` times.
+
+    Returns:
+        list[str]: The terms.
+    """
+    weight = getattr(settings, "SEARCH_TITLE_WEIGHT", 3)
+    return tokenize(article.title) * weight + tokenize(article.body)
+
+
+class BM25SearchBackend(SearchBackend):
+    """
+    Search backend answering from a per-process ``BM25Index``.
+
+    The index is loaded from ``SEARCH_ENGINE_SNAPSHOT`` when that file exists,
+    otherwise built from the database, on first use.
+    """
+
+    def __init__(self):
+        self._index = None
+        self._synced_at = 0.0
+        self._lock = threading.Lock()
+
+    def _new_index(self) -> BM25Index:
+        """
+        Return an empty index with the configured BM25 parameters.
+        """
+        return BM25Index(
+            getattr(settings, "SEARCH_BM25_K1", 1.2),
+            getattr(settings, "SEARCH_BM25_B", 0.75),
+        )
+
+    def build(self) -> BM25Index:
+        """
+        Index every article from the database.
+
+        Returns:
+            BM25Index: The new index, positioned at the settled event log end.
+        """
+        index = self._new_index()
+        index.event_cursor = settled_event_id()
+        articles = Article.objects.only("pk", "title", "body", "status").order_by("pk")
+        for article in articles.iterator(chunk_size=2000):
+            index.add(
+                article.pk,
+                article_tokens(article),
+                article.status == Article.Status.APPROVED,
+            )
+        return index
+
+    def sync(self, index: BM25Index) -> int:
+        """
+        Apply the settled status events logged since the index's cursor.
+
+        New articles and articles whose latest status is APPROVED are
+        (re)loaded and indexed, so edits (logged as APPROVED events, or made
+        while an article was out of review) show up; the others only get
+        their approved flag cleared. Articles deleted since are skipped
+        here and dropped by ``_search``.
+
+        Returns:
+            int: Number of events applied.
+        """
+        until = settled_event_id()
+        events = list(
+            ArticleStatusEvent.objects.filter(pk__gt=index.event_cursor, pk__lte=until)
+            .order_by("pk")
+            .values_list("pk", "article_id", "status")
+        )
+        if not events:
+            return 0
+        latest = {article_id: status for _, article_id, status in events}
+        reload = {
+            pk
+            for pk, status in latest.items()
+            if pk not in index or status == Article.Status.APPROVED
+        }
+        articles = Article.objects.filter(pk__in=reload).only(
+            "pk", "title", "body", "status"
+        )
+        for article in articles:
+            index.add(
+                article.pk,
+                article_tokens(article),
+                article.status == Article.Status.APPROVED,
+            )
+        for pk, status in latest.items():
+            if pk not in reload:
+                index.set_approved(pk, False)
+        index.event_cursor = until
+        return len(events)
+
+    def get_index(self) -> BM25Index:
+        """
+        Return this process's index, loading it and catching up as needed.
+
+        Returns:
+            BM25Index: The index.
+        """
+        with self._lock:
+            if self._index is None:
+                path = getattr(settings, "SEARCH_ENGINE_SNAPSHOT", "")
+                if path and os.path.exists(path):
+                    self._index = BM25Index.load_snapshot(
+                        path,
+                        getattr(settings, "SEARCH_BM25_K1", 1.2),
+                        getattr(settings, "SEARCH_BM25_B", 0.75),
+                    )
+                else:
+                    self._index = self.build()
+            now = time.monotonic()
+            interval = getattr(settings, "SEARCH_ENGINE_SYNC_SECONDS", 5)
+            if now - self._synced_at >= interval:
+                self.sync(self._index)
+                self._synced_at = now
+            return self._index
+
+    def _search(self, terms, k: int, **kwargs):
+        """
+        Search the index, tombstoning results whose article was deleted.
+
+        Deletes made in other processes never reach the event log (its rows
+        cascade), so each result set is checked against the database and the
+        search is repeated once missing articles are removed.
+
+        Args:
+            terms: Query terms.
+            k (int): Number of results.
+            **kwargs: Passed to ``BM25Index.search``.
+
+        Returns:
+            tuple[list[tuple[int, float]], int]: As ``BM25Index.search``.
+        """
+        index = self.get_index()
+        while True:
+            results, total = index.search(terms, k, **kwargs)
+            pks = [pk for pk, _ in results]
+            deleted = set(pks).difference(
+                Article.objects.filter(pk__in=pks).values_list("pk", flat=True)
+            )
+            if not deleted:
+                return results, total
+            for pk in deleted:
+                index.remove(pk)
+
+    def search(
+        self,
+        query: str,
+        *,
+        approved_only: bool = True,
+        limit: int = 20,
+        offset: int = 0,
+    ):
+        terms = query_terms(query)
+        if not terms:
+            return [], 0
+        results, total = self._search(
+            terms, offset + limit, approved_only=approved_only
+        )
+        return results[offset:], total
+
+    def filter_queryset(self, queryset, query: str):
+        terms = query_terms(query)
+        if not terms:
+            return queryset.none()
+        results, _ = self.get_index().search(
+            terms,
+            getattr(settings, "SEARCH_ADMIN_MAX_RESULTS", 1000),
+            approved_only=False,
+            require_all=True,
+        )
+        return queryset.filter(pk__in=[pk for pk, _ in results])
+
+    def related(self, article, limit: int = 5):
+        """
+        Find approved articles similar to ``article`` (more-like-this).
+
+        Queries the index with the article's highest TF-IDF terms.
+
+        Args:
+            article (Article): The article (``title`` and ``body`` loaded).
+            limit (int): Number of results.
+
+        Returns:
+            list[tuple[int, float]]: ``(pk, score)`` pairs, best first.
+        """
+        index = self.get_index()
+        counts = Counter(article_tokens(article))
+        weighted = sorted(
+            ((tf * index.idf(term), term) for term, tf in counts.items()), reverse=True
+        )
+        terms = [term for weight, term in weighted[:MAX_RELATED_TERMS] if weight > 0]
+        results, _ = self._search(terms, limit, exclude={article.pk})
+        return results
+
+    def index(self, articles) -> None:
+        if self._index is None:
+            return  # Loaded (or built) fresh on first use.
+        for article in articles:
+            self._index.add(
+                article.pk,
+                article_tokens(article),
+                article.status == Article.Status.APPROVED,
+            )
+
+    def set_approved(self, article_ids, approved: bool) -> None:
+        if self._index is not None:
+            for pk in article_ids:
+                self._index.set_approved(pk, approved)
+
+    def remove(self, article_ids) -> None:
+        if self._index is not None:
+            for pk in article_ids:
+                self._index.remove(pk)
+
+    def rebuild(self) -> int:
+        """
+        Rebuild from the database and write ``SEARCH_ENGINE_SNAPSHOT`` if set.
+
+        Returns:
+            int: Number of articles indexed.
+        """
+        index = self.build()
+        path = getattr(settings, "SEARCH_ENGINE_SNAPSHOT", "")
+        if path:
+            index.write_snapshot(path)
+        with self._lock:
+            self._index = index
+            self._synced_at = time.monotonic()
+        return len(index)
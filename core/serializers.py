@@ -5,6 +5,10 @@ Serializers translate Django model instances into JSON-friendly Python data,
 and validate/deserialize incoming API payloads when needed.
 """
 
+from functools import cached_property
+from operator import attrgetter
+
+from django.db.models.functions import Substr
 from rest_framework import serializers
 
 from .models import Article
@@ -42,4 +46,160 @@ class ArticleSerializer(serializers.ModelSerializer):
             "status",
             "created_at",
         ]
-        read_only_fields = fields
\ No newline at end of file
+        read_only_fields = fields
+
+
+FEED_FIELDS = (
+    "id",
+    "title",
+    "body",
+    "publisher",
+    "publisher_name",
+    "author",
+    "author_username",
+    "status",
+    "created_at",
+)
+
+# Columns each output field needs (passed to ``QuerySet.only``).
+FEED_FIELD_COLUMNS = {
+    "id": ("id",),
+    "title": ("title",),
+    "body": ("body",),
+    "publisher": ("publisher_id",),
+    "publisher_name": ("publisher_id", "publisher__name"),
+    "author": ("author_id",),
+    "author_username": ("author_id", "author__username"),
+    "status": ("status",),
+    "created_at": ("created_at",),
+}
+
+BODY_FULL = "full"
+BODY_EXCERPT = "excerpt"
+EXCERPT_LENGTH = 280
+
+
+def parse_field_selection(query_params):
+    """
+    Read the ``?fields=`` and ``?body=`` feed options.
+
+    Args:
+        query_params: The request's query parameters.
+
+    Returns:
+        tuple[tuple[str, ...], str]: Selected fields in canonical order and the
+        body mode (``"full"`` or ``"excerpt"``).
+
+    Raises:
+        ValidationError: On unknown field names or body modes.
+    """
+    raw = query_params.get("fields", "")
+    requested = {name.strip() for name in raw.split(",") if name.strip()}
+    unknown = requested - set(FEED_FIELDS)
+    if unknown:
+        raise serializers.ValidationError(
+            {"fields": f"Unknown field(s): {', '.join(sorted(unknown))}."}
+        )
+    fields = tuple(f for f in FEED_FIELDS if f in requested) if requested else FEED_FIELDS
+
+    body_mode = query_params.get("body", BODY_FULL)
+    if body_mode not in (BODY_FULL, BODY_EXCERPT):
+        raise serializers.ValidationError({"body": "Use 'full' or 'excerpt'."})
+
+    return fields, body_mode
+
+
+class FeedArticleSerializer(serializers.BaseSerializer):
+    """
+    Read-only fast path producing exactly ``ArticleSerializer``'s output.
+
+    Feed pages can hold up to 100 articles, and ``ModelSerializer`` field
+    dispatch dominates CPU time at that size. This builds each dict directly.
+    The queryset must be prepared with ``with_feed_columns`` so the publisher
+    and author come from one joined query instead of one query per row.
+
+    Context options (see ``parse_field_selection``):
+        - fields: output fields to include (default: all)
+        - body_mode: ``"excerpt"`` renders ``body`` from the ``body_excerpt``
+          annotation instead of the full text
+    """
+
+    created_at_field = serializers.DateTimeField()
+
+    @cached_property
+    def getters(self):
+        """
+        Build (name, getter) pairs for the selected fields, once per response.
+
+        Returns:
+            list[tuple[str, Callable]]: Output keys and value getters.
+        """
+        body_getter = (
+            attrgetter("body_excerpt")
+            if self.context.get("body_mode") == BODY_EXCERPT
+            else attrgetter("body")
+        )
+        available = {
+            "id": attrgetter("pk"),
+            "title": attrgetter("title"),
+            "body": body_getter,
+            "publisher": attrgetter("publisher_id"),
+            "publisher_name": attrgetter("publisher.name"),
+            "author": attrgetter("author_id"),
+            "author_username": attrgetter("author.username"),
+            "status": lambda article: str(article.status),
+            "created_at": lambda article: self.created_at_field.to_representation(
+                article.created_at
+            ),
+        }
+        fields = self.context.get("fields") or FEED_FIELDS
+        return [(name, available[name]) for name in fields]
+
+    def to_representation(self, article):
+        """
+        Convert an Article into the feed item dict.
+
+        Args:
+            article (Article): An article loaded via ``with_feed_columns``.
+
+        Returns:
+            dict: Keys and values identical to ``ArticleSerializer`` for the
+            selected fields.
+        """
+        return {name: getter(article) for name, getter in self.getters}
+
+
+def with_feed_columns(queryset, fields=FEED_FIELDS, body_mode=BODY_FULL):
+    """
+    Restrict a feed queryset to the columns ``FeedArticleSerializer`` reads.
+
+    Joins publisher and author in the same query when their names are
+    selected, so serialization costs no extra queries regardless of page size.
+    The ``body`` column is deferred unless the full body is requested; excerpt
+    mode selects a bounded ``SUBSTRING`` of it computed by the database.
+
+    Args:
+        queryset: An Article queryset or ``core.feeds.MergedFeed``.
+        fields: Selected output fields.
+        body_mode (str): ``"full"`` or ``"excerpt"``.
+
+    Returns:
+        The same kind of object, joined and column-restricted.
+    """
+    columns = {"id", "created_at"}
+    for name in fields:
+        if name == "body" and body_mode == BODY_EXCERPT:
+            continue
+        columns.update(FEED_FIELD_COLUMNS[name])
+
+    related = [
+        rel
+        for rel, name in (("publisher", "publisher_name"), ("author", "author_username"))
+        if name in fields
+    ]
+    if related:
+        queryset = queryset.select_related(*related)
+    if "body" in fields and body_mode == BODY_EXCERPT:
+        queryset = queryset.annotate(body_excerpt=Substr("body", 1, EXCERPT_LENGTH))
+
+    return queryset.only(*sorted(columns))
@@ -0,0 +1,145 @@
+"""
+Local stand-in for the X post endpoint, for development and tests.
+
+``FakeXServer`` accepts ``POST`` requests on any path and enforces an X-style
+fixed-window rate limit: ``limit`` posts per ``window`` seconds, answered
+with 429 once spent. Every response carries ``x-rate-limit-limit``,
+``x-rate-limit-remaining`` and ``x-rate-limit-reset`` (epoch seconds).
+Queued ``statuses`` replace the next responses (e.g. 503 to exercise retries)
+without using the allowance. Every request is recorded in ``received``.
+The window follows ``clock`` (``time.time`` by default), so tests can drive
+it with the same fake clock as the scheduler's ``TokenBucket``.
+
+Run one with ``python manage.py fake_x_api`` and point ``X_API_URL`` at it.
+"""
+
+import json
+import math
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class FakeXServer:
+    """
+    Threaded HTTP/1.1 (keep-alive) fake of ``POST /2/tweets``.
+
+    Attributes:
+        url (str): Endpoint URL to use as ``X_API_URL``.
+        statuses (list[int]): Statuses to answer next, before rate limiting.
+        received (list[dict]): ``port``, ``authorization``, ``json``,
+            ``status`` and ``at`` (epoch seconds) of each request.
+        used (int): Posts accepted in the current window.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        *,
+        limit=None,
+        window=900,
+        clock=time.time,
+    ):
+        self.limit = limit
+        self.window = window
+        self.statuses = []
+        self.received = []
+        self.used = 0
+        self._clock = clock
+        self.window_start = clock()
+        self._lock = threading.Lock()
+        self._thread = None
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                status, headers, reply = fake.respond(
+                    {
+                        "port": self.client_address[1],
+                        "authorization": self.headers.get("Authorization"),
+                        "json": json.loads(body or b"null"),
+                    }
+                )
+                payload = json.dumps(reply).encode()
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.url = f"http://{host}:{self.server.server_port}/2/tweets"
+
+    def respond(self, request: dict) -> tuple:
+        """
+        Decide the response to one request and record it.
+
+        Args:
+            request (dict): ``port``, ``authorization`` and ``json``.
+
+        Returns:
+            tuple: ``(status, headers, body)``.
+        """
+        with self._lock:
+            now = self._clock()
+            if self.limit is not None and now >= self.window_start + self.window:
+                self.window_start, self.used = now, 0
+
+            if self.statuses:
+                status = self.statuses.pop(0)
+            elif self.limit is not None and self.used >= self.limit:
+                status = 429
+            else:
+                status = 201
+                self.used += 1
+
+            headers = {}
+            if self.limit is not None:
+                headers = {
+                    "x-rate-limit-limit": str(self.limit),
+                    "x-rate-limit-remaining": str(max(0, self.limit - self.used)),
+                    "x-rate-limit-reset": str(math.ceil(self.window_start + self.window)),
+                }
+            request.update(status=status, at=now)
+            self.received.append(request)
+            post_id = str(len(self.received))
+
+        if status == 201:
+            return status, headers, {"data": {"id": post_id, "text": (request["json"] or {}).get("text", "")}}
+        return status, headers, {"title": "Error", "status": status}
+
+    def start(self) -> "FakeXServer":
+        """
+        Serve on a daemon thread.
+
+        Returns:
+            FakeXServer: self.
+        """
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """
+        Stop serving and close the socket.
+
+        Returns:
+            None
+        """
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
@@ -1,41 +1,321 @@
+"""
+Client for posting approved articles to X.
+
+Posts are made by the ``post_to_x`` scheduler (``core.services.x_scheduler``),
+never inside an editor's request, so approvals do not wait on X. The client:
+
+- One pooled, keep-alive ``requests.Session`` is shared by the calling
+  threads (``X_POOL_SIZE`` connections), so consecutive posts reuse TCP/TLS
+  connections instead of opening one per post.
+- Connection failures and 5xx responses are retried in place, up to
+  ``X_RETRIES`` attempts, sleeping a random ("full jitter") delay of up to
+  ``X_BACKOFF_BASE * 2^n`` seconds (capped at ``X_BACKOFF_MAX``) in between.
+  Read timeouts are not retried in place, since the post may have been
+  created; like anything still failing, they are left to the scheduler,
+  which retries later with its own backoff. 429s are raised at once: the
+  scheduler waits for the rate-limit window instead.
+- A circuit breaker counts consecutive failed posts. After
+  ``X_BREAKER_THRESHOLD`` of them it opens and calls fail at once with
+  ``CircuitOpenError`` (no network traffic) for ``X_BREAKER_RESET`` seconds;
+  then a single trial post closes it again or re-opens it.
+
+The client is built lazily from the settings and rebuilt when they change.
+"""
+
+import random
+import threading
+import time
+
 import requests
 from django.conf import settings
+from requests.adapters import HTTPAdapter
+
+RETRY_STATUSES = frozenset({500, 502, 503, 504})
 
 
-def post_article_to_x(article, request) -> bool:
+class CircuitOpenError(requests.RequestException):
+    """
+    Raised instead of calling X while the circuit breaker is open.
     """
-    Attempts to post an approved article to X.
 
-    Returns:
-        True if we attempted and got a successful response.
-        False if disabled or failed for any reason.
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker, safe to share between threads.
+
+    States: ``closed`` (calls pass), ``open`` (calls are refused until
+    ``reset_timeout`` seconds after the last failure) and ``half-open`` (one
+    trial call is let through; its outcome closes or re-opens the circuit).
     """
-    if not getattr(settings, "X_POST_ENABLED", False):
-        return False
 
-    bearer_token = getattr(settings, "X_BEARER_TOKEN", "")
-    api_url = getattr(settings, "X_API_URL", "")
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
 
-    if not bearer_token or not api_url:
-        return False
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self._trial_running = False
+        self._lock = threading.Lock()
 
-    article_url = request.build_absolute_uri(f"/articles/{article.pk}/")
-    text = f"{article.title}\n\nRead: {article_url}"
+    @property
+    def state(self) -> str:
+        """
+        Return the current state.
 
-    headers = {
-        "Authorization": f"Bearer {bearer_token}",
-        "Content-Type": "application/json",
-    }
-    payload = {"text": text}
-
-    try:
-        response = requests.post(
-            api_url,
-            headers=headers,
-            json=payload,
-            timeout=5,
+        Returns:
+            str: ``closed``, ``open`` or ``half-open``.
+        """
+        with self._lock:
+            return self._state()
+
+    def _state(self) -> str:
+        """
+        Return the current state; the caller holds the lock.
+
+        Returns:
+            str: See ``state``.
+        """
+        if self.opened_at is None:
+            return self.CLOSED
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return self.HALF_OPEN
+        return self.OPEN
+
+    def allow(self) -> bool:
+        """
+        Decide whether a call may go out now.
+
+        Returns:
+            bool: True when closed, or for the single trial call when
+            half-open.
+        """
+        with self._lock:
+            state = self._state()
+            if state == self.CLOSED:
+                return True
+            if state == self.HALF_OPEN and not self._trial_running:
+                self._trial_running = True
+                return True
+            return False
+
+    def retry_after(self) -> float:
+        """
+        Return the seconds left until a trial call is allowed.
+
+        Returns:
+            float: 0 when the circuit is not open.
+        """
+        with self._lock:
+            if self.opened_at is None:
+                return 0.0
+            return max(0.0, self.opened_at + self.reset_timeout - time.monotonic())
+
+    def record_success(self) -> None:
+        """
+        Close the circuit and reset the failure count.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial_running = False
+
+    def record_failure(self) -> None:
+        """
+        Count a failure; open (or re-open) the circuit at the threshold.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self.failures += 1
+            if self._trial_running or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+            self._trial_running = False
+
+
+class XClient:
+    """
+    Pooled, retrying, circuit-broken client for the X post endpoint.
+    """
+
+    def __init__(
+        self,
+        api_url: str,
+        bearer_token: str,
+        *,
+        timeout=(3.05, 5),
+        retries: int = 3,
+        backoff_base: float = 0.5,
+        backoff_max: float = 4,
+        pool_size: int = 4,
+        failure_threshold: int = 5,
+        reset_timeout: float = 60,
+    ):
+        self.api_url = api_url
+        self.timeout = timeout
+        self.retries = max(1, retries)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout)
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update(
+            {
+                "Authorization": f"Bearer {bearer_token}",
+                "Content-Type": "application/json",
+            }
         )
-        response.raise_for_status()
-        return True
-    except requests.RequestException:
-        return False
\ No newline at end of file
+
+    def close(self) -> None:
+        """
+        Close the pooled connections.
+
+        Returns:
+            None
+        """
+        self.session.close()
+
+    def retry_delay(self, attempt: int) -> float:
+        """
+        Return a full-jitter delay before retry number ``attempt``.
+
+        Returns:
+            float: Seconds, uniformly drawn from ``[0, min(max, base * 2^(attempt - 1))]``.
+        """
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1)))
+
+    def _post_with_retries(self, payload: dict) -> requests.Response:
+        """
+        POST ``payload``, retrying connection errors and retryable statuses.
+
+        Returns:
+            requests.Response: The successful response.
+
+        Raises:
+            requests.RequestException: The last error once attempts run out,
+                or at once for read timeouts and non-retryable statuses.
+        """
+        for attempt in range(1, self.retries + 1):
+            try:
+                response = self.session.post(self.api_url, json=payload, timeout=self.timeout)
+                response.raise_for_status()
+                return response
+            except requests.ConnectionError:
+                if attempt == self.retries:
+                    raise
+            except requests.HTTPError as exc:
+                if attempt == self.retries or exc.response.status_code not in RETRY_STATUSES:
+                    raise
+            time.sleep(self.retry_delay(attempt))
+
+    def post(self, payload: dict) -> requests.Response:
+        """
+        Create a post, going through the circuit breaker.
+
+        Args:
+            payload (dict): JSON body, e.g. ``{"text": ...}``.
+
+        Returns:
+            requests.Response: The successful response.
+
+        Raises:
+            CircuitOpenError: If the circuit is open (nothing was sent).
+            requests.RequestException: If the post failed after retries.
+            Exception: Anything else raised while posting, after it was
+                recorded as a failure.
+        """
+        if not self.breaker.allow():
+            raise CircuitOpenError(
+                f"X circuit open; next trial in {self.breaker.retry_after():.0f}s"
+            )
+        try:
+            response = self._post_with_retries(payload)
+        except requests.HTTPError as exc:
+            # X answered: a rejected or rate-limited post (4xx) says nothing
+            # about an outage.
+            if exc.response.status_code in RETRY_STATUSES:
+                self.breaker.record_failure()
+            else:
+                self.breaker.record_success()
+            raise
+        except BaseException:
+            # Transport errors, but also anything else (a payload that cannot
+            # be encoded, an interrupted worker): a half-open trial must end,
+            # or the breaker would refuse every later call.
+            self.breaker.record_failure()
+            raise
+        self.breaker.record_success()
+        return response
+
+
+_client = None
+_client_config = None
+_client_lock = threading.Lock()
+
+
+def _settings_config() -> tuple:
+    """
+    Read the client settings.
+
+    Returns:
+        tuple: ``(api_url, bearer_token, options)``.
+    """
+    options = {
+        "timeout": (
+            getattr(settings, "X_CONNECT_TIMEOUT", 3.05),
+            getattr(settings, "X_READ_TIMEOUT", 5),
+        ),
+        "retries": getattr(settings, "X_RETRIES", 3),
+        "backoff_base": getattr(settings, "X_BACKOFF_BASE", 0.5),
+        "backoff_max": getattr(settings, "X_BACKOFF_MAX", 4),
+        "pool_size": getattr(settings, "X_POOL_SIZE", 4),
+        "failure_threshold": getattr(settings, "X_BREAKER_THRESHOLD", 5),
+        "reset_timeout": getattr(settings, "X_BREAKER_RESET", 60),
+    }
+    return (
+        getattr(settings, "X_API_URL", ""),
+        getattr(settings, "X_BEARER_TOKEN", ""),
+        options,
+    )
+
+
+def get_client() -> XClient:
+    """
+    Return the process-wide client, (re)built from the current settings.
+
+    Returns:
+        XClient: The shared client.
+    """
+    global _client, _client_config
+    config = _settings_config()
+    with _client_lock:
+        if _client is None or _client_config != config:
+            if _client is not None:
+                _client.close()
+            api_url, bearer_token, options = config
+            _client = XClient(api_url, bearer_token, **options)
+            _client_config = config
+        return _client
+
+
+def reset_client() -> None:
+    """
+    Close and drop the shared client (its pool and breaker state).
+
+    Returns:
+        None
+    """
+    global _client, _client_config
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+        _client = _client_config = None
@@ -0,0 +1,396 @@
+"""
+Rate-limit-aware scheduler for posting approved articles to X.
+
+Approving an article (with ``X_POST_ENABLED``) writes an ``XPost`` row in the
+decision's transaction (``queue_x_posts``), so the queue survives restarts
+and bursts of approvals. The ``post_to_x`` command drains it:
+
+- A ``TokenBucket`` decides when the next post may go out. It starts at
+  ``X_RATE_LIMIT`` posts per ``X_RATE_LIMIT_WINDOW`` seconds and is re-synced
+  from the ``x-rate-limit-limit/remaining/reset`` headers of every response,
+  so the scheduler spends what X reports as left and then waits for the
+  window to reset instead of bursting into 429s.
+- The freshest queued article goes first (``queued_at`` descending), so a
+  backlog built up while rate limited is worked off newest-first.
+- A 429 empties the bucket until the reported reset (``Retry-After`` or
+  ``X_RATE_LIMIT_COOLDOWN`` without headers) and leaves the post queued
+  without counting an attempt. Other failures (5xx, network errors, an open
+  circuit) back off like outbox messages and fail after
+  ``X_POST_MAX_ATTEMPTS``; rejected posts (other 4xx) fail at once. Articles
+  no longer APPROVED are cancelled.
+- Each row records its status, attempts, the X post id, the response time
+  and the latency from queueing to posting.
+
+Rows are claimed with ``SELECT ... FOR UPDATE SKIP LOCKED`` and a lease, so a
+crashed scheduler's posts become due again. Run one scheduler per X app:
+each process keeps its own bucket.
+"""
+
+import time
+from datetime import timedelta
+
+import requests
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from ..models import Article, XPost
+from ..outbox import backoff
+from .x_client import RETRY_STATUSES, get_client
+
+
+class TokenBucket:
+    """
+    Posting allowance, synced from X's rate-limit headers.
+
+    Until X reports a window, tokens trickle back at ``capacity / window``
+    per second. Once a response carries ``x-rate-limit-*`` headers the bucket
+    mirrors X's fixed window: the reported ``remaining`` tokens until
+    ``reset``, then a full ``limit``.
+    """
+
+    def __init__(self, capacity: int, window: float, clock=time.time):
+        self.capacity = capacity
+        self.window = window
+        self.tokens = float(capacity)
+        self.reset_at = None
+        self._clock = clock
+        self._updated = clock()
+
+    def _refill(self, now: float) -> None:
+        """
+        Add the tokens earned since the last update.
+
+        Returns:
+            None
+        """
+        if self.reset_at is not None:
+            if now >= self.reset_at:
+                self.tokens = float(self.capacity)
+                self.reset_at = None
+        else:
+            earned = (now - self._updated) * self.capacity / self.window
+            self.tokens = min(float(self.capacity), self.tokens + earned)
+        self._updated = now
+
+    def wait_time(self) -> float:
+        """
+        Return the seconds until a post may be made.
+
+        Returns:
+            float: 0 when a token is available.
+        """
+        now = self._clock()
+        self._refill(now)
+        if self.tokens >= 1:
+            return 0.0
+        if self.reset_at is not None:
+            return self.reset_at - now
+        return (1 - self.tokens) * self.window / self.capacity
+
+    def take(self) -> None:
+        """
+        Spend one token.
+
+        Returns:
+            None
+        """
+        self._refill(self._clock())
+        self.tokens -= 1
+
+    def sync(self, headers) -> bool:
+        """
+        Adopt the allowance reported in X's rate-limit headers.
+
+        Args:
+            headers: Response headers (case-insensitive mapping).
+
+        Returns:
+            bool: False if the headers were missing or malformed.
+        """
+        try:
+            limit = int(headers["x-rate-limit-limit"])
+            remaining = int(headers["x-rate-limit-remaining"])
+            reset_at = float(headers["x-rate-limit-reset"])
+        except (KeyError, TypeError, ValueError):
+            return False
+        self._updated = self._clock()
+        self.capacity = max(1, limit)
+        self.tokens = float(remaining)
+        self.reset_at = reset_at
+        return True
+
+    def exhaust(self, until: float) -> None:
+        """
+        Allow no posts before ``until`` (epoch seconds).
+
+        Returns:
+            None
+        """
+        self._updated = self._clock()
+        self.tokens = 0.0
+        self.reset_at = max(until, self._updated + 1)
+
+
+def post_text(article: Article, url: str) -> str:
+    """
+    Return the text posted for an article.
+
+    Returns:
+        str: Title and link.
+    """
+    return f"{article.title}\n\nRead: {url}"
+
+
+def queue_x_posts(article_urls: dict) -> int:
+    """
+    Queue approved articles for posting; call inside the approval's transaction.
+
+    Does nothing unless ``X_POST_ENABLED``. Articles already posted are not
+    posted again; failed or cancelled ones are re-queued.
+
+    Args:
+        article_urls (dict[int, str]): Absolute article URL by article pk.
+
+    Returns:
+        int: Number of articles queued.
+    """
+    if not getattr(settings, "X_POST_ENABLED", False) or not article_urls:
+        return 0
+    now = timezone.now()
+    existing = dict(
+        XPost.objects.filter(article_id__in=article_urls).values_list("article_id", "status")
+    )
+    XPost.objects.bulk_create(
+        [
+            XPost(article_id=pk, url=url, queued_at=now, available_at=now)
+            for pk, url in article_urls.items()
+            if pk not in existing
+        ],
+        ignore_conflicts=True,
+    )
+    requeued = [
+        pk
+        for pk, status in existing.items()
+        if status in (XPost.Status.FAILED, XPost.Status.CANCELLED)
+    ]
+    for pk in requeued:
+        XPost.objects.filter(article_id=pk).update(
+            url=article_urls[pk],
+            status=XPost.Status.QUEUED,
+            attempts=0,
+            queued_at=now,
+            available_at=now,
+            last_error="",
+        )
+    return len(article_urls) - len(existing) + len(requeued)
+
+
+def requeue_x_posts(queryset) -> int:
+    """
+    Put failed posts back in the queue with a fresh attempt budget.
+
+    Args:
+        queryset (QuerySet[XPost]): Posts to requeue.
+
+    Returns:
+        int: Number of posts requeued.
+    """
+    return queryset.filter(status=XPost.Status.FAILED).update(
+        status=XPost.Status.QUEUED, attempts=0, available_at=timezone.now()
+    )
+
+
+def deliver_x_post(payload: dict) -> None:
+    """
+    Outbox handler for ``x_post`` messages written before the X post queue.
+
+    Moves the article into the queue if it is still APPROVED.
+
+    Args:
+        payload (dict): ``article_id`` and ``url``.
+
+    Returns:
+        None
+    """
+    if Article.objects.filter(pk=payload["article_id"], status=Article.Status.APPROVED).exists():
+        queue_x_posts({payload["article_id"]: payload["url"]})
+
+
+def _ms(seconds: float) -> int:
+    """
+    Convert seconds to whole milliseconds.
+
+    Returns:
+        int: Milliseconds (never negative).
+    """
+    return max(0, round(seconds * 1000))
+
+
+class XPostScheduler:
+    """
+    Drains the ``XPost`` queue at the rate X allows, freshest first.
+    """
+
+    def __init__(self, bucket: TokenBucket | None = None, sleep=time.sleep):
+        self.bucket = bucket or TokenBucket(
+            getattr(settings, "X_RATE_LIMIT", 100),
+            getattr(settings, "X_RATE_LIMIT_WINDOW", 86400),
+        )
+        self._sleep = sleep
+
+    def _due(self):
+        """
+        Return the queued posts that may be claimed now.
+
+        Returns:
+            QuerySet[XPost]: Due posts, freshest first.
+        """
+        return XPost.objects.filter(
+            status=XPost.Status.QUEUED, available_at__lte=timezone.now()
+        ).order_by("-queued_at", "-pk")
+
+    def claim_next(self) -> XPost | None:
+        """
+        Lease the freshest due post to this scheduler.
+
+        Returns:
+            XPost | None: The post (article loaded), or None if none is due.
+        """
+        now = timezone.now()
+        leased_until = now + timedelta(seconds=getattr(settings, "X_POST_LEASE_SECONDS", 300))
+        with transaction.atomic():
+            pk = (
+                self._due()
+                .select_for_update(skip_locked=True)
+                .values_list("pk", flat=True)
+                .first()
+            )
+            if pk is None:
+                return None
+            # Re-check due-ness in the UPDATE for backends without row locks.
+            claimed = XPost.objects.filter(
+                pk=pk, status=XPost.Status.QUEUED, available_at__lte=now
+            ).update(available_at=leased_until)
+        if not claimed:
+            return None
+        return XPost.objects.select_related("article").get(pk=pk)
+
+    def _retry_later(self, post: XPost, error: str, not_before: float = 0) -> str:
+        """
+        Reschedule a failed post with backoff, or fail it at the attempt cap.
+
+        Returns:
+            str: The post's new status.
+        """
+        now = timezone.now()
+        attempts = post.attempts + 1
+        rows = XPost.objects.filter(pk=post.pk)
+        if attempts >= getattr(settings, "X_POST_MAX_ATTEMPTS", 8):
+            rows.update(status=XPost.Status.FAILED, attempts=attempts, last_error=error)
+            return XPost.Status.FAILED
+        delay = max(backoff(attempts), timedelta(seconds=not_before))
+        rows.update(attempts=attempts, available_at=now + delay, last_error=error)
+        return XPost.Status.QUEUED
+
+    def _rate_limited(self, post: XPost, response) -> str:
+        """
+        Empty the bucket until the window resets; keep the post queued.
+
+        Returns:
+            str: QUEUED.
+        """
+        retry_after = response.headers.get("retry-after", "")
+        if self.bucket.sync(response.headers):
+            until = self.bucket.reset_at
+        elif retry_after.isdigit():
+            until = time.time() + int(retry_after)
+        else:
+            until = time.time() + getattr(settings, "X_RATE_LIMIT_COOLDOWN", 60)
+        self.bucket.exhaust(until)
+        XPost.objects.filter(pk=post.pk).update(
+            available_at=timezone.now(), last_error="429 Too Many Requests"
+        )
+        return XPost.Status.QUEUED
+
+    def post_one(self, post: XPost) -> str:
+        """
+        Post one claimed article and record the outcome.
+
+        Args:
+            post (XPost): A post returned by ``claim_next``.
+
+        Returns:
+            str: The post's new status.
+        """
+        rows = XPost.objects.filter(pk=post.pk)
+        if post.article.status != Article.Status.APPROVED:
+            rows.update(status=XPost.Status.CANCELLED)
+            return XPost.Status.CANCELLED
+
+        self.bucket.take()
+        started = time.perf_counter()
+        try:
+            response = get_client().post({"text": post_text(post.article, post.url)})
+        except requests.HTTPError as exc:
+            response = exc.response
+            error = f"{response.status_code} {response.reason}"
+            if response.status_code == 429:
+                return self._rate_limited(post, response)
+            self.bucket.sync(response.headers)
+            if response.status_code in RETRY_STATUSES:
+                return self._retry_later(post, error)
+            rows.update(status=XPost.Status.FAILED, attempts=post.attempts + 1, last_error=error)
+            return XPost.Status.FAILED
+        except requests.RequestException as exc:
+            breaker = get_client().breaker
+            return self._retry_later(
+                post, f"{type(exc).__name__}: {exc}", not_before=breaker.retry_after()
+            )
+        response_ms = _ms(time.perf_counter() - started)
+
+        self.bucket.sync(response.headers)
+        try:
+            post_id = str(response.json()["data"]["id"])
+        except (ValueError, KeyError, TypeError):
+            post_id = ""
+        now = timezone.now()
+        rows.update(
+            status=XPost.Status.POSTED,
+            attempts=post.attempts + 1,
+            posted_at=now,
+            post_id=post_id,
+            response_ms=response_ms,
+            latency_ms=_ms((now - post.queued_at).total_seconds()),
+            last_error="",
+        )
+        return XPost.Status.POSTED
+
+    def run(self, *, once: bool = False, poll_interval: float = 1.0) -> dict:
+        """
+        Post queued articles until interrupted (or, with ``once``, drained).
+
+        Waits for the bucket between posts, so with ``once`` the call returns
+        when no post is due, after waiting out any rate limit on the way.
+
+        Args:
+            once (bool): Return when no post is due instead of polling.
+            poll_interval (float): Seconds to sleep when nothing is due.
+
+        Returns:
+            dict: Count of handled posts per resulting status.
+        """
+        counts = {status: 0 for status in XPost.Status.values}
+        while True:
+            if not self._due().exists():
+                if once:
+                    return counts
+                self._sleep(poll_interval)
+                continue
+            wait = self.bucket.wait_time()
+            if wait > 0:
+                self._sleep(wait)
+                continue
+            post = self.claim_next()
+            if post is not None:
+                counts[self.post_one(post)] += 1
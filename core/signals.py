@@ -1,8 +1,13 @@
 from django.contrib.auth.models import Group
-from django.db.models.signals import post_save
-from django.dispatch import receiver
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import Signal, receiver
 
-from .models import User
+from .detail_cache import invalidate_article_page
+from .feeds import bump_source_versions, fan_out_article, retract_article
+from .homepage import bump_homepage
+from .models import Article, ArticleStatusEvent, RelatedArticle, User
+from .search import get_search_backend
 
 
 ROLE_TO_GROUP = {
@@ -11,6 +16,16 @@ ROLE_TO_GROUP = {
     User.Role.EDITOR: "Editors",
 }
 
+# Sent after an Article is saved with a different status than it was loaded
+# (or created) with. Receivers get ``article``, ``previous_status`` (None for
+# new rows or when the status was not loaded) and ``status``.
+article_status_changed = Signal()
+
+# Sent after a bulk status UPDATE (see ``core.moderation``), which bypasses
+# ``post_save``. Receivers get ``articles`` (already carrying the new status),
+# ``previous_statuses`` ({pk: status}) and ``status``.
+articles_status_changed = Signal()
+
 
 @receiver(post_save, sender=User)
 def sync_user_group(sender, instance: User, created: bool, **kwargs) -> None:
@@ -33,3 +48,153 @@ def sync_user_group(sender, instance: User, created: bool, **kwargs) -> None:
 
     if not instance.groups.filter(name=target_group_name).exists():
         instance.groups.add(target_group)
+
+
+@receiver(post_save, sender=Article)
+def track_article_changes(
+    sender, instance: Article, created: bool, update_fields=None, **kwargs
+) -> None:
+    """
+    Bump feed versions for published changes and announce status transitions.
+
+    Sends ``article_status_changed`` when a save moves an article between
+    states. Works for every write path (editor views, model helpers, admin)
+    because it compares against the status remembered by ``Article.from_db``.
+    Edits of an approved article's text are logged as APPROVED -> APPROVED
+    events, so other processes' search indexes and delta-sync clients
+    re-read it.
+    """
+    previous = None if created else getattr(instance, "_loaded_status", None)
+    instance._loaded_status = instance.status
+
+    if Article.Status.APPROVED in (previous, instance.status):
+        _publish_changes([instance])
+
+    if previous == instance.status:
+        edited = update_fields is None or {"title", "body"} & set(update_fields)
+        if previous == Article.Status.APPROVED and edited:
+            _log_status_events([(instance, previous)], previous)
+        return
+
+    article_status_changed.send(
+        sender=Article,
+        article=instance,
+        previous_status=previous,
+        status=instance.status,
+    )
+
+
+@receiver(post_save, sender=Article)
+def update_search_index(sender, instance: Article, update_fields=None, **kwargs) -> None:
+    """
+    Re-index an article when its title, body or status is saved.
+    """
+    if update_fields is not None and not {"title", "body", "status"} & set(update_fields):
+        return
+    get_search_backend().index([instance])
+
+
+@receiver(post_delete, sender=Article)
+def forget_deleted_article(sender, instance: Article, **kwargs) -> None:
+    """
+    Drop a deleted approved article from the feed, homepage and detail caches.
+    """
+    if instance.status == Article.Status.APPROVED:
+        _publish_changes([instance])
+
+
+@receiver(post_delete, sender=Article)
+def drop_from_search_index(sender, instance: Article, **kwargs) -> None:
+    """
+    Remove a deleted article from the search index.
+    """
+    get_search_backend().remove([instance.pk])
+
+
+def _publish_changes(articles) -> None:
+    """
+    Invalidate feed versions, homepage pages and detail pages for articles
+    entering, leaving or edited in APPROVED, and the detail pages that list
+    them as related articles.
+
+    Homepage and detail pages are cached outside the database, so they are
+    invalidated once the surrounding transaction commits: a page re-rendered
+    before the commit would otherwise be cached under the new stamp with the
+    old rows.
+    """
+    bump_source_versions(*articles)
+    transaction.on_commit(lambda: bump_homepage(*articles))
+    pks = [article.pk for article in articles]
+    linking = list(
+        RelatedArticle.objects.filter(related_id__in=pks).values_list("article_id", flat=True)
+    )
+    transaction.on_commit(lambda: invalidate_article_page(*pks, *linking))
+
+
+def _log_status_events(transitions, status) -> None:
+    """
+    Append ``(article, previous_status)`` transitions to the status event log.
+    """
+    ArticleStatusEvent.objects.bulk_create(
+        ArticleStatusEvent(
+            article=article,
+            publisher_id=article.publisher_id,
+            author_id=article.author_id,
+            previous_status=previous_status or "",
+            status=status,
+        )
+        for article, previous_status in transitions
+    )
+
+
+@receiver(article_status_changed)
+def update_reader_timelines(sender, article: Article, previous_status, status, **kwargs) -> None:
+    """
+    Fan approved articles out to reader timelines and pull retracted ones back.
+    """
+    if status == Article.Status.APPROVED:
+        fan_out_article(article)
+    elif previous_status == Article.Status.APPROVED:
+        retract_article(article)
+
+
+@receiver(article_status_changed)
+def record_status_event(sender, article: Article, previous_status, status, **kwargs) -> None:
+    """
+    Append the transition to the article status event log (delta sync).
+    """
+    _log_status_events([(article, previous_status)], status)
+
+
+@receiver(articles_status_changed)
+def apply_bulk_status_change(sender, articles, previous_statuses, status, **kwargs) -> None:
+    """
+    Run the per-save side effects for a bulk status UPDATE in batches.
+    """
+    published = [
+        article
+        for article in articles
+        if Article.Status.APPROVED in (previous_statuses[article.pk], status)
+    ]
+    if published:
+        _publish_changes(published)
+
+    if status == Article.Status.APPROVED:
+        for article in articles:
+            fan_out_article(article)
+    else:
+        retracted = [
+            article
+            for article in articles
+            if previous_statuses[article.pk] == Article.Status.APPROVED
+        ]
+        if retracted:
+            retract_article(*retracted)
+
+    get_search_backend().set_approved(
+        [article.pk for article in articles], status == Article.Status.APPROVED
+    )
+
+    _log_status_events(
+        [(article, previous_statuses[article.pk]) for article in articles], status
+    )
@@ -4,16 +4,98 @@ Test suite for the News App.
 These tests focus on:
 - Reader-only access control for DRF API endpoints
 - Correct filtering logic for subscription feeds
-- X posting hook is called on approval (mocked requests)
+- Keyset (cursor) pagination of feeds
+- Feed serialization fast path (identical JSON, constant query count)
+- Conditional GET (ETag / Last-Modified) on feeds
+- Per-reader feed page cache and its invalidation
+- Sparse fieldsets and body excerpts on feeds
+- Streaming NDJSON exports with resume tokens
+- Multi-section feed endpoint split from one pass, with match reasons
+- Two-tier article detail cache (invalidation, stampede protection)
+- Paginated homepage with range-invalidated fragment cache
+- Delta sync from the article status event log
+- Async (ASGI) feed and article views match their sync counterparts
+- Bulk editor decisions (one UPDATE per decision, coalesced emails)
+- Review-queue leases (disjoint claims, expiry, compare-and-set decisions)
+- Transactional outbox (queued side effects, worker retries, dead letters)
+- Subscriber fan-out mailer (per-recipient / BCC chunks, batched sends)
+- Notification audience (subscribers ∪ followers, deduped, preference-filtered)
+- Hourly/daily digests (batched reader passes, resumable runs)
+- X posting hook is called on approval (local fake X server)
+- X client pooling, jittered retries and circuit breaker
+- Rate-limited X post queue (token bucket from x-rate-limit headers, fake 429 API)
+- Article search API and admin search over the incremental search index
+- In-process BM25 engine (top-k ranking, mmap snapshots, event-log catch-up)
+- Precomputed related articles on the detail page (vectorized TF-IDF, incremental runs)
+- Materialized reader timelines (fan-out on approval, pull mode, rebuilds)
+- Hot Article queries keep using their indexes (EXPLAIN check)
 """
 
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from datetime import timedelta
+from io import StringIO
 from unittest.mock import patch
 
-from django.test import TestCase
+import requests
+from asgiref.sync import sync_to_async
+from django.core import mail
+from django.core.mail import EmailMessage
+from django.core.mail.backends import locmem
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import AsyncClient, RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
 from rest_framework.test import APIClient
 
-from core.models import Article, Publisher, User
+from core.detail_cache import get_article_page, local_cache
+from core.digests import send_digests
+from core.feed_cache import get_feed_cache
+from core.feeds import keyset_batches
+from core.mailer import send_batched
+from core.management.commands.benchmark_feed import legacy_feed_queryset
+from core.models import (
+    Article,
+    ArticleStatusEvent,
+    DigestCursor,
+    OutboxMessage,
+    Publisher,
+    RelatedArticle,
+    SearchTerm,
+    TimelineEntry,
+    User,
+    XPost,
+)
+from core.moderation import (
+    APPROVE,
+    REJECT,
+    audience_reader_batches,
+    bulk_decide,
+    claim_articles,
+    notification_audience,
+    send_decision_notifications,
+)
+from core.outbox import HANDLERS, enqueue, process_batch, requeue
+from core.related import RelatedModel, term_counts, update_related_articles
+from core.search import reset_search_backend
+from core.search_engine import BM25Index, BM25SearchBackend
+from core.serializers import ArticleSerializer
+from core.services.fake_x import FakeXServer
+from core.services.x_client import (
+    CircuitBreaker,
+    CircuitOpenError,
+    XClient,
+    get_client,
+    reset_client,
+)
+from core.services.x_scheduler import TokenBucket, XPostScheduler, queue_x_posts
 
 
 def make_user(*, username: str, role: str, password: str = "pass1234"):
@@ -28,6 +110,13 @@ def make_user(*, username: str, role: str, password: str = "pass1234"):
     )
 
 
+def drain_outbox():
+    """
+    Deliver every due outbox message in the test thread.
+    """
+    call_command("process_outbox", "--once", "--threads", "1", stdout=StringIO())
+
+
 class APIFeedTests(TestCase):
     """
     Tests for the DRF subscription feed endpoints.
@@ -47,6 +136,7 @@ class APIFeedTests(TestCase):
             None
         """
         self.client = APIClient()
+        get_feed_cache().clear()
 
         self.reader = make_user(
             username="reader1",
@@ -134,7 +224,7 @@ class APIFeedTests(TestCase):
         response = self.client.get(self.url_publishers)
         self.assertEqual(response.status_code, 200)
 
-        data = response.json()
+        data = response.json()["results"]
         titles = {item["title"] for item in data}
         self.assertEqual(titles, {"Approved A"})
 
@@ -178,7 +268,7 @@ class APIFeedTests(TestCase):
         response = self.client.get(self.url_journalists)
         self.assertEqual(response.status_code, 200)
 
-        data = response.json()
+        data = response.json()["results"]
         titles = {item["title"] for item in data}
         self.assertEqual(titles, {"Followed Approved"})
 
@@ -226,7 +316,7 @@ class APIFeedTests(TestCase):
         response = self.client.get(self.url_feed)
         self.assertEqual(response.status_code, 200)
 
-        data = response.json()
+        data = response.json()["results"]
         titles = [item["title"] for item in data]
 
         self.assertEqual(
@@ -238,64 +328,2989 @@ class APIFeedTests(TestCase):
         ids = [item["id"] for item in data]
         self.assertEqual(len(ids), len(set(ids)))
 
+    def test_sections_endpoint_matches_the_three_feeds(self):
+        """
+        The sections endpoint returns the first page of each feed, tags every
+        item with why it matched and links to the next page of each feed.
 
-class XPostingTests(TestCase):
+        Returns:
+            None
+        """
+        other_journalist = make_user(username="journ2", role=User.Role.JOURNALIST)
+        for i in range(3):
+            for publisher, author in (
+                (self.pub_a, self.journalist),
+                (self.pub_a, other_journalist),
+                (self.pub_b, self.journalist),
+                (self.pub_b, other_journalist),
+            ):
+                Article.objects.create(
+                    title=f"{publisher.name} / {author.username} {i}",
+                    body="Body",
+                    publisher=publisher,
+                    author=author,
+                    status=Article.Status.APPROVED,
+                )
+
+        self.client.login(username="reader1", password="pass12345")
+        query = {"page_size": 4, "fields": "id,title,publisher,author"}
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/api/articles/feed/sections/", query)
+        self.assertEqual(response.status_code, 200)
+        # Session, user, two version lookups and one candidate read per source.
+        self.assertLessEqual(len(queries), 6)
+        sections = response.json()
+
+        for section, url in (
+            ("feed", self.url_feed),
+            ("publishers", self.url_publishers),
+            ("journalists", self.url_journalists),
+        ):
+            expected = self.client.get(url, query).json()
+            items = sections[section]["results"]
+            self.assertEqual(
+                [{k: v for k, v in item.items() if k != "reasons"} for item in items],
+                expected["results"],
+            )
+            self.assertIsNotNone(sections[section]["next"])
+            next_page = self.client.get(sections[section]["next"]).json()["results"]
+            self.assertEqual(
+                next_page, self.client.get(expected["next"]).json()["results"]
+            )
+
+        for item in sections["feed"]["results"]:
+            expected_reasons = []
+            if item["publisher"] == self.pub_a.pk:
+                expected_reasons.append("subscribed_publisher")
+            if item["author"] == self.journalist.pk:
+                expected_reasons.append("followed_journalist")
+            self.assertEqual(item["reasons"], expected_reasons)
+
+        self.client.login(username="journ1", password="pass12345")
+        self.assertEqual(
+            self.client.get("/api/articles/feed/sections/").status_code, 403
+        )
+
+    def test_feed_keyset_pagination_has_no_duplicates_or_gaps(self):
+        """
+        Walking next cursors returns every article exactly once, even when a
+        new article is approved mid-walk, and previous links walk back.
+
+        Returns:
+            None
+        """
+        articles = [
+            Article.objects.create(
+                title=f"Article {i}",
+                body="Body",
+                publisher=self.pub_a,
+                author=self.journalist,
+                status=Article.Status.APPROVED,
+            )
+            for i in range(5)
+        ]
+        expected = [
+            a.pk
+            for a in sorted(articles, key=lambda a: (a.created_at, a.pk), reverse=True)
+        ]
+
+        self.client.login(username="reader1", password="pass12345")
+        response = self.client.get(self.url_feed, {"page_size": 2})
+        first_page = response.json()
+        self.assertIsNone(first_page["previous"])
+
+        seen = [item["id"] for item in first_page["results"]]
+        next_url = first_page["next"]
+        Article.objects.create(
+            title="Approved Mid-walk",
+            body="Body",
+            publisher=self.pub_a,
+            author=self.journalist,
+            status=Article.Status.APPROVED,
+        )
+
+        second_page = None
+        while next_url:
+            page = self.client.get(next_url).json()
+            second_page = second_page or page
+            seen.extend(item["id"] for item in page["results"])
+            next_url = page["next"]
+
+        self.assertEqual(seen, expected)
+
+        back = self.client.get(second_page["previous"]).json()
+        self.assertEqual(back["results"], first_page["results"])
+
+    def test_feed_items_match_article_serializer_with_constant_queries(self):
+        """
+        Feed items are byte-identical to ArticleSerializer output, and the
+        query count does not grow with the number of articles on the page.
+
+        Returns:
+            None
+        """
+        def create(count):
+            for i in range(count):
+                Article.objects.create(
+                    title=f"T\u00e9st \"{i}\"",
+                    body="Body <b>\u2014</b>",
+                    publisher=self.pub_a,
+                    author=self.journalist,
+                    status=Article.Status.APPROVED,
+                )
+
+        self.client.login(username="reader1", password="pass12345")
+        create(2)
+        with CaptureQueriesContext(connection) as small:
+            self.client.get(self.url_feed)
+        create(10)
+        with CaptureQueriesContext(connection) as large:
+            response = self.client.get(self.url_feed)
+        self.assertEqual(len(small.captured_queries), len(large.captured_queries))
+
+        for url in (self.url_feed, self.url_publishers, self.url_journalists):
+            items = self.client.get(url).json()["results"]
+            articles = Article.objects.in_bulk([item["id"] for item in items])
+            reference = ArticleSerializer(
+                [articles[item["id"]] for item in items], many=True
+            )
+            self.assertEqual(
+                JSONRenderer().render(items),
+                JSONRenderer().render(reference.data),
+            )
+        self.assertEqual(len(response.json()["results"]), 12)
+
+    def test_sparse_fields_and_excerpt_skip_the_body_column(self):
+        """
+        ?fields= limits item keys and defers body; ?body=excerpt returns a
+        bounded prefix computed in the database.
+
+        Returns:
+            None
+        """
+        Article.objects.create(
+            title="Long",
+            body="x" * 5000,
+            publisher=self.pub_a,
+            author=self.journalist,
+            status=Article.Status.APPROVED,
+        )
+        self.client.login(username="reader1", password="pass12345")
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(
+                self.url_feed, {"fields": "title,id,publisher_name"}
+            )
+        items = response.json()["results"]
+        self.assertEqual(
+            items,
+            [{"id": items[0]["id"], "title": "Long", "publisher_name": "Publisher A"}],
+        )
+        article_sql = [
+            q["sql"] for q in queries.captured_queries if "core_article" in q["sql"]
+        ]
+        self.assertTrue(article_sql)
+        self.assertFalse([sql for sql in article_sql if '"body"' in sql])
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url_publishers, {"body": "excerpt"})
+        item = response.json()["results"][0]
+        self.assertEqual(item["body"], "x" * 280)
+        self.assertEqual(list(item), list(ArticleSerializer.Meta.fields))
+        article_sql = " ".join(q["sql"] for q in queries.captured_queries)
+        self.assertEqual(
+            article_sql.count('"core_article"."body"'),
+            article_sql.count('SUBSTR("core_article"."body"'),
+        )
+
+        response = self.client.get(self.url_feed, {"fields": "title,secret"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_ndjson_export_streams_in_batches_and_resumes(self):
+        """
+        The feed export streams one JSON line per article oldest-first and
+        ?since= resumes after the given line.
+
+        Returns:
+            None
+        """
+        for i in range(5):
+            Article.objects.create(
+                title=f"Export {i}",
+                body="Body",
+                publisher=self.pub_a,
+                author=self.journalist,
+                status=Article.Status.APPROVED,
+            )
+        self.client.login(username="reader1", password="pass12345")
+
+        with self.settings(FEED_EXPORT_CHUNK_SIZE=2):
+            response = self.client.get(
+                "/api/articles/feed/export/", {"fields": "id,title"}
+            )
+            self.assertEqual(response["Content-Type"], "application/x-ndjson")
+            lines = [
+                json.loads(line)
+                for line in b"".join(response.streaming_content).splitlines()
+            ]
+            self.assertEqual(
+                [line["title"] for line in lines], [f"Export {i}" for i in range(5)]
+            )
+            self.assertEqual(set(lines[0]), {"id", "title", "since"})
+
+            response = self.client.get(
+                "/api/articles/feed/export/", {"since": lines[2]["since"]}
+            )
+            resumed = [
+                json.loads(line)
+                for line in b"".join(response.streaming_content).splitlines()
+            ]
+            self.assertEqual(
+                [line["id"] for line in resumed], [line["id"] for line in lines[3:]]
+            )
+
+        response = self.client.get("/api/articles/export/")
+        self.assertEqual(response.status_code, 403)
+
+    def test_feed_rejects_malformed_cursor(self):
+        """
+        A cursor that cannot be decoded returns 404 instead of a 500.
+
+        Returns:
+            None
+        """
+        self.client.login(username="reader1", password="pass12345")
+        response = self.client.get(self.url_feed, {"cursor": "not-a-cursor"})
+        self.assertEqual(response.status_code, 404)
+
+
+class ConditionalFeedTests(TestCase):
     """
-    Tests for the optional X posting integration.
+    Tests for ETag / Last-Modified handling on the reader feeds.
 
-    Uses mocking to ensure that an HTTP request would be attempted when an
-    editor approves an article and X posting is enabled.
+    Ensures that:
+    - unchanged feeds answer conditional requests with 304 without reading articles
+    - approvals and subscription toggles change the validators
     """
 
     def setUp(self):
         """
-        Create baseline objects for X posting tests.
+        Create a reader subscribed to one publisher with one approved article.
 
         Returns:
             None
         """
-        self.editor = make_user(
-            username="editor1",
-            role=User.Role.EDITOR,
-            password="pass12345",
+        self.client = APIClient()
+        get_feed_cache().clear()
+        self.reader = make_user(username="reader1", role=User.Role.READER)
+        self.journalist = make_user(username="journ1", role=User.Role.JOURNALIST)
+        self.editor = make_user(username="editor1", role=User.Role.EDITOR)
+        self.pub_a = Publisher.objects.create(name="Publisher A")
+        self.reader.subscribed_publishers.add(self.pub_a)
+        Article.objects.create(
+            title="First",
+            body="Body",
+            publisher=self.pub_a,
+            author=self.journalist,
+            status=Article.Status.APPROVED,
         )
-        self.journalist = make_user(
-            username="journ1",
-            role=User.Role.JOURNALIST,
-            password="pass12345",
+        self.client.login(username="reader1", password="pass1234")
+
+    def test_unchanged_feed_returns_304_without_article_queries(self):
+        """
+        Matching If-None-Match or If-Modified-Since yields 304 and never
+        queries the Article table.
+
+        Returns:
+            None
+        """
+        for url in (
+            "/api/articles/feed/",
+            "/api/articles/publishers/",
+            "/api/articles/journalists/",
+        ):
+            first = self.client.get(url)
+            self.assertEqual(first.status_code, 200)
+
+            with CaptureQueriesContext(connection) as queries:
+                second = self.client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+            self.assertEqual(second.status_code, 304)
+            self.assertFalse(
+                [q for q in queries.captured_queries if "core_article" in q["sql"]]
+            )
+
+        last_modified = self.client.get("/api/articles/publishers/")["Last-Modified"]
+        response = self.client.get(
+            "/api/articles/publishers/", HTTP_IF_MODIFIED_SINCE=last_modified
         )
-        self.publisher = Publisher.objects.create(name="Publisher A")
+        self.assertEqual(response.status_code, 304)
+
+    def test_approval_and_toggles_change_the_etag(self):
+        """
+        Approving a matching article or toggling a subscription invalidates
+        the previous ETag.
+
+        Returns:
+            None
+        """
+        url = "/api/articles/feed/"
+        etag = self.client.get(url)["ETag"]
+
+        pending = Article.objects.create(
+            title="Second",
+            body="Body",
+            publisher=self.pub_a,
+            author=self.journalist,
+        )
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        self.client.force_login(self.editor)
+        self.client.post(
+            reverse("core:decide_article", args=[pending.pk]),
+            data={"action": "approve", "expected_status": "PENDING"},
+        )
+        self.client.force_login(self.reader)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()["results"]), 2)
+
+        etag = response["ETag"]
+        self.client.post(
+            reverse("core:toggle_journalist_follow", args=[self.journalist.pk])
+        )
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+
+class FeedCacheTests(TestCase):
+    """
+    Tests for the per-reader feed page cache.
+
+    Ensures that:
+    - repeated requests are served from the cache without article queries
+    - approvals, Article.reject() retractions and toggles invalidate pages
+    - hit/miss counters are exposed to staff
+    """
+
+    def setUp(self):
+        """
+        Create a reader subscribed to one publisher with one approved article.
 
+        Returns:
+            None
+        """
+        self.client = APIClient()
+        get_feed_cache().clear()
+        self.reader = make_user(username="reader1", role=User.Role.READER)
+        self.journalist = make_user(username="journ1", role=User.Role.JOURNALIST)
+        self.pub_a = Publisher.objects.create(name="Publisher A")
+        self.reader.subscribed_publishers.add(self.pub_a)
         self.article = Article.objects.create(
-            title="Test Article",
+            title="First",
+            body="Body",
+            publisher=self.pub_a,
+            author=self.journalist,
+            status=Article.Status.APPROVED,
+        )
+        self.client.force_login(self.reader)
+        self.url = "/api/articles/feed/"
+
+    def fetch(self):
+        """
+        GET the combined feed.
+
+        Returns:
+            tuple[str, list[str]]: The X-Feed-Cache header and article titles.
+        """
+        response = self.client.get(self.url)
+        return response["X-Feed-Cache"], [
+            a["title"] for a in response.json()["results"]
+        ]
+
+    def test_repeat_requests_hit_the_cache(self):
+        """
+        The second identical request is a HIT and skips the Article table.
+
+        Returns:
+            None
+        """
+        self.assertEqual(self.fetch(), ("MISS", ["First"]))
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.fetch(), ("HIT", ["First"]))
+        self.assertFalse(
+            [q for q in queries.captured_queries if "core_article" in q["sql"]]
+        )
+
+        self.assertEqual(self.fetch()[0], "HIT")
+        staff = make_user(username="staff", role=User.Role.EDITOR)
+        staff.is_staff = True
+        staff.save()
+        self.client.force_login(staff)
+        stats = self.client.get("/api/feed-cache/stats/").json()
+        self.assertEqual((stats["hits"], stats["misses"]), (2, 1))
+
+    def test_events_invalidate_cached_pages(self):
+        """
+        Approve, reject and subscription toggles each produce a fresh page.
+
+        Returns:
+            None
+        """
+        self.fetch()
+
+        second = Article.objects.create(
+            title="Second",
             body="Body",
+            publisher=self.pub_a,
+            author=self.journalist,
+        )
+        second.approve()
+        self.assertEqual(self.fetch(), ("MISS", ["Second", "First"]))
+
+        self.article.reject("Retracted")
+        self.assertEqual(self.fetch(), ("MISS", ["Second"]))
+
+        self.client.post(
+            reverse("core:toggle_publisher_subscription", args=[self.pub_a.pk])
+        )
+        self.assertEqual(self.fetch(), ("MISS", []))
+
+
+class DetailCacheTests(TestCase):
+    """
+    Tests for the two-tier article detail page cache.
+
+    Ensures that:
+    - repeat views are served from the local or shared tier without queries
+    - status and content changes invalidate the cached page
+    - a page whose version stamp was evicted is rebuilt
+    - concurrent misses render the page only once
+    """
+
+    def setUp(self):
+        """
+        Create one approved article and empty both cache tiers.
+
+        Returns:
+            None
+        """
+        get_feed_cache().clear()
+        local_cache.clear()
+        self.journalist = make_user(username="detail_journ", role=User.Role.JOURNALIST)
+        self.publisher = Publisher.objects.create(name="Detail Publisher")
+        self.article = Article.objects.create(
+            title="Cached title",
+            body="Cached body",
             publisher=self.publisher,
             author=self.journalist,
-            status=Article.Status.PENDING,
+            status=Article.Status.APPROVED,
         )
+        self.url = reverse("core:article_detail", args=[self.article.pk])
 
-    @patch("core.services.x_client.requests.post")
-    def test_post_to_x_attempted_on_approve_when_enabled(self, mock_post):
+    def test_repeat_views_skip_the_database(self):
         """
-        When X posting is enabled, approving an article should attempt a POST.
+        The first view runs one joined query plus the related-articles
+        lookup; later views run none.
+
+        Returns:
+            None
+        """
+        with CaptureQueriesContext(connection) as queries:
+            first = self.client.get(self.url)
+        self.assertEqual(len(queries), 2)
+        self.assertContains(first, "Detail Publisher")
+        self.assertContains(first, "detail_journ")
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.client.get(self.url).content, first.content)
+            local_cache.clear()
+            self.assertEqual(self.client.get(self.url).content, first.content)
+        self.assertEqual(len(queries), 0)
 
-        Args:
-            mock_post: Mocked requests.post function.
+    def test_content_and_status_changes_invalidate(self):
+        """
+        Editing an approved article shows the new content; retracting it 404s.
 
         Returns:
             None
         """
-        mock_post.return_value.raise_for_status.return_value = None
+        self.client.get(self.url)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.article.title = "Edited title"
+            self.article.save()
+        self.assertContains(self.client.get(self.url), "Edited title")
 
-        self.client.login(username="editor1", password="pass12345")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.article.status = Article.Status.PENDING
+            self.article.save()
+        self.assertEqual(self.client.get(self.url).status_code, 404)
 
-        with self.settings(
-            X_POST_ENABLED=True,
-            X_BEARER_TOKEN="fake-token",
-            X_API_URL="https://api.x.com/2/tweets",
-        ):
-            url = reverse("core:decide_article", args=[self.article.pk])
-            response = self.client.post(url, data={"action": "approve"})
+        with self.captureOnCommitCallbacks(execute=True):
+            self.article.approve()
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+
+    def test_evicted_version_stamp_rebuilds_the_page(self):
+        """
+        A page whose version stamp was evicted after an edit is rebuilt
+        rather than served stale.
+
+        Returns:
+            None
+        """
+        self.client.get(self.url)
+        Article.objects.filter(pk=self.article.pk).update(title="Edited title")
+        get_feed_cache().delete(f"article-page-version:{self.article.pk}")
+        local_cache.clear()
+        self.assertContains(self.client.get(self.url), "Edited title")
+
+        with CaptureQueriesContext(connection) as queries:
+            local_cache.clear()
+            self.client.get(self.url)
+        self.assertEqual(len(queries), 0)
+
+    def test_concurrent_misses_render_once(self):
+        """
+        Threads missing together wait for one render instead of each querying.
+
+        Returns:
+            None
+        """
+        renders = []
+        started = threading.Event()
+
+        def slow_render(pk):
+            renders.append(pk)
+            started.set()
+            threading.Event().wait(0.2)
+            return {"title": "T", "html": "<p>T</p>", "version": 0}
+
+        with patch("core.detail_cache._read_through_shared", side_effect=slow_render):
+            results = []
+            threads = [
+                threading.Thread(
+                    target=lambda: results.append(get_article_page(self.article.pk))
+                )
+                for _ in range(5)
+            ]
+            threads[0].start()
+            started.wait(1)
+            for thread in threads[1:]:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(renders, [self.article.pk])
+        self.assertEqual([page["html"] for page in results], ["<p>T</p>"] * 5)
+
+
+class HomepageTests(TestCase):
+    """
+    Tests for the paginated, fragment-cached homepage.
+
+    Ensures that:
+    - the homepage pages with keyset links and joins publishers in
+    - cached pages are served without database queries
+    - approvals and retractions only invalidate the pages they fall on
+    - pages whose stamps were evicted are rebuilt
+    """
+
+    def setUp(self):
+        """
+        Create 45 approved articles, one per day, newest first.
+
+        Returns:
+            None
+        """
+        get_feed_cache().clear()
+        self.journalist = make_user(username="home_journ", role=User.Role.JOURNALIST)
+        self.publisher = Publisher.objects.create(name="Home Publisher")
+        now = timezone.now()
+        self.articles = []
+        for day in range(45):
+            article = Article.objects.create(
+                title=f"Day {day}",
+                body="Body",
+                publisher=self.publisher,
+                author=self.journalist,
+                status=Article.Status.APPROVED,
+            )
+            Article.objects.filter(pk=article.pk).update(
+                created_at=now - timedelta(days=day)
+            )
+            self.articles.append(article)
+        get_feed_cache().clear()
+
+    def titles(self, response):
+        """
+        Return the article titles listed on a homepage response.
+        """
+        return re.findall(r">\s*(Day \d+)\s*<", response.content.decode())
+
+    def next_url(self, response):
+        """
+        Return the "Older" link of a homepage response.
+        """
+        return (
+            re.search(r'href="([^"]+)">Older', response.content.decode())
+            .group(1)
+            .replace("&amp;", "&")
+        )
+
+    def test_pages_use_keyset_links_and_cache_for_anonymous_readers(self):
+        """
+        Pages are 20 rows with one joined query, and repeats skip the database.
+
+        Returns:
+            None
+        """
+        with CaptureQueriesContext(connection) as queries:
+            first = self.client.get("/")
+        self.assertEqual(self.titles(first), [f"Day {i}" for i in range(20)])
+        self.assertEqual(len(queries), 1)
+
+        second = self.client.get(self.next_url(first))
+        third = self.client.get(self.next_url(second))
+        self.assertEqual(self.titles(second), [f"Day {i}" for i in range(20, 40)])
+        self.assertEqual(self.titles(third), [f"Day {i}" for i in range(40, 45)])
+        self.assertNotIn("Older", third.content.decode())
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.client.get("/").content, first.content)
+        self.assertEqual(len(queries), 0)
+
+        self.assertEqual(self.client.get("/?cursor=bogus").status_code, 404)
+
+    def test_changes_invalidate_only_the_affected_pages(self):
+        """
+        A new approval refreshes page 1 only; retracting an older article
+        refreshes the page it was on.
+
+        Returns:
+            None
+        """
+        page_two_url = self.next_url(self.client.get("/"))
+        self.client.get(page_two_url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Article.objects.create(
+                title="Day new",
+                body="Body",
+                publisher=self.publisher,
+                author=self.journalist,
+            ).approve()
+        self.assertIn("Day new", self.client.get("/").content.decode())
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(page_two_url)
+        self.assertEqual(len(queries), 0)
+
+        retracted = Article.objects.get(pk=self.articles[30].pk)
+        retracted.status = Article.Status.PENDING
+        with self.captureOnCommitCallbacks(execute=True):
+            retracted.save()
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get("/")
+        self.assertEqual(len(queries), 0)
+        self.assertNotIn("Day 30", self.titles(self.client.get(page_two_url)))
+
+    def test_evicted_stamps_rebuild_the_page(self):
+        """
+        A page whose bucket stamp was evicted after a change is rebuilt
+        rather than served stale.
+
+        Returns:
+            None
+        """
+        page_two_url = self.next_url(self.client.get("/"))
+        self.client.get(page_two_url)
+        edited = Article.objects.get(pk=self.articles[30].pk)
+        Article.objects.filter(pk=edited.pk).update(title="Day 30 edited")
+        bucket = int(edited.created_at.timestamp()) // 86400
+        get_feed_cache().delete(f"homepage-stamp:{bucket}")
+
+        self.assertIn("Day 30 edited", self.client.get(page_two_url).content.decode())
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(page_two_url)
+        self.assertEqual(len(queries), 0)
+
+
+@override_settings(STATUS_EVENT_SETTLE_SECONDS=0)
+class DeltaSyncTests(TestCase):
+    """
+    Tests for the status event log and the /api/articles/changes/ endpoint.
+
+    Ensures that:
+    - approve(), reject(), decide_article and admin-style edits log transitions
+    - a reader receives only inserts and removals for their own subscriptions
+    - tokens only advance past settled events
+    - subscription changes after the token ask the client to resync
+    """
+
+    def setUp(self):
+        """
+        Create a reader subscribed to one of two publishers.
+
+        Returns:
+            None
+        """
+        self.client = APIClient()
+        self.reader = make_user(username="sync_reader", role=User.Role.READER)
+        self.journalist = make_user(username="sync_journ", role=User.Role.JOURNALIST)
+        self.editor = make_user(username="sync_editor", role=User.Role.EDITOR)
+        self.pub_a = Publisher.objects.create(name="Sync A")
+        self.pub_b = Publisher.objects.create(name="Sync B")
+        self.reader.subscribed_publishers.add(self.pub_a)
+        self.client.force_login(self.reader)
+        self.url = "/api/articles/changes/"
+
+    def make_article(self, title: str, publisher, status=Article.Status.PENDING):
+        """
+        Create an article by the test journalist.
+        """
+        return Article.objects.create(
+            title=title,
+            body="Body",
+            publisher=publisher,
+            author=self.journalist,
+            status=status,
+        )
+
+    def test_model_helpers_and_editor_view_log_transitions(self):
+        """
+        Every write path appends its transition to the event log.
+
+        Returns:
+            None
+        """
+        article = self.make_article("Logged", self.pub_a)
+        article.approve()
+        article.reject("Off topic")
+        other = self.make_article("Decided", self.pub_b)
+        self.client.force_login(self.editor)
+        self.client.post(
+            reverse("core:decide_article", args=[other.pk]),
+            data={"action": "approve", "expected_status": "PENDING"},
+        )
+
+        transitions = list(
+            ArticleStatusEvent.objects.filter(article=article)
+            .order_by("pk")
+            .values_list("previous_status", "status")
+        )
+        self.assertEqual(
+            transitions,
+            [("", "PENDING"), ("PENDING", "APPROVED"), ("APPROVED", "REJECTED")],
+        )
+        self.assertTrue(
+            ArticleStatusEvent.objects.filter(article=other, status="APPROVED").exists()
+        )
+
+    def test_changes_return_inserts_and_removals_for_subscriptions_only(self):
+        """
+        The delta holds only the reader's inserts and removals, then catches up.
+
+        Returns:
+            None
+        """
+        retracted = self.make_article("Retracted", self.pub_a, Article.Status.APPROVED)
+        token = self.client.get(self.url).json()["since"]
+
+        inserted = self.make_article("Inserted", self.pub_a)
+        inserted.approve()
+        self.make_article("Elsewhere", self.pub_b).approve()
+        self.make_article("Still pending", self.pub_a)
+        retracted.status = Article.Status.PENDING
+        retracted.save()
+
+        with CaptureQueriesContext(connection) as queries:
+            body = self.client.get(
+                self.url, {"since": token, "fields": "id,title"}
+            ).json()
+        self.assertEqual(body["inserted"], [{"id": inserted.pk, "title": "Inserted"}])
+        self.assertEqual(body["removed"], [retracted.pk])
+        self.assertFalse(body["has_more"])
+        self.assertFalse(body["resync"])
+        self.assertLessEqual(len(queries), 10)
+
+        caught_up = self.client.get(self.url, {"since": body["since"]}).json()
+        self.assertEqual((caught_up["inserted"], caught_up["removed"]), ([], []))
+
+        self.assertEqual(self.client.get(self.url, {"since": "bogus"}).status_code, 400)
+
+    @override_settings(STATUS_EVENT_SETTLE_SECONDS=60)
+    def test_unsettled_events_are_delivered_on_a_later_sync(self):
+        """
+        An event younger than the settle window is held back, not skipped.
+
+        Returns:
+            None
+        """
+        token = self.client.get(self.url).json()["since"]
+        article = self.make_article("Fresh", self.pub_a)
+        article.approve()
+
+        body = self.client.get(self.url, {"since": token, "fields": "id"}).json()
+        self.assertEqual(body["inserted"], [])
+
+        ArticleStatusEvent.objects.filter(article=article).update(
+            created_at=timezone.now() - timedelta(minutes=2)
+        )
+        body = self.client.get(
+            self.url, {"since": body["since"], "fields": "id"}
+        ).json()
+        self.assertEqual(body["inserted"], [{"id": article.pk}])
+
+    def test_subscription_change_requests_resync(self):
+        """
+        Toggling a subscription after the token was issued sets ``resync``.
+
+        Returns:
+            None
+        """
+        token = self.client.get(self.url).json()["since"]
+        self.client.post(
+            reverse("core:toggle_publisher_subscription", args=[self.pub_b.pk])
+        )
+        self.assertTrue(self.client.get(self.url, {"since": token}).json()["resync"])
+
+
+class AsyncViewTests(TestCase):
+    """
+    Tests for the async (ASGI) feed API and public article views.
+
+    Ensures that:
+    - async feeds return the same body as the sync feeds, page by page
+    - async feeds keep the reader-only restriction and conditional GET
+    - async article pages render without lazy queries
+    """
+
+    def setUp(self):
+        """
+        Create a reader following one publisher and one journalist.
+
+        Returns:
+            None
+        """
+        get_feed_cache().clear()
+        local_cache.clear()
+        self.reader = make_user(username="async_reader", role=User.Role.READER)
+        self.journalist = make_user(username="async_journ", role=User.Role.JOURNALIST)
+        self.publisher = Publisher.objects.create(name="Async Publisher")
+        other_publisher = Publisher.objects.create(name="Other Publisher")
+        self.reader.subscribed_publishers.add(self.publisher)
+        self.reader.subscribed_journalists.add(self.journalist)
+
+        self.approved = [
+            Article.objects.create(
+                title=f"Async {i}",
+                body="Body",
+                author=self.journalist,
+                publisher=self.publisher if i % 2 else other_publisher,
+                status=Article.Status.APPROVED,
+            )
+            for i in range(5)
+        ]
+        Article.objects.create(
+            title="Pending",
+            body="Body",
+            author=self.journalist,
+            publisher=self.publisher,
+            status=Article.Status.PENDING,
+        )
+
+        self.sync_client = APIClient()
+        self.sync_client.force_login(self.reader)
+        self.async_client = AsyncClient()
+
+    async def test_async_feeds_match_sync_feeds(self):
+        await self.async_client.aforce_login(self.reader)
+        for sync_path, async_path, query in (
+            ("/api/articles/feed/", "/async/api/articles/feed/", "?page_size=2"),
+            (
+                "/api/articles/feed/",
+                "/async/api/articles/feed/",
+                "?page_size=2&fields=id,title&body=excerpt",
+            ),
+            ("/api/articles/publishers/", "/async/api/articles/feed/publishers/", ""),
+            ("/api/articles/journalists/", "/async/api/articles/feed/journalists/", ""),
+        ):
+            sync_response = await sync_to_async(self.sync_client.get)(sync_path + query)
+            async_response = await self.async_client.get(async_path + query)
+
+            self.assertEqual(async_response.status_code, 200)
+            self.assertEqual(async_response["Content-Type"], "application/json")
+            sync_body = sync_response.json()
+            async_body = async_response.json()
+            self.assertEqual(async_body["results"], sync_body["results"])
+            self.assertEqual(bool(async_body["next"]), bool(sync_body["next"]))
+            self.assertIn("ETag", async_response)
+
+        first = await self.async_client.get("/async/api/articles/feed/?page_size=2")
+        second = await self.async_client.get(first.json()["next"])
+        ids = [
+            item["id"] for item in first.json()["results"] + second.json()["results"]
+        ]
+        self.assertEqual(ids, [a.pk for a in reversed(self.approved)][:4])
+
+        cached = await self.async_client.get(
+            "/async/api/articles/feed/?page_size=2",
+            headers={"if-none-match": first["ETag"]},
+        )
+        self.assertEqual(cached.status_code, 304)
+
+    async def test_async_feed_is_reader_only(self):
+        response = await self.async_client.get("/async/api/articles/feed/")
+        self.assertEqual(response.status_code, 403)
+
+        await self.async_client.aforce_login(self.journalist)
+        response = await self.async_client.get("/async/api/articles/feed/")
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(
+            response.json()["detail"], "Only readers can access this endpoint."
+        )
+
+    async def test_async_article_pages_render(self):
+        response = await self.async_client.get("/async/")
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Async 4")
+        self.assertNotContains(response, "Pending")
+
+        response = await self.async_client.get(
+            f"/async/articles/{self.approved[1].pk}/"
+        )
+        self.assertContains(response, "Async Publisher")
+        self.assertContains(response, "async_journ")
+
+        pending = await Article.objects.aget(title="Pending")
+        response = await self.async_client.get(f"/async/articles/{pending.pk}/")
+        self.assertEqual(response.status_code, 404)
+
+
+class BulkDecisionTests(TestCase):
+    """
+    Tests for bulk approve/reject in the editor queue and the admin.
+
+    Ensures that:
+    - one UPDATE applies the decision and the usual side effects still run
+    - notifications are coalesced per author and per subscriber
+    - only editors can bulk-decide; staff can use the admin actions
+    """
+
+    def setUp(self):
+        """
+        Create three pending articles by two journalists and one subscriber.
+
+        Returns:
+            None
+        """
+        get_feed_cache().clear()
+        self.editor = make_user(username="bulk_editor", role=User.Role.EDITOR)
+        self.reader = make_user(username="bulk_reader", role=User.Role.READER)
+        self.journalists = [
+            make_user(username=f"bulk_journ{i}", role=User.Role.JOURNALIST)
+            for i in range(2)
+        ]
+        self.publisher = Publisher.objects.create(name="Bulk Publisher")
+        self.reader.subscribed_publishers.add(self.publisher)
+        self.articles = [
+            Article.objects.create(
+                title=f"Bulk {i}",
+                body="Body",
+                publisher=self.publisher,
+                author=self.journalists[i % 2],
+            )
+            for i in range(3)
+        ]
+        self.url = reverse("core:bulk_decide_articles")
+
+    def test_bulk_approve_uses_one_update_and_coalesced_emails(self):
+        """
+        Approving three articles runs one article UPDATE, fills timelines, logs
+        events and sends one email per author plus one digest per subscriber.
+
+        Returns:
+            None
+        """
+        self.client.force_login(self.editor)
+        ids = [article.pk for article in self.articles]
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(
+                self.url, {"action": "approve", "article_ids": ids}
+            )
+        updates = [
+            q for q in queries.captured_queries
+            if re.match(r"UPDATE [`\"]core_article[`\"] SET [`\"]status", q["sql"])
+        ]
+        self.assertEqual(len(updates), 1)
+        self.assertRedirects(response, reverse("core:editor_queue"))
+        self.assertEqual(
+            Article.objects.filter(pk__in=ids, status=Article.Status.APPROVED).count(),
+            3,
+        )
+        self.assertEqual(TimelineEntry.objects.filter(reader=self.reader).count(), 3)
+        self.assertEqual(
+            ArticleStatusEvent.objects.filter(
+                article__in=ids, status="APPROVED"
+            ).count(),
+            3,
+        )
+
+        self.assertEqual(len(mail.outbox), 0)
+        drain_outbox()
+        recipients = sorted(message.to[0] for message in mail.outbox)
+        self.assertEqual(
+            recipients,
+            sorted([j.email for j in self.journalists] + [self.reader.email]),
+        )
+        digest = next(m for m in mail.outbox if m.to == [self.reader.email])
+        for article in self.articles:
+            self.assertIn(article.title, digest.body)
+
+        feed = APIClient()
+        feed.force_login(self.reader)
+        self.assertEqual(len(feed.get("/api/articles/feed/").json()["results"]), 3)
+
+    def test_bulk_reject_and_admin_action(self):
+        """
+        Bulk rejection stores the reason and mails each author once; the admin
+        action approves through the same path.
+
+        Returns:
+            None
+        """
+        self.client.force_login(self.editor)
+        self.client.post(
+            self.url,
+            {
+                "action": "reject",
+                "reason": "Needs sources",
+                "article_ids": [a.pk for a in self.articles[:2]],
+            },
+        )
+        drain_outbox()
+        self.assertEqual(
+            set(Article.objects.filter(status=Article.Status.REJECTED).values_list(
+                "decision_reason", flat=True
+            )),
+            {"Needs sources"},
+        )
+        self.assertEqual(len(mail.outbox), 2)
+        self.assertIn("Needs sources", mail.outbox[0].body)
+
+        admin_user = User.objects.create_superuser(
+            username="bulk_admin", email="bulk_admin@example.com", password="pass1234"
+        )
+        self.client.force_login(admin_user)
+        self.client.post(
+            reverse("admin:core_article_changelist"),
+            {"action": "approve_selected", "_selected_action": [self.articles[2].pk]},
+        )
+        self.articles[2].refresh_from_db()
+        self.assertEqual(self.articles[2].status, Article.Status.APPROVED)
+
+    def test_bulk_decide_requires_editor(self):
+        """
+        Non-editors get 403 and nothing changes.
+
+        Returns:
+            None
+        """
+        self.client.force_login(self.reader)
+        response = self.client.post(
+            self.url, {"action": "approve", "article_ids": [self.articles[0].pk]}
+        )
+        self.assertEqual(response.status_code, 403)
+        self.assertFalse(
+            Article.objects.filter(status=Article.Status.APPROVED).exists()
+        )
+
+
+class ReviewClaimTests(TestCase):
+    """
+    Tests for review-queue leases and compare-and-set decisions.
+
+    Ensures that:
+    - concurrent editors claim disjoint batches; expired leases are re-claimed
+    - a decision on an article leased to another editor changes nothing
+    - a decision based on a stale status is reported instead of overwriting
+    - a decision without the status it was based on is refused; a repeated
+      one queues no notifications
+    """
+
+    def setUp(self):
+        """
+        Create two editors and five pending articles.
+
+        Returns:
+            None
+        """
+        get_feed_cache().clear()
+        self.editors = [
+            make_user(username=f"claim_editor{i}", role=User.Role.EDITOR)
+            for i in range(2)
+        ]
+        self.journalist = make_user(username="claim_journ", role=User.Role.JOURNALIST)
+        self.publisher = Publisher.objects.create(name="Claim Publisher")
+        self.articles = [
+            Article.objects.create(
+                title=f"Claim {i}",
+                body="Body",
+                publisher=self.publisher,
+                author=self.journalist,
+            )
+            for i in range(5)
+        ]
+
+    def test_editors_claim_disjoint_batches_and_leases_expire(self):
+        """
+        Claims are oldest first, never overlap, renew on repeat and lapse.
+
+        Returns:
+            None
+        """
+        first, second = self.editors
+        with CaptureQueriesContext(connection) as queries:
+            claimed = claim_articles(first, limit=3)
+        self.assertEqual([a.pk for a in claimed], [a.pk for a in self.articles[:3]])
+        if connection.features.has_select_for_update_skip_locked:
+            self.assertTrue(
+                any("SKIP LOCKED" in q["sql"] for q in queries.captured_queries)
+            )
+
+        self.assertEqual(
+            [a.pk for a in claim_articles(second, limit=3)],
+            [a.pk for a in self.articles[3:]],
+        )
+        self.assertEqual(len(claim_articles(first, limit=3)), 3)
+
+        Article.objects.filter(claimed_by=first).update(
+            claim_expires_at=timezone.now() - timedelta(seconds=1)
+        )
+        self.assertEqual(len(claim_articles(second, limit=5)), 5)
+
+        self.client.force_login(first)
+        response = self.client.get(reverse("core:editor_queue"))
+        self.assertEqual(list(response.context["articles"]), [])
+        self.assertContains(response, "being reviewed by other editors")
+
+        self.client.force_login(second)
+        self.client.post(reverse("core:release_article_claims"))
+        self.assertFalse(Article.objects.filter(claimed_by__isnull=False).exists())
+
+    def test_decisions_are_compare_and_set(self):
+        """
+        Leased and already-decided articles are not overwritten.
+
+        Returns:
+            None
+        """
+        first, second = self.editors
+        article = self.articles[0]
+        claim_articles(first, limit=1)
+        url = reverse("core:decide_article", args=[article.pk])
+
+        self.client.force_login(second)
+        response = self.client.post(
+            url, {"action": "approve", "expected_status": "PENDING"}
+        )
+        self.assertRedirects(response, reverse("core:editor_queue"))
+        article.refresh_from_db()
+        self.assertEqual(article.status, Article.Status.PENDING)
+        self.assertEqual(len(mail.outbox), 0)
+
+        self.client.force_login(first)
+        self.client.post(url, {"action": "approve", "expected_status": "PENDING"})
+        article.refresh_from_db()
+        self.assertEqual(article.status, Article.Status.APPROVED)
+        self.assertIsNone(article.claimed_by)
+        self.assertTrue(
+            ArticleStatusEvent.objects.filter(
+                article=article, status="APPROVED"
+            ).exists()
+        )
+
+        # A second editor acting on the same stale PENDING page loses the race.
+        self.client.force_login(second)
+        response = self.client.post(
+            url, {"action": "reject", "expected_status": "PENDING"}, follow=True
+        )
+        self.assertContains(response, "already decided or claimed by another editor")
+        article.refresh_from_db()
+        self.assertEqual(article.status, Article.Status.APPROVED)
+
+    def test_decisions_need_the_status_they_were_based_on(self):
+        """
+        A POST without a valid expected_status is refused, and re-approving an
+        approved article sends no second round of notifications.
+
+        Returns:
+            None
+        """
+        article = self.articles[0]
+        url = reverse("core:decide_article", args=[article.pk])
+        self.client.force_login(self.editors[0])
+
+        for data in (
+            {"action": "approve"},
+            {"action": "approve", "expected_status": "LIVE"},
+        ):
+            response = self.client.post(url, data, follow=True)
+            self.assertContains(response, "Missing article status")
+        article.refresh_from_db()
+        self.assertEqual(article.status, Article.Status.PENDING)
+        self.assertFalse(OutboxMessage.objects.exists())
+
+        self.client.post(url, {"action": "approve", "expected_status": "PENDING"})
+        self.client.post(url, {"action": "approve", "expected_status": "APPROVED"})
+        self.assertEqual(OutboxMessage.objects.count(), 1)
+
+
+DELIVERED = []
+
+
+def record_delivery(payload):
+    """
+    Outbox handler used by the tests; records the payload and thread.
+    """
+    DELIVERED.append((payload["n"], threading.current_thread().name))
+
+
+def fail_delivery(payload):
+    """
+    Outbox handler used by the tests; records the call, then fails.
+    """
+    DELIVERED.append(payload)
+    raise requests.ConnectionError("X is down")
+
+
+class OutboxTests(TestCase):
+    """
+    Tests for the transactional outbox and the ``process_outbox`` worker.
+
+    Ensures that:
+    - decisions only write outbox rows; the worker sends the emails
+    - notifications are split per reader batch, so a retry resends one batch
+    - the split is queued in the transaction that completes its message
+    - reader batches skip articles retracted before they are delivered
+    - failed deliveries back off, then dead-letter, and can be requeued
+    - the worker runs handlers on a thread pool
+    """
+
+    def setUp(self):
+        """
+        Create an editor, a journalist, a subscriber and a pending article.
+
+        Returns:
+            None
+        """
+        get_feed_cache().clear()
+        self.editor = make_user(username="outbox_editor", role=User.Role.EDITOR)
+        self.journalist = make_user(username="outbox_journ", role=User.Role.JOURNALIST)
+        self.reader = make_user(username="outbox_reader", role=User.Role.READER)
+        self.publisher = Publisher.objects.create(name="Outbox Publisher")
+        self.reader.subscribed_publishers.add(self.publisher)
+        self.article = Article.objects.create(
+            title="Outbox Article",
+            body="Body",
+            publisher=self.publisher,
+            author=self.journalist,
+        )
+
+    def test_decision_queues_side_effects_for_the_worker(self):
+        """
+        Approval writes an outbox row, an X post row and no email; the worker
+        delivers the emails.
+
+        Returns:
+            None
+        """
+        self.client.force_login(self.editor)
+        with self.settings(X_POST_ENABLED=True):
+            self.client.post(
+                reverse("core:decide_article", args=[self.article.pk]),
+                {"action": "approve", "expected_status": "PENDING"},
+            )
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(
+            list(OutboxMessage.objects.values_list("topic", flat=True)),
+            ["decision_notifications"],
+        )
+        self.assertEqual(
+            XPost.objects.get(article=self.article).url,
+            f"http://testserver/articles/{self.article.pk}/",
+        )
+
+        drain_outbox()
+        self.assertEqual(
+            sorted(m.subject for m in mail.outbox),
+            [
+                "Article approved: Outbox Article",
+                "New article from Outbox Publisher: Outbox Article",
+            ],
+        )
+        self.assertFalse(
+            OutboxMessage.objects.exclude(status=OutboxMessage.Status.DONE).exists()
+        )
+
+        # A decision that loses its compare-and-set queues nothing.
+        queued = OutboxMessage.objects.count()
+        self.client.post(
+            reverse("core:decide_article", args=[self.article.pk]),
+            {"action": "reject", "expected_status": "PENDING"},
+        )
+        self.assertEqual(OutboxMessage.objects.count(), queued)
+
+    @override_settings(OUTBOX_NOTIFICATION_BATCH_SIZE=2)
+    def test_notifications_are_split_into_reader_batches(self):
+        """
+        The worker turns a decision into an authors part and reader batches,
+        reports what they sent, and re-running one batch mails only its own
+        readers again.
+
+        Returns:
+            None
+        """
+        readers = [self.reader] + [
+            make_user(username=f"outbox_reader{i}", role=User.Role.READER)
+            for i in range(2)
+        ]
+        self.publisher.subscribers.add(*readers)
+        self.client.force_login(self.editor)
+        self.client.post(
+            reverse("core:decide_article", args=[self.article.pk]),
+            {"action": "approve", "expected_status": "PENDING"},
+        )
+
+        self.assertEqual(process_batch()["DONE"], 1)
+        self.assertEqual(len(mail.outbox), 0)
+        parts = list(OutboxMessage.objects.filter(status=OutboxMessage.Status.PENDING))
+        self.assertEqual(
+            [part.payload.get("reader_ids") for part in parts],
+            [None, [readers[0].pk, readers[1].pk], [readers[2].pk]],
+        )
+
+        out = StringIO()
+        call_command("process_outbox", "--once", "--threads", "1", stdout=out)
+        self.assertEqual(
+            sorted(to for m in mail.outbox for to in m.to),
+            sorted([self.journalist.email] + [reader.email for reader in readers]),
+        )
+        self.assertIn(
+            "Sent 4 email(s) to 4 recipient(s) in 3 batch(es)", out.getvalue()
+        )
+
+        mail.outbox = []
+        OutboxMessage.objects.filter(pk=parts[2].pk).update(
+            status=OutboxMessage.Status.PENDING, available_at=timezone.now()
+        )
+        drain_outbox()
+        self.assertEqual([m.to for m in mail.outbox], [[readers[2].email]])
+
+    def test_split_commits_with_its_message(self):
+        """
+        The decision's message is marked DONE in the transaction that queues
+        its parts, so a worker dying before it records the run does not
+        queue the parts again.
+
+        Returns:
+            None
+        """
+        self.client.force_login(self.editor)
+        self.client.post(
+            reverse("core:decide_article", args=[self.article.pk]),
+            {"action": "approve", "expected_status": "PENDING"},
+        )
+        message = OutboxMessage.objects.get()
+
+        with patch("core.outbox._record", side_effect=RuntimeError("worker died")):
+            with self.assertRaises(RuntimeError):
+                process_batch()
+        message.refresh_from_db()
+        self.assertEqual(message.status, OutboxMessage.Status.DONE)
+        self.assertEqual(OutboxMessage.objects.exclude(pk=message.pk).count(), 2)
+
+        process_batch()
+        self.assertEqual(OutboxMessage.objects.count(), 3)
+
+    def test_reader_parts_skip_retracted_articles(self):
+        """
+        A reader batch delivered after its article was retracted sends nothing.
+
+        Returns:
+            None
+        """
+        self.client.force_login(self.editor)
+        self.client.post(
+            reverse("core:decide_article", args=[self.article.pk]),
+            {"action": "approve", "expected_status": "PENDING"},
+        )
+        process_batch()
+        Article.objects.filter(pk=self.article.pk).update(
+            status=Article.Status.REJECTED
+        )
+
+        drain_outbox()
+        self.assertEqual([m.to for m in mail.outbox], [[self.journalist.email]])
+        self.assertEqual(
+            OutboxMessage.objects.exclude(status=OutboxMessage.Status.DONE).count(), 0
+        )
+
+    def test_failures_back_off_then_dead_letter(self):
+        """
+        A failing delivery is retried later and dead-lettered at the attempt cap.
+
+        Returns:
+            None
+        """
+        DELIVERED.clear()
+        with patch.dict(HANDLERS, {"test": "core.tests.fail_delivery"}), self.settings(
+            OUTBOX_MAX_ATTEMPTS=2,
+            OUTBOX_BACKOFF_BASE=60,
+        ):
+            message = enqueue("test", {"n": 1})
+            self.assertEqual(process_batch()["PENDING"], 1)
+            message.refresh_from_db()
+            self.assertEqual(message.attempts, 1)
+            self.assertIn("X is down", message.last_error)
+            self.assertGreater(
+                message.available_at, timezone.now() + timedelta(seconds=29)
+            )
+
+            # Not due yet: nothing is claimed.
+            self.assertEqual(sum(process_batch().values()), 0)
+
+            OutboxMessage.objects.update(available_at=timezone.now())
+            self.assertEqual(process_batch()["DEAD"], 1)
+
+        message.refresh_from_db()
+        self.assertEqual(message.status, OutboxMessage.Status.DEAD)
+        self.assertEqual(len(DELIVERED), 2)
+
+        self.assertEqual(requeue(OutboxMessage.objects.all()), 1)
+        message.refresh_from_db()
+        self.assertEqual(
+            (message.status, message.attempts), (OutboxMessage.Status.PENDING, 0)
+        )
+
+    def test_worker_runs_handlers_on_a_thread_pool(self):
+        """
+        With several threads every message is delivered exactly once.
+
+        Returns:
+            None
+        """
+        DELIVERED.clear()
+        with patch.dict(HANDLERS, {"test": "core.tests.record_delivery"}):
+            for n in range(6):
+                enqueue("test", {"n": n})
+            counts = process_batch(limit=10, threads=3)
+
+        self.assertEqual(counts["DONE"], 6)
+        self.assertEqual(sorted(n for n, _ in DELIVERED), list(range(6)))
+        self.assertNotIn(
+            threading.current_thread().name, {name for _, name in DELIVERED}
+        )
+
+
+class CountingBackend(locmem.EmailBackend):
+    """
+    Locmem email backend that counts connection opens and send calls.
+    """
+
+    opens = 0
+    sends = 0
+
+    def open(self):
+        CountingBackend.opens += 1
+        return super().open()
+
+    def send_messages(self, messages):
+        CountingBackend.sends += 1
+        return super().send_messages(messages)
+
+
+@override_settings(EMAIL_BACKEND="core.tests.CountingBackend", MAIL_SEND_BATCH_SIZE=2)
+class FanOutMailerTests(TestCase):
+    """
+    Tests for the subscriber fan-out mailer.
+
+    Ensures that:
+    - subscribers never share a visible To: header
+    - messages go out over one connection in bounded batches
+    - BCC mode chunks identical notifications
+    - recipients are only counted for batches the backend sent in full
+    """
+
+    def setUp(self):
+        """
+        Create an approved article whose publisher has five subscribers.
+
+        Returns:
+            None
+        """
+        CountingBackend.opens = CountingBackend.sends = 0
+        self.journalist = make_user(username="fanout_journ", role=User.Role.JOURNALIST)
+        self.publisher = Publisher.objects.create(name="Fan-out Publisher")
+        self.readers = [
+            make_user(username=f"fanout_reader{i}", role=User.Role.READER)
+            for i in range(5)
+        ]
+        self.publisher.subscribers.add(*self.readers)
+        self.journalist.subscribed_publishers.add(self.publisher)
+        self.article = Article.objects.select_related("publisher", "author").get(
+            pk=Article.objects.create(
+                title="Fan-out",
+                body="Body",
+                publisher=self.publisher,
+                author=self.journalist,
+            ).pk
+        )
+
+    def test_one_message_per_recipient_in_batches(self):
+        """
+        Each reader gets a private message; sends share one connection.
+
+        Returns:
+            None
+        """
+        stats = send_decision_notifications([self.article], APPROVE)
+
+        self.assertEqual(stats["messages"], 6)
+        self.assertEqual((stats["batches"], CountingBackend.sends), (3, 3))
+        self.assertEqual(CountingBackend.opens, 1)
+        self.assertTrue(all(len(message.to) == 1 for message in mail.outbox))
+        self.assertEqual(
+            sorted(m.to[0] for m in mail.outbox if m.subject.startswith("New article")),
+            sorted(reader.email for reader in self.readers),
+        )
+
+    @override_settings(MAIL_FANOUT_MODE="bcc", MAIL_BCC_CHUNK_SIZE=2)
+    def test_bcc_mode_chunks_recipients(self):
+        """
+        Identical notifications are BCC'd in chunks with no visible recipients.
+
+        Returns:
+            None
+        """
+        stats = send_decision_notifications([self.article], APPROVE)
+
+        digests = [m for m in mail.outbox if m.subject.startswith("New article")]
+        self.assertEqual([len(m.bcc) for m in digests], [2, 2, 1])
+        self.assertTrue(all(m.to == [] for m in digests))
+        self.assertEqual(
+            sorted(address for m in digests for address in m.bcc),
+            sorted(reader.email for reader in self.readers),
+        )
+        self.assertEqual(stats["recipients"], 6)
+
+    def test_partially_sent_batches_count_no_recipients(self):
+        """
+        A batch the backend only partly sent adds its messages, not its
+        recipients, since the backend does not say which messages failed.
+
+        Returns:
+            None
+        """
+
+        class PartialConnection:
+            def send_messages(self, messages):
+                return 1
+
+        messages = [EmailMessage("S", "B", to=[f"r{i}@example.com"]) for i in range(3)]
+        stats = send_batched(messages, connection=PartialConnection())
+
+        self.assertEqual((stats["messages"], stats["batches"]), (2, 2))
+        self.assertEqual(stats["recipients"], 1)
+
+
+class NotificationAudienceTests(TestCase):
+    """
+    Tests for the unified approval notification audience.
+
+    Ensures that:
+    - publisher subscribers and author followers are notified once each
+    - the author and readers who opted out are excluded in SQL
+    - the audience is read in bounded keyset batches of reader ids
+    - readers can change their preferences on the subscriptions page
+    """
+
+    def setUp(self):
+        """
+        Create one article and readers reaching it through either channel.
+
+        Returns:
+            None
+        """
+        self.journalist = make_user(username="aud_journ", role=User.Role.JOURNALIST)
+        self.publisher = Publisher.objects.create(name="Audience Publisher")
+        self.both = make_user(username="aud_both", role=User.Role.READER)
+        self.follower = make_user(username="aud_follower", role=User.Role.READER)
+        self.muted = make_user(username="aud_muted", role=User.Role.READER)
+        self.muted.notify_subscribed_publishers = False
+        self.muted.save()
+        self.fallback = make_user(username="aud_fallback", role=User.Role.READER)
+        self.fallback.notify_followed_journalists = False
+        self.fallback.save()
+
+        self.publisher.subscribers.add(
+            self.both, self.muted, self.fallback, self.journalist
+        )
+        self.journalist.followers.add(self.both, self.follower, self.fallback)
+        self.article = Article.objects.select_related("publisher", "author").get(
+            pk=Article.objects.create(
+                title="Audience",
+                body="Body",
+                publisher=self.publisher,
+                author=self.journalist,
+            ).pk
+        )
+
+    def test_union_is_deduplicated_and_filtered_in_one_query(self):
+        """
+        Each opted-in reader appears once; the author and opt-outs do not.
+
+        Returns:
+            None
+        """
+        with self.assertNumQueries(1):
+            rows = list(notification_audience([self.article.pk]))
+
+        self.assertEqual(
+            rows,
+            sorted(
+                (user.pk, user.email, self.article.pk)
+                for user in (self.both, self.follower, self.fallback)
+            ),
+        )
+
+        audience = sorted(user.pk for user in (self.both, self.follower, self.fallback))
+        with self.assertNumQueries(3):
+            batches = list(audience_reader_batches([self.article.pk], 2))
+        self.assertEqual(batches, [audience[:2], audience[2:]])
+
+        send_decision_notifications([self.article], APPROVE)
+        readers = sorted(
+            m.to[0] for m in mail.outbox if m.subject.startswith("New article")
+        )
+        self.assertEqual(
+            readers, sorted(u.email for u in (self.both, self.follower, self.fallback))
+        )
+
+    def test_preferences_are_saved_from_the_subscriptions_page(self):
+        """
+        Unticking both boxes removes the reader from the audience.
+
+        Returns:
+            None
+        """
+        self.client.force_login(self.both)
+        response = self.client.post(
+            reverse("core:my_subscriptions"), {"notification_delivery": "IMMEDIATE"}
+        )
+        self.assertRedirects(response, reverse("core:my_subscriptions"))
+
+        self.both.refresh_from_db()
+        self.assertFalse(self.both.notify_subscribed_publishers)
+        self.assertFalse(self.both.notify_followed_journalists)
+        self.assertNotIn(
+            self.both.pk, [row[0] for row in notification_audience([self.article.pk])]
+        )
+
+
+@override_settings(STATUS_EVENT_SETTLE_SECONDS=0)
+class DigestTests(TestCase):
+    """
+    Tests for hourly/daily notification digests.
+
+    Ensures that:
+    - digest readers are skipped by per-approval emails
+    - one digest per reader lists the period's still-approved articles
+    - runs advance the cursor and resume after the last sent batch
+    - approvals younger than the settle window wait for the next run
+    """
+
+    def setUp(self):
+        """
+        Create hourly readers, an immediate reader and three approvals.
+
+        Returns:
+            None
+        """
+        self.journalist = make_user(username="digest_journ", role=User.Role.JOURNALIST)
+        self.publisher = Publisher.objects.create(name="Digest Publisher")
+        self.hourly = [
+            make_user(username=f"digest_hourly{i}", role=User.Role.READER)
+            for i in range(3)
+        ]
+        User.objects.filter(pk__in=[u.pk for u in self.hourly]).update(
+            notification_delivery=User.Delivery.HOURLY
+        )
+        self.immediate = make_user(username="digest_now", role=User.Role.READER)
+        self.publisher.subscribers.add(*self.hourly, self.immediate)
+        self.journalist.followers.add(self.hourly[0])
+
+        self.articles = []
+        for i in range(3):
+            article = Article.objects.create(
+                title=f"Digest {i}",
+                body="Body",
+                publisher=self.publisher,
+                author=self.journalist,
+            )
+            article.approve()
+            self.articles.append(
+                Article.objects.select_related("publisher", "author").get(pk=article.pk)
+            )
+        self.articles[2].reject("Retracted")
+
+    def test_digest_readers_get_one_message_per_period(self):
+        """
+        Immediate mail skips digest readers; the digest lists both live articles.
+
+        Returns:
+            None
+        """
+        send_decision_notifications(self.articles[:2], APPROVE)
+        self.assertEqual(
+            [m.to for m in mail.outbox if m.subject.startswith("2 new")],
+            [[self.immediate.email]],
+        )
+        mail.outbox = []
+
+        stats = send_digests(User.Delivery.HOURLY, batch_size=2)
+        self.assertEqual((stats["articles"], stats["messages"]), (2, 3))
+        self.assertEqual(
+            sorted(m.to[0] for m in mail.outbox), sorted(u.email for u in self.hourly)
+        )
+        for message in mail.outbox:
+            self.assertIn("Your hourly digest: 2 new article(s)", message.subject)
+            self.assertIn("Digest 1", message.body)
+            self.assertNotIn("Digest 2", message.body)
+
+        mail.outbox = []
+        self.assertEqual(send_digests(User.Delivery.HOURLY)["messages"], 0)
+        self.assertEqual(send_digests(User.Delivery.DAILY)["messages"], 0)
+
+    def test_interrupted_run_resumes_after_the_last_batch(self):
+        """
+        A run left pending skips the readers it had already mailed.
+
+        Returns:
+            None
+        """
+        DigestCursor.objects.create(
+            delivery=User.Delivery.HOURLY,
+            pending_event_id=ArticleStatusEvent.objects.order_by("-pk").first().pk,
+            last_reader_id=self.hourly[0].pk,
+        )
+        call_command("send_digests", "--delivery", "hourly", stdout=StringIO())
+
+        self.assertEqual(
+            sorted(m.to[0] for m in mail.outbox),
+            sorted(u.email for u in self.hourly[1:]),
+        )
+        cursor = DigestCursor.objects.get(delivery=User.Delivery.HOURLY)
+        self.assertIsNone(cursor.pending_event_id)
+        self.assertIsNotNone(cursor.completed_at)
+
+    @override_settings(STATUS_EVENT_SETTLE_SECONDS=60)
+    def test_unsettled_approvals_wait_for_the_next_run(self):
+        """
+        A run stops before events younger than the settle window.
+
+        Returns:
+            None
+        """
+        self.assertEqual(send_digests(User.Delivery.HOURLY)["articles"], 0)
+
+        ArticleStatusEvent.objects.update(
+            created_at=timezone.now() - timedelta(minutes=2)
+        )
+        stats = send_digests(User.Delivery.HOURLY)
+        self.assertEqual((stats["articles"], stats["messages"]), (2, 3))
+
+
+class XPostingTests(TestCase):
+    """
+    Tests for the optional X posting integration.
+
+    Uses a local stub server to ensure that an HTTP request is made when an
+    editor approves an article and X posting is enabled.
+    """
+
+    def setUp(self):
+        """
+        Create baseline objects for X posting tests.
+
+        Returns:
+            None
+        """
+        self.editor = make_user(
+            username="editor1",
+            role=User.Role.EDITOR,
+            password="pass12345",
+        )
+        self.journalist = make_user(
+            username="journ1",
+            role=User.Role.JOURNALIST,
+            password="pass12345",
+        )
+        self.publisher = Publisher.objects.create(name="Publisher A")
+
+        self.article = Article.objects.create(
+            title="Test Article",
+            body="Body",
+            publisher=self.publisher,
+            author=self.journalist,
+            status=Article.Status.PENDING,
+        )
+
+    def test_post_to_x_attempted_on_approve_when_enabled(self):
+        """
+        When X posting is enabled, approving an article should attempt a POST.
+
+        The ``post_to_x`` scheduler posts to a local fake of the X API.
+
+        Returns:
+            None
+        """
+        self.client.login(username="editor1", password="pass12345")
+        self.addCleanup(reset_client)
+
+        with FakeXServer() as stub, self.settings(
+            X_POST_ENABLED=True,
+            X_BEARER_TOKEN="fake-token",
+            X_API_URL=stub.url,
+        ):
+            url = reverse("core:decide_article", args=[self.article.pk])
+            response = self.client.post(
+                url, data={"action": "approve", "expected_status": "PENDING"}
+            )
+            self.assertEqual(response.status_code, 302)
+            self.assertEqual(stub.received, [])
+            call_command("post_to_x", "--once", stdout=StringIO())
+
+            self.assertEqual(len(stub.received), 1)
+            self.assertEqual(stub.received[0]["authorization"], "Bearer fake-token")
+            self.assertTrue(stub.received[0]["json"]["text"].startswith("Test Article"))
+
+
+class XClientTests(TestCase):
+    """
+    Tests for the X client against a local stub HTTP server.
+
+    Ensures that:
+    - posts reuse one pooled keep-alive connection
+    - 5xx responses are retried in place; 4xx responses are not
+    - the circuit breaker fails fast while X is down, then recovers
+    - a trial call failing with any error re-opens the circuit
+    """
+
+    def setUp(self):
+        """
+        Start a stub X API and drop any shared client state.
+
+        Returns:
+            None
+        """
+        self.stub = FakeXServer().start()
+        self.addCleanup(self.stub.stop)
+        reset_client()
+        self.addCleanup(reset_client)
+
+    def make_client(self, **options) -> XClient:
+        """
+        Build a client for the stub without retry sleeps.
+
+        Returns:
+            XClient: The client.
+        """
+        client = XClient(self.stub.url, "fake-token", backoff_base=0, **options)
+        self.addCleanup(client.close)
+        return client
+
+    def test_pooled_connection_and_retries(self):
+        """
+        A 503 is retried on the same connection; a 403 is raised at once.
+
+        Returns:
+            None
+        """
+        client = self.make_client(retries=3)
+        self.stub.statuses = [503, 201, 201, 403]
+
+        client.post({"text": "one"})
+        client.post({"text": "two"})
+        self.assertEqual(
+            [r["json"]["text"] for r in self.stub.received], ["one", "one", "two"]
+        )
+        self.assertEqual(len({r["port"] for r in self.stub.received}), 1)
+
+        with self.assertRaises(requests.HTTPError):
+            client.post({"text": "rejected"})
+        self.assertEqual(len(self.stub.received), 4)
+        self.assertEqual(client.breaker.state, CircuitBreaker.CLOSED)
+
+    def test_breaker_opens_then_recovers(self):
+        """
+        Consecutive failures open the circuit; a trial call closes it again.
+
+        Returns:
+            None
+        """
+        client = self.make_client(retries=1, failure_threshold=2, reset_timeout=0.2)
+        self.stub.statuses = [500, 500]
+
+        for _ in range(2):
+            with self.assertRaises(requests.HTTPError):
+                client.post({"text": "down"})
+        self.assertEqual(client.breaker.state, CircuitBreaker.OPEN)
+
+        with self.assertRaises(CircuitOpenError):
+            client.post({"text": "refused"})
+        self.assertEqual(len(self.stub.received), 2)
+
+        time.sleep(0.25)
+        self.assertEqual(client.breaker.state, CircuitBreaker.HALF_OPEN)
+        client.post({"text": "trial"})
+        self.assertEqual(client.breaker.state, CircuitBreaker.CLOSED)
+        self.assertEqual(len(self.stub.received), 3)
+
+    def test_trial_failing_with_any_error_reopens_the_circuit(self):
+        """
+        A half-open trial that raises something other than a requests error
+        still ends the trial, so a later trial can close the circuit.
+
+        Returns:
+            None
+        """
+        client = self.make_client(retries=1, failure_threshold=1, reset_timeout=0.2)
+        self.stub.statuses = [500, 201]
+        with self.assertRaises(requests.HTTPError):
+            client.post({"text": "down"})
+
+        time.sleep(0.25)
+        with patch.object(client.session, "post", side_effect=RuntimeError("bug")):
+            with self.assertRaises(RuntimeError):
+                client.post({"text": "trial"})
+        self.assertEqual(client.breaker.state, CircuitBreaker.OPEN)
+
+        time.sleep(0.25)
+        client.post({"text": "retrial"})
+        self.assertEqual(client.breaker.state, CircuitBreaker.CLOSED)
+
+    def test_open_circuit_reschedules_queued_post(self):
+        """
+        While the circuit is open the scheduler reschedules without calling X.
+
+        Returns:
+            None
+        """
+        journalist = make_user(username="x_journ", role=User.Role.JOURNALIST)
+        article = Article.objects.create(
+            title="Breaker Article",
+            body="Body",
+            publisher=Publisher.objects.create(name="X Publisher"),
+            author=journalist,
+            status=Article.Status.APPROVED,
+        )
+
+        with self.settings(
+            X_POST_ENABLED=True,
+            X_BEARER_TOKEN="fake-token",
+            X_API_URL=self.stub.url,
+            X_BREAKER_THRESHOLD=1,
+        ):
+            # An x_post outbox message from before the queue moves into it.
+            enqueue("x_post", {"article_id": article.pk, "url": "http://x/1/"})
+            drain_outbox()
+            get_client().breaker.record_failure()
+            counts = XPostScheduler().run(once=True)
+
+        self.assertEqual(counts["QUEUED"], 1)
+        self.assertEqual(self.stub.received, [])
+        post = XPost.objects.get(article=article)
+        self.assertEqual((post.status, post.attempts), (XPost.Status.QUEUED, 1))
+        self.assertIn("CircuitOpenError", post.last_error)
+        self.assertGreater(post.available_at, timezone.now())
+
+
+class XPostSchedulerTests(TestCase):
+    """
+    Tests for the rate-limit-aware X post scheduler.
+
+    Ensures that:
+    - the token bucket trickles, then follows the x-rate-limit-* headers
+    - a rate-limited backlog is posted freshest first without repeated 429s
+    - rejected posts fail, retracted articles are cancelled, re-approval requeues
+    """
+
+    def setUp(self):
+        """
+        Start a fake X API on a fake clock and create approved articles with
+        queued posts.
+
+        Returns:
+            None
+        """
+        self.now = 1_000_000.0
+        self.fake = FakeXServer(limit=2, window=60, clock=self.clock).start()
+        self.addCleanup(self.fake.stop)
+        reset_client()
+        self.addCleanup(reset_client)
+        journalist = make_user(username="sched_journ", role=User.Role.JOURNALIST)
+        publisher = Publisher.objects.create(name="Scheduler Publisher")
+        now = timezone.now()
+        self.posts = []
+        for minutes in (3, 2, 1):
+            article = Article.objects.create(
+                title=f"Queued {minutes}",
+                body="Body",
+                publisher=publisher,
+                author=journalist,
+                status=Article.Status.APPROVED,
+            )
+            self.posts.append(
+                XPost.objects.create(
+                    article=article,
+                    url=f"http://testserver/articles/{article.pk}/",
+                    queued_at=now - timedelta(minutes=minutes),
+                )
+            )
+
+    def clock(self) -> float:
+        """
+        Return the fake time shared by the fake API and the scheduler.
+        """
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        """
+        Advance the fake clock instead of sleeping.
+        """
+        self.now += seconds
+
+    def scheduler(self) -> XPostScheduler:
+        """
+        Return a scheduler whose bucket and sleeps use the fake clock.
+        """
+        return XPostScheduler(
+            TokenBucket(100, 86400, clock=self.clock), sleep=self.sleep
+        )
+
+    def x_settings(self):
+        """
+        Return settings pointing the client at the fake API.
+
+        Returns:
+            override_settings: The settings context.
+        """
+        return self.settings(
+            X_POST_ENABLED=True, X_BEARER_TOKEN="fake-token", X_API_URL=self.fake.url
+        )
+
+    def test_token_bucket_follows_rate_limit_headers(self):
+        """
+        Tokens trickle at capacity/window until headers report X's window.
+
+        Returns:
+            None
+        """
+        now = [1000.0]
+        bucket = TokenBucket(2, 10, clock=lambda: now[0])
+        bucket.take()
+        bucket.take()
+        self.assertAlmostEqual(bucket.wait_time(), 5.0)
+        now[0] += 5
+        self.assertEqual(bucket.wait_time(), 0.0)
+
+        headers = {
+            "x-rate-limit-limit": "50",
+            "x-rate-limit-remaining": "0",
+            "x-rate-limit-reset": "1100",
+        }
+        self.assertTrue(bucket.sync(headers))
+        self.assertAlmostEqual(bucket.wait_time(), 95.0)
+        now[0] = 1100
+        self.assertEqual(bucket.wait_time(), 0.0)
+        self.assertEqual(bucket.tokens, 50)
+        self.assertFalse(bucket.sync({}))
+
+    def test_rate_limited_backlog_posted_freshest_first(self):
+        """
+        After one 429 the backlog waits for each window and is never refused again.
+
+        Returns:
+            None
+        """
+        self.fake.used = 2  # The window is already spent by someone else.
+
+        with self.x_settings():
+            counts = self.scheduler().run(once=True)
+
+        self.assertEqual(counts["POSTED"], 3)
+        self.assertEqual(self.now, 1_000_120.0)  # Waited out two windows.
+        self.assertEqual(
+            [r["status"] for r in self.fake.received], [429, 201, 201, 201]
+        )
+        self.assertEqual(
+            [r["json"]["text"].split("\n")[0] for r in self.fake.received],
+            ["Queued 1", "Queued 1", "Queued 2", "Queued 3"],
+        )
+        posted = XPost.objects.filter(status=XPost.Status.POSTED)
+        self.assertEqual(posted.count(), 3)
+        for post in posted:
+            self.assertEqual(post.attempts, 1)
+            self.assertTrue(post.post_id)
+            self.assertIsNotNone(post.response_ms)
+            self.assertGreaterEqual(post.latency_ms, 60_000)
+
+    def test_rejected_retracted_and_requeued_posts(self):
+        """
+        A 403 fails the post; a retracted article is cancelled; re-approval requeues.
+
+        Returns:
+            None
+        """
+        rejected, retracted, _ = self.posts
+        Article.objects.filter(pk=retracted.article_id).update(
+            status=Article.Status.PENDING
+        )
+        self.fake.statuses = [201, 403]
+
+        with self.x_settings():
+            counts = self.scheduler().run(once=True)
+            self.assertEqual(
+                (counts["POSTED"], counts["FAILED"], counts["CANCELLED"]), (1, 1, 1)
+            )
+            rejected.refresh_from_db()
+            self.assertEqual(rejected.last_error, "403 Forbidden")
+
+            self.assertEqual(
+                queue_x_posts({post.article_id: post.url for post in self.posts}), 2
+            )
+        self.assertEqual(XPost.objects.filter(status=XPost.Status.QUEUED).count(), 2)
+
+
+class SearchTests(TestCase):
+    """
+    Tests for article search (/api/articles/search/ and the admin).
+
+    Ensures that:
+    - results are ranked, paginated and limited to APPROVED articles
+    - the idf article count is cached between queries
+    - the index follows saves, approvals and retractions incrementally
+    - the admin search reads the index instead of scanning article bodies
+    """
+
+    def setUp(self):
+        """
+        Create a reader and a few articles about solar power.
+
+        Returns:
+            None
+        """
+        get_feed_cache().clear()
+        self.client = APIClient()
+        self.reader = make_user(username="search_reader", role=User.Role.READER)
+        self.journalist = make_user(username="search_journ", role=User.Role.JOURNALIST)
+        self.editor = make_user(username="search_editor", role=User.Role.EDITOR)
+        self.publisher = Publisher.objects.create(name="Search Publisher")
+        self.headline = self.make_article(
+            "Solar farms expand", "The region adds capacity.", Article.Status.APPROVED
+        )
+        self.mention = self.make_article(
+            "Budget approved",
+            "The plan funds roads and one solar pilot.",
+            Article.Status.APPROVED,
+        )
+        self.pending = self.make_article("Solar tariffs", "Draft about solar.")
+        self.client.force_login(self.reader)
+        self.url = "/api/articles/search/"
+
+    def make_article(self, title: str, body: str, status=Article.Status.PENDING):
+        """
+        Create an article by the test journalist.
+        """
+        return Article.objects.create(
+            title=title,
+            body=body,
+            publisher=self.publisher,
+            author=self.journalist,
+            status=status,
+        )
+
+    def titles(self, query: str, **params):
+        """
+        Search as the reader and return the result titles.
+        """
+        response = self.client.get(self.url, {"q": query, **params})
+        self.assertEqual(response.status_code, 200)
+        return [item["title"] for item in response.json()["results"]]
+
+    def test_ranked_approved_results(self):
+        """
+        Title matches outrank body matches; pending articles never appear.
+
+        Returns:
+            None
+        """
+        self.assertEqual(
+            self.titles("Solar"), ["Solar farms expand", "Budget approved"]
+        )
+
+        data = self.client.get(
+            self.url, {"q": "solar", "limit": 1, "fields": "id"}
+        ).json()
+        self.assertEqual(data["count"], 2)
+        self.assertEqual(list(data["results"][0]), ["id", "score"])
+        self.assertIn("offset=1", data["next"])
+        self.assertEqual(self.titles("solar", limit=1, offset=1), ["Budget approved"])
+
+        self.assertEqual(self.client.get(self.url).status_code, 400)
+        self.assertEqual(self.titles("the of"), [])
+
+        # The idf article count is cached, not re-counted per query.
+        with CaptureQueriesContext(connection) as queries:
+            self.titles("solar")
+        article_counts = [
+            query["sql"]
+            for query in queries.captured_queries
+            if query["sql"].startswith(
+                'SELECT COUNT(*) AS "__count" FROM "core_article"'
+            )
+        ]
+        self.assertEqual(article_counts, [])
+        self.client.force_login(self.journalist)
+        self.assertEqual(self.client.get(self.url, {"q": "solar"}).status_code, 403)
+
+    def test_index_follows_approval_and_retraction(self):
+        """
+        Approvals add, retractions remove and edits re-index without a rebuild.
+
+        Returns:
+            None
+        """
+        request = RequestFactory().post("/")
+        bulk_decide([self.pending.pk], APPROVE, request=request)
+        self.assertIn("Solar tariffs", self.titles("tariffs"))
+
+        bulk_decide([self.pending.pk], REJECT, request=request, reason="Outdated")
+        self.assertEqual(self.titles("tariffs"), [])
+        self.assertFalse(
+            SearchTerm.objects.filter(article=self.pending, approved=True).exists()
+        )
+
+        self.headline.title = "Wind farms expand"
+        self.headline.save()
+        self.assertEqual(self.titles("wind"), ["Wind farms expand"])
+        self.assertEqual(self.titles("solar"), ["Budget approved"])
+
+        self.mention.reject("Withdrawn")
+        self.assertEqual(self.titles("solar"), [])
+
+        SearchTerm.objects.all().delete()
+        call_command("rebuild_search_index", stdout=StringIO())
+        self.assertEqual(self.titles("wind"), ["Wind farms expand"])
+
+    def test_admin_search_uses_index(self):
+        """
+        The admin changelist finds pending articles through the index, without LIKE.
+
+        Returns:
+            None
+        """
+        admin_user = User.objects.create_superuser(
+            username="search_admin",
+            email="search_admin@example.com",
+            password="pass1234",
+        )
+        self.client.force_login(admin_user)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/admin/core/article/", {"q": "solar tariffs"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [article.title for article in response.context["cl"].result_list],
+            ["Solar tariffs"],
+        )
+        self.assertFalse([q for q in queries.captured_queries if " LIKE " in q["sql"]])
+
+
+@override_settings(
+    SEARCH_BACKEND="core.search_engine.BM25SearchBackend",
+    SEARCH_ENGINE_SYNC_SECONDS=0,
+    STATUS_EVENT_SETTLE_SECONDS=0,
+)
+class SearchEngineTests(TestCase):
+    """
+    Tests for the in-process BM25 search engine.
+
+    Ensures that:
+    - BM25 ranks by term frequency and document length, honouring flags and filters
+    - an index of empty documents answers without dividing by zero
+    - snapshots load through mmap and still take incremental adds and removals
+    - the backend serves the search API and catches up from the status event log
+    - edits and deletes made by other processes reach each worker's index
+    - approvals re-read the article text; unsettled events wait for a later sync
+    """
+
+    def setUp(self):
+        """
+        Start from a fresh backend and create a few articles.
+
+        Returns:
+            None
+        """
+        reset_search_backend()
+        self.addCleanup(reset_search_backend)
+        self.client = APIClient()
+        self.reader = make_user(username="engine_reader", role=User.Role.READER)
+        self.journalist = make_user(username="engine_journ", role=User.Role.JOURNALIST)
+        self.publisher = Publisher.objects.create(name="Engine Publisher")
+        self.headline = self.make_article(
+            "Solar farms expand",
+            "The region adds solar capacity.",
+            Article.Status.APPROVED,
+        )
+        self.mention = self.make_article(
+            "Budget approved",
+            "The plan funds roads and one solar pilot.",
+            Article.Status.APPROVED,
+        )
+        self.pending = self.make_article("Solar tariffs", "Draft about tariffs.")
+        self.client.force_login(self.reader)
+
+    def make_article(self, title: str, body: str, status=Article.Status.PENDING):
+        """
+        Create an article by the test journalist.
+        """
+        return Article.objects.create(
+            title=title,
+            body=body,
+            publisher=self.publisher,
+            author=self.journalist,
+            status=status,
+        )
+
+    def titles(self, query: str):
+        """
+        Search as the reader and return the result titles.
+        """
+        response = self.client.get("/api/articles/search/", {"q": query})
+        self.assertEqual(response.status_code, 200)
+        return [item["title"] for item in response.json()["results"]]
+
+    def test_bm25_ranking_and_top_k(self):
+        """
+        Frequent and focused matches rank first; flags, require_all and k apply.
+
+        Returns:
+            None
+        """
+        index = BM25Index()
+        index.add(1, ["solar"] * 3 + ["grid"] * 7)
+        index.add(2, ["solar", "grid"] + ["filler"] * 8)
+        index.add(3, ["solar", "grid"])
+        index.add(4, ["solar"] * 5, approved=False)
+        index.add(5, ["wind"] * 4)
+
+        results, total = index.search(["solar"], 2)
+        self.assertEqual(total, 3)
+        self.assertEqual([pk for pk, _ in results], [1, 3])
+        self.assertGreater(results[0][1], results[1][1])
+        self.assertEqual(index.search(["solar"], 1, approved_only=False)[0][0][0], 4)
+
+        results, total = index.search(["solar", "wind"], 10, require_all=True)
+        self.assertEqual((results, total), ([], 0))
+        self.assertEqual(
+            [pk for pk, _ in index.search(["grid", "solar"], 10, exclude={1})[0]],
+            [3, 2],
+        )
+
+        index.set_approved(4, True)
+        index.remove(1)
+        index.add(2, ["wind"])
+        self.assertEqual([pk for pk, _ in index.search(["solar"], 10)[0]], [4, 3])
+        self.assertEqual([pk for pk, _ in index.search(["wind"], 10)[0]], [5, 2])
+        self.assertEqual(len(index), 4)
+
+        empty = BM25Index()
+        empty.add(1, [])
+        self.assertEqual(empty.search(["solar"], 10), ([], 0))
+
+    def test_snapshot_loads_with_mmap_and_takes_updates(self):
+        """
+        A mapped snapshot answers like the index it was written from and
+        accepts approvals, removals and new documents on top.
+
+        Returns:
+            None
+        """
+        index = BM25Index()
+        for pk in range(1, 41):
+            index.add(
+                pk, ["news"] + [f"topic{pk % 4}"] * (pk % 3 + 1), approved=pk % 5 != 0
+            )
+        index.remove(7)
+        index.event_cursor = 99
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "search.bm25")
+            index.write_snapshot(path)
+            mapped = BM25Index.load_snapshot(path)
+
+            self.assertEqual(mapped.event_cursor, 99)
+            self.assertEqual(len(mapped), 39)
+            for terms in (["topic1"], ["news", "topic2"], ["missing"]):
+                # Scores move slightly: compaction drops tombstones from df.
+                expected, total = index.search(terms, 5)
+                results, mapped_total = mapped.search(terms, 5)
+                self.assertEqual([pk for pk, _ in results], [pk for pk, _ in expected])
+                self.assertEqual(mapped_total, total)
+
+            self.assertNotIn(10, [pk for pk, _ in mapped.search(["topic2"], 50)[0]])
+            mapped.set_approved(10, True)
+            mapped.remove(9)
+            mapped.add(41, ["topic1"] * 5)
+            results = [pk for pk, _ in mapped.search(["topic1"], 50)[0]]
+            self.assertEqual(results[0], 41)
+            self.assertNotIn(9, results)
+            self.assertIn(10, [pk for pk, _ in mapped.search(["topic2"], 50)[0]])
+
+            mapped.write_snapshot(path)
+            self.assertEqual(len(BM25Index.load_snapshot(path)), 39)
+
+    def test_backend_serves_api_and_follows_event_log(self):
+        """
+        Searches go through the engine; another process's index catches up
+        on approvals, retractions and new articles from the event log.
+
+        Returns:
+            None
+        """
+        self.assertEqual(
+            self.titles("solar"), ["Solar farms expand", "Budget approved"]
+        )
+        worker = BM25SearchBackend()
+        worker.get_index()
+
+        # Edited in another process while still in review.
+        Article.objects.filter(pk=self.pending.pk).update(
+            body="Draft about geothermal tariffs."
+        )
+        self.pending.approve()
+        self.mention.reject("Withdrawn")
+        storage = self.make_article(
+            "Solar storage", "Batteries.", Article.Status.APPROVED
+        )
+        self.assertEqual(self.titles("tariffs"), ["Solar tariffs"])
+
+        results, total = worker.search("solar")
+        self.assertEqual(total, 3)
+        self.assertEqual(
+            {pk for pk, _ in results}, {self.headline.pk, self.pending.pk, storage.pk}
+        )
+        self.assertEqual(
+            {pk for pk, _ in worker.related(self.pending)},
+            {self.headline.pk, storage.pk},
+        )
+        self.assertEqual(
+            [pk for pk, _ in worker.search("geothermal")[0]], [self.pending.pk]
+        )
+
+    def test_other_processes_edits_and_deletes_reach_the_index(self):
+        """
+        Edits of approved articles are re-read from the event log, and
+        articles deleted elsewhere drop out of results and totals.
+
+        Returns:
+            None
+        """
+        worker = BM25SearchBackend()
+        worker.get_index()
+
+        self.headline.body = "The region adds wind capacity."
+        self.headline.save()
+        self.assertEqual(
+            list(
+                ArticleStatusEvent.objects.filter(article=self.headline)
+                .order_by("-pk")
+                .values_list("previous_status", "status")[:1]
+            ),
+            [("APPROVED", "APPROVED")],
+        )
+        self.assertEqual([pk for pk, _ in worker.search("wind")[0]], [self.headline.pk])
+
+        Article.objects.filter(pk=self.mention.pk).delete()
+        results, total = worker.search("solar")
+        self.assertEqual(([pk for pk, _ in results], total), ([self.headline.pk], 1))
+        self.assertNotIn(self.mention.pk, worker.get_index())
+
+    def test_sync_waits_for_events_to_settle(self):
+        """
+        An approval younger than the settle window is applied on a later sync.
+
+        Returns:
+            None
+        """
+        worker = BM25SearchBackend()
+        worker.get_index()
+        self.pending.approve()
+
+        with override_settings(STATUS_EVENT_SETTLE_SECONDS=60):
+            self.assertEqual(worker.search("tariffs")[1], 0)
+            ArticleStatusEvent.objects.filter(article=self.pending).update(
+                created_at=timezone.now() - timedelta(minutes=2)
+            )
+            self.assertEqual(worker.search("tariffs")[1], 1)
+
+    def test_rebuild_writes_snapshot_for_workers(self):
+        """
+        rebuild_search_index writes the snapshot new workers map at startup,
+        and the benchmark runs on a small synthetic corpus.
+
+        Returns:
+            None
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "search.bm25")
+            with self.settings(SEARCH_ENGINE_SNAPSHOT=path):
+                call_command("rebuild_search_index", stdout=StringIO())
+                self.assertTrue(os.path.exists(path))
+                Article.objects.filter(pk=self.headline.pk).delete()
+                reset_search_backend()
+                self.assertEqual(self.titles("solar"), ["Budget approved"])
+
+        out = StringIO()
+        call_command(
+            "benchmark_search_engine",
+            docs=2000,
+            vocabulary=300,
+            queries=10,
+            updates=100,
+            stdout=out,
+        )
+        self.assertIn("queries (mmap)", out.getvalue())
+
+
+class RelatedArticleTests(TestCase):
+    """
+    Tests for the related-articles block on the article detail page.
+
+    Ensures that:
+    - similarities match a brute-force cosine computation across blocks
+    - the batch job stores ranked lists and refreshes cached detail pages
+    - incremental runs add new approvals and drop retracted articles
+    """
+
+    def setUp(self):
+        """
+        Create approved articles on two topics and a model path.
+
+        Returns:
+            None
+        """
+        get_feed_cache().clear()
+        local_cache.clear()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.model_path = os.path.join(directory.name, "related.npz")
+        self.journalist = make_user(username="related_journ", role=User.Role.JOURNALIST)
+        self.publisher = Publisher.objects.create(name="Related Publisher")
+        self.solar = [
+            self.make_article(
+                "Solar farms expand", "Solar panels cover farms in the valley."
+            ),
+            self.make_article(
+                "Solar panels get cheaper", "Panel prices fall as farms grow."
+            ),
+            self.make_article(
+                "Rooftop solar", "Homes add panels; solar output climbs."
+            ),
+        ]
+        self.wind = [
+            self.make_article(
+                "Wind turbines offshore", "Turbines rise offshore in the wind."
+            ),
+            self.make_article(
+                "Wind power record", "Offshore turbines set a wind record."
+            ),
+        ]
+
+    def make_article(self, title: str, body: str, status=Article.Status.APPROVED):
+        """
+        Create an article by the test journalist.
+        """
+        return Article.objects.create(
+            title=title,
+            body=body,
+            publisher=self.publisher,
+            author=self.journalist,
+            status=status,
+        )
+
+    def related_ids(self, article):
+        """
+        Return the stored related-article list of an article.
+        """
+        return list(
+            RelatedArticle.objects.filter(article=article)
+            .order_by("rank")
+            .values_list("related_id", flat=True)
+        )
+
+    def build(self, *args):
+        """
+        Run the batch job against the test model path.
+        """
+        with self.settings(RELATED_ARTICLES_MODEL=self.model_path):
+            call_command("build_related_articles", *args, stdout=StringIO())
+
+    def test_neighbors_match_brute_force_cosine(self):
+        """
+        Block-wise sparse top-N equals ranking a dense cosine matrix.
+
+        Returns:
+            None
+        """
+        articles = list(Article.objects.order_by("pk"))
+        model = RelatedModel.fit(articles)
+        dense = model.matrix.toarray()
+        norms = (dense**2).sum(axis=1)
+        self.assertTrue(all(abs(norm - 1) < 1e-5 for norm in norms))
+
+        with patch("core.related.BLOCK_CELLS", 1):
+            lists = model.neighbors(model.pks, model.matrix, 2, 0.0)
+        cosine = dense @ dense.T
+        for i, pk in enumerate(model.pks.tolist()):
+            expected = sorted(
+                (j for j in range(len(articles)) if j != i), key=lambda j: -cosine[i, j]
+            )[:2]
+            self.assertEqual(
+                [related for related, _ in lists[pk]],
+                [int(model.pks[j]) for j in expected],
+            )
+            self.assertAlmostEqual(lists[pk][0][1], cosine[i, expected[0]], places=5)
+
+        new = model.vectorize(
+            [term_counts(Article(title="Solar", body="Unknown words"))]
+        )
+        self.assertEqual(new.nnz, 1)
+
+    def test_build_stores_lists_and_refreshes_detail_pages(self):
+        """
+        A full run links articles on the same topic, best first, and the
+        detail page shows the list without serving a stale cached page.
+
+        Returns:
+            None
+        """
+        url = reverse("core:article_detail", args=[self.solar[0].pk])
+        self.assertNotContains(self.client.get(url), "Related articles")
+
+        self.build("--full")
+        self.assertEqual(
+            set(self.related_ids(self.solar[0])), {a.pk for a in self.solar[1:]}
+        )
+        self.assertEqual(set(self.related_ids(self.wind[0])), {self.wind[1].pk})
+        scores = list(
+            RelatedArticle.objects.filter(article=self.solar[0])
+            .order_by("rank")
+            .values_list("score", flat=True)
+        )
+        self.assertEqual(scores, sorted(scores, reverse=True))
+
+        response = self.client.get(url)
+        self.assertContains(response, "Related articles")
+        self.assertContains(response, "Rooftop solar")
+        self.assertNotContains(response, "Wind power record")
+
+    def test_incremental_run_adds_approvals_and_drops_retractions(self):
+        """
+        Only new approvals and affected lists are recomputed; retracted
+        articles leave every page at once.
+
+        Returns:
+            None
+        """
+        self.build()
+        self.assertTrue(os.path.exists(self.model_path))
+        fresh = self.make_article(
+            "Solar farms record", "Farms of solar panels.", Article.Status.PENDING
+        )
+        fresh.approve()
+
+        with self.settings(RELATED_ARTICLES_MODEL=self.model_path):
+            stats = update_related_articles()
+        self.assertEqual((stats["added"], stats["removed"]), (1, 0))
+        self.assertEqual(stats["updated"], 1 + len(self.solar))
+        self.assertEqual(set(self.related_ids(fresh)), {a.pk for a in self.solar})
+        self.assertIn(fresh.pk, self.related_ids(self.solar[0]))
+        self.assertEqual(set(self.related_ids(self.wind[0])), {self.wind[1].pk})
+
+        url = reverse("core:article_detail", args=[self.solar[0].pk])
+        self.assertContains(self.client.get(url), "Rooftop solar")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.solar[2].reject("Retracted")
+        self.assertNotContains(self.client.get(url), "Rooftop solar")
+
+        with self.settings(RELATED_ARTICLES_MODEL=self.model_path):
+            stats = update_related_articles()
+        self.assertEqual((stats["added"], stats["removed"]), (0, 1))
+        self.assertFalse(RelatedArticle.objects.filter(related=self.solar[2]).exists())
+        self.assertFalse(RelatedArticle.objects.filter(article=self.solar[2]).exists())
+
+
+class TimelineFeedTests(TestCase):
+    """
+    Tests for the materialized reader timelines behind the feed endpoint.
+
+    Ensures that:
+    - approving an article fans it out to subscribers and followers
+    - audiences and rebuilds are read in bounded keyset batches
+    - large-audience sources are merged in at read time instead
+    - subscription toggles and the rebuild command keep timelines correct
+    """
+
+    def setUp(self):
+        """
+        Create a reader subscribed to one publisher and one journalist.
+
+        Returns:
+            None
+        """
+        self.client = APIClient()
+        get_feed_cache().clear()
+
+        self.reader = make_user(username="reader1", role=User.Role.READER)
+        self.journalist = make_user(username="journ1", role=User.Role.JOURNALIST)
+        self.editor = make_user(username="editor1", role=User.Role.EDITOR)
+
+        self.pub_a = Publisher.objects.create(name="Publisher A")
+        self.pub_b = Publisher.objects.create(name="Publisher B")
+
+        self.reader.subscribed_publishers.add(self.pub_a)
+
+        self.url_feed = "/api/articles/feed/"
+
+    def make_article(self, title: str, publisher, status=Article.Status.PENDING):
+        """
+        Create an article by the test journalist.
+
+        Returns:
+            Article: The created article.
+        """
+        return Article.objects.create(
+            title=title,
+            body="Body",
+            publisher=publisher,
+            author=self.journalist,
+            status=status,
+        )
+
+    def feed_titles(self):
+        """
+        Fetch the reader's feed and return its titles in order.
+
+        Returns:
+            list[str]: Article titles.
+        """
+        self.client.login(username="reader1", password="pass1234")
+        response = self.client.get(self.url_feed)
+        self.assertEqual(response.status_code, 200)
+        return [item["title"] for item in response.json()["results"]]
+
+    def test_approval_in_decide_article_fans_out_to_timeline(self):
+        """
+        Approving through the editor view writes one timeline row per reader.
+
+        Returns:
+            None
+        """
+        article = self.make_article("Fresh", self.pub_a)
+        self.assertFalse(TimelineEntry.objects.exists())
+
+        self.client.login(username="editor1", password="pass1234")
+        self.client.post(
+            reverse("core:decide_article", args=[article.pk]),
+            data={"action": "approve", "expected_status": "PENDING"},
+        )
+
+        self.assertEqual(
+            list(TimelineEntry.objects.values_list("reader", "article")),
+            [(self.reader.pk, article.pk)],
+        )
+
+        article.refresh_from_db()
+        article.reject("Retracted")
+        self.assertFalse(TimelineEntry.objects.exists())
+
+    def test_audiences_are_read_in_keyset_batches(self):
+        """
+        Subscribers and followers are paged by id with one bounded query per
+        batch, each reader once.
+
+        Returns:
+            None
+        """
+        others = [
+            make_user(username=f"batch_reader{i}", role=User.Role.READER)
+            for i in range(2)
+        ]
+        self.pub_a.subscribers.add(*others)
+        self.journalist.followers.add(self.reader, others[1])
+        audience = sorted((user.pk,) for user in [self.reader, *others])
+
+        with self.assertNumQueries(4):
+            batches = list(
+                keyset_batches(
+                    self.pub_a.subscribers.values_list("pk"),
+                    self.journalist.followers.values_list("pk"),
+                    size=1,
+                )
+            )
+        self.assertEqual(batches, [[row] for row in audience])
+
+        article = self.make_article("Batched", self.pub_a, Article.Status.APPROVED)
+        self.assertEqual(
+            sorted(TimelineEntry.objects.filter(article=article).values_list("reader")),
+            audience,
+        )
+
+    def test_large_audience_source_is_merged_at_read_time(self):
+        """
+        Sources above FEED_FANOUT_MAX_AUDIENCE switch to pull mode but still
+        show up in the feed.
+
+        Returns:
+            None
+        """
+        with self.settings(FEED_FANOUT_MAX_AUDIENCE=0):
+            self.make_article("Pulled", self.pub_a, status=Article.Status.APPROVED)
+
+        self.pub_a.refresh_from_db()
+        self.assertTrue(self.pub_a.fan_out_on_read)
+        self.assertFalse(TimelineEntry.objects.exists())
+        self.assertEqual(self.feed_titles(), ["Pulled"])
+
+    def test_follow_toggle_backfills_and_rebuild_command_restores(self):
+        """
+        Following a journalist backfills their older articles, and
+        rebuild_timelines recreates timelines from scratch.
+
+        Returns:
+            None
+        """
+        self.make_article("Old From B", self.pub_b, status=Article.Status.APPROVED)
+        self.assertEqual(self.feed_titles(), [])
+
+        self.client.post(
+            reverse("core:toggle_journalist_follow", args=[self.journalist.pk])
+        )
+        self.assertEqual(self.feed_titles(), ["Old From B"])
+
+        TimelineEntry.objects.all().delete()
+        call_command("rebuild_timelines", stdout=StringIO())
+        self.assertEqual(self.feed_titles(), ["Old From B"])
+
+    def test_toggles_only_touch_the_toggled_source(self):
+        """
+        Subscribing inserts and unsubscribing deletes only that source's
+        rows; articles still covered by a follow stay in the timeline.
+
+        Returns:
+            None
+        """
+        self.make_article("From A", self.pub_a, status=Article.Status.APPROVED)
+        other = make_user(username="journ2", role=User.Role.JOURNALIST)
+        Article.objects.create(
+            title="B by other",
+            body="Body",
+            publisher=self.pub_b,
+            author=other,
+            status=Article.Status.APPROVED,
+        )
+        self.make_article("B by journ1", self.pub_b, status=Article.Status.APPROVED)
+        self.reader.subscribed_journalists.add(self.journalist)
+        call_command("rebuild_timelines", stdout=StringIO())
+        kept = set(TimelineEntry.objects.values_list("pk", flat=True))
+
+        self.client.login(username="reader1", password="pass1234")
+        toggle_b = reverse("core:toggle_publisher_subscription", args=[self.pub_b.pk])
+        self.client.post(toggle_b)
+        self.assertEqual(self.feed_titles(), ["B by journ1", "B by other", "From A"])
+        self.assertTrue(kept <= set(TimelineEntry.objects.values_list("pk", flat=True)))
+
+        self.client.post(toggle_b)
+        self.assertEqual(self.feed_titles(), ["B by journ1", "From A"])
+        self.assertEqual(set(TimelineEntry.objects.values_list("pk", flat=True)), kept)
+
+    def test_merged_pull_streams_match_legacy_or_query(self):
+        """
+        With every source in pull mode the merged feed returns exactly what the
+        old OR+DISTINCT query did, page by page.
+
+        Returns:
+            None
+        """
+        other = make_user(username="journ2", role=User.Role.JOURNALIST)
+        self.reader.subscribed_journalists.add(self.journalist)
+        for i in range(7):
+            self.make_article(f"A{i}", self.pub_a, status=Article.Status.APPROVED)
+            self.make_article(f"B{i}", self.pub_b, status=Article.Status.APPROVED)
+            Article.objects.create(
+                title=f"Other{i}",
+                body="Body",
+                publisher=self.pub_a if i % 2 else self.pub_b,
+                author=other,
+                status=Article.Status.APPROVED,
+            )
+        Publisher.objects.update(fan_out_on_read=True)
+        User.objects.update(fan_out_on_read=True)
+
+        expected = [
+            a.pk
+            for a in legacy_feed_queryset(self.reader).order_by("-created_at", "-pk")
+        ]
+
+        self.client.login(username="reader1", password="pass1234")
+        seen = []
+        url = self.url_feed + "?page_size=4"
+        while url:
+            page = self.client.get(url).json()
+            seen.extend(item["id"] for item in page["results"])
+            url = page["next"]
+
+        self.assertEqual(seen, expected)
+
+        Publisher.objects.filter(pk=self.pub_a.pk).update(fan_out_on_read=False)
+        out = StringIO()
+        call_command("benchmark_feed", runs=1, pages=3, page_size=5, stdout=out)
+        self.assertIn("speedup", out.getvalue())
+        self.assertEqual(
+            set(
+                Publisher.objects.filter(fan_out_on_read=False).values_list(
+                    "pk", flat=True
+                )
+            ),
+            {self.pub_a.pk},
+        )
+
+
+class QueryPlanTests(TestCase):
+    """
+    Tests for the EXPLAIN regression check on hot Article queries.
+    """
+
+    def test_hot_queries_use_indexes(self):
+        """
+        check_query_plans passes on a seeded database and fails when there is
+        nothing to explain.
+
+        Returns:
+            None
+        """
+        with self.assertRaises(CommandError):
+            call_command("check_query_plans", stdout=StringIO())
 
-        self.assertEqual(response.status_code, 302)
-        self.assertTrue(mock_post.called)
\ No newline at end of file
+        out = StringIO()
+        call_command("check_query_plans", seed=500, stdout=out)
+        self.assertNotIn("FAIL", out.getvalue())
@@ -32,6 +32,16 @@ urlpatterns = [
 
     # Editor workflow
     path("editor/", views.editor_queue, name="editor_queue"),
+    path(
+        "editor/claims/release/",
+        views.release_article_claims,
+        name="release_article_claims",
+    ),
+    path(
+        "editor/articles/decide/",
+        views.bulk_decide_articles,
+        name="bulk_decide_articles",
+    ),
     path(
         "editor/articles/<int:pk>/decide/",
         views.decide_article,
@@ -8,18 +8,19 @@ This module contains Django view functions for:
 - editor workflows (review queue, approve/reject)
 """
 
-from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth import login
 from django.contrib.auth.decorators import login_required
-from django.core.mail import send_mail
-from django.http import HttpResponseForbidden
+from django.http import Http404, HttpResponseForbidden
 from django.shortcuts import get_object_or_404, redirect, render
-from django.utils import timezone
+from django.utils.safestring import mark_safe
 
-from .forms import ArticleForm, PublisherForm, RegistrationForm
+from .detail_cache import get_article_page
+from .feeds import note_subscriptions_changed
+from .forms import ArticleForm, NotificationPreferencesForm, PublisherForm, RegistrationForm
+from .homepage import homepage_fragment
+from .moderation import APPROVE, REJECT, bulk_decide, claim_articles, decide, release_claims
 from .models import Article, Publisher, User
-from .services.x_client import post_article_to_x
 
 
 def register(request):
@@ -55,31 +56,41 @@ def article_list(request):
     """
     Display the public homepage article list (APPROVED only).
 
+    The list is paginated with keyset links (``?cursor=``) and each page's
+    fragment is served from the homepage cache (see ``core.homepage``).
+
     Args:
         request: Django HttpRequest.
 
     Returns:
         HttpResponse: Rendered article list.
     """
-    articles = Article.objects.filter(status=Article.Status.APPROVED).order_by(
-        "-created_at"
-    )
-    return render(request, "core/article_list.html", {"articles": articles})
+    page_html, _ = homepage_fragment(request)
+    return render(request, "core/article_list.html", {"page_html": page_html})
 
 
 def article_detail(request, pk: int):
     """
     Display a single approved article by primary key.
 
+    The article content is served from the two-tier detail page cache (see
+    ``core.detail_cache``).
+
     Args:
         request: Django HttpRequest.
         pk (int): Article primary key.
 
     Returns:
         HttpResponse: Rendered article detail page.
+
+    Raises:
+        Http404: If no APPROVED article has this primary key.
     """
-    article = get_object_or_404(Article, pk=pk, status=Article.Status.APPROVED)
-    return render(request, "core/article_detail.html", {"article": article})
+    page = get_article_page(pk)
+    if page is None:
+        raise Http404("No Article matches the given query.")
+    context = {"title": page["title"], "article_html": mark_safe(page["html"])}
+    return render(request, "core/article_detail.html", context)
 
 @login_required
 def create_publisher(request):
@@ -145,10 +156,13 @@ def toggle_publisher_subscription(request, pk: int):
 
     publisher = get_object_or_404(Publisher, pk=pk)
 
-    if request.user.subscribed_publishers.filter(pk=publisher.pk).exists():
-        request.user.subscribed_publishers.remove(publisher)
-    else:
+    subscribed = not request.user.subscribed_publishers.filter(pk=publisher.pk).exists()
+    if subscribed:
         request.user.subscribed_publishers.add(publisher)
+    else:
+        request.user.subscribed_publishers.remove(publisher)
+
+    note_subscriptions_changed(request.user, publisher, subscribed)
 
     return redirect("core:publisher_list")
 
@@ -175,18 +189,31 @@ def my_subscriptions(request):
     """
     Display a summary of the current user's publisher subscriptions and journalist follows.
 
+    POSTing the notification preferences form saves which new-article emails
+    the user receives.
+
     Args:
         request: Django HttpRequest.
 
     Returns:
-        HttpResponse: Rendered subscriptions page.
+        HttpResponse: Rendered subscriptions page (redirect after saving).
     """
+    if request.method == "POST":
+        form = NotificationPreferencesForm(request.POST, instance=request.user)
+        if form.is_valid():
+            form.save()
+            messages.success(request, "Notification preferences saved.")
+            return redirect("core:my_subscriptions")
+    else:
+        form = NotificationPreferencesForm(instance=request.user)
+
     publishers = request.user.subscribed_publishers.order_by("name")
     journalists = request.user.subscribed_journalists.order_by("username")
 
     context = {
         "publishers": publishers,
         "journalists": journalists,
+        "preferences_form": form,
     }
     return render(request, "core/my_subscriptions.html", context)
 
@@ -213,10 +240,13 @@ def toggle_journalist_follow(request, pk: int):
     if request.user.pk == journalist.pk:
         return redirect("core:journalist_list")
 
-    if request.user.subscribed_journalists.filter(pk=journalist.pk).exists():
-        request.user.subscribed_journalists.remove(journalist)
-    else:
+    subscribed = not request.user.subscribed_journalists.filter(pk=journalist.pk).exists()
+    if subscribed:
         request.user.subscribed_journalists.add(journalist)
+    else:
+        request.user.subscribed_journalists.remove(journalist)
+
+    note_subscriptions_changed(request.user, journalist, subscribed)
 
     return redirect("core:journalist_list")
 
@@ -281,7 +311,11 @@ def create_article(request):
 @login_required
 def editor_queue(request):
     """
-    Editor-only review queue showing all pending articles.
+    Editor-only review queue showing the pending articles leased to the editor.
+
+    Each visit renews the editor's leases and tops them up with the next
+    unclaimed pending articles (see ``core.moderation.claim_articles``), so
+    concurrent editors work on disjoint articles.
 
     Args:
         request: Django HttpRequest.
@@ -295,10 +329,88 @@ def editor_queue(request):
     if request.user.role != User.Role.EDITOR:
         return HttpResponseForbidden("Only editors can view this page.")
 
-    pending_articles = Article.objects.filter(status=Article.Status.PENDING).order_by(
-        "-created_at"
+    articles = claim_articles(request.user)
+    return render(
+        request,
+        "core/editor_queue.html",
+        {
+            "articles": articles,
+            "claim_expires_at": articles[0].claim_expires_at if articles else None,
+            "pending_total": Article.objects.filter(status=Article.Status.PENDING).count(),
+        },
     )
-    return render(request, "core/editor_queue.html", {"articles": pending_articles})
+
+
+@login_required
+def release_article_claims(request):
+    """
+    Editor-only endpoint to hand all of the editor's leased articles back.
+
+    Args:
+        request: Django HttpRequest.
+
+    Returns:
+        HttpResponseRedirect: Redirect to the article list (visiting the
+        queue again would re-claim the same articles).
+
+    Raises:
+        HttpResponseForbidden: If user is not an editor.
+    """
+    if request.user.role != User.Role.EDITOR:
+        return HttpResponseForbidden("Only editors can review articles.")
+
+    if request.method == "POST":
+        released = release_claims(request.user)
+        messages.info(request, f"{released} article(s) returned to the queue.")
+    return redirect("core:article_list")
+
+
+@login_required
+def bulk_decide_articles(request):
+    """
+    Editor-only endpoint to approve or reject all selected articles at once.
+
+    Status updates run in one transaction (one UPDATE per request) and the
+    resulting emails, coalesced per author and per subscriber, are queued in
+    the outbox (see ``core.moderation``). Articles leased to another editor are skipped.
+
+    Args:
+        request: Django HttpRequest with ``action``, ``article_ids`` and an
+            optional ``reason``.
+
+    Returns:
+        HttpResponseRedirect: Redirect back to editor queue.
+
+    Raises:
+        HttpResponseForbidden: If user is not an editor.
+    """
+    if request.user.role != User.Role.EDITOR:
+        return HttpResponseForbidden("Only editors can review articles.")
+
+    if request.method != "POST":
+        return redirect("core:editor_queue")
+
+    action = request.POST.get("action")
+    article_ids = [pk for pk in request.POST.getlist("article_ids") if pk.isdigit()]
+    if action not in (APPROVE, REJECT):
+        messages.warning(request, "Invalid action.")
+        return redirect("core:editor_queue")
+    if not article_ids:
+        messages.warning(request, "Select at least one article.")
+        return redirect("core:editor_queue")
+
+    decided = bulk_decide(
+        article_ids,
+        action,
+        request=request,
+        reason=request.POST.get("reason", "").strip(),
+        editor=request.user,
+    )
+    if action == APPROVE:
+        messages.success(request, f"{len(decided)} article(s) approved; notifications queued.")
+    else:
+        messages.error(request, f"{len(decided)} article(s) rejected; authors will be notified.")
+    return redirect("core:editor_queue")
 
 
 @login_required
@@ -306,8 +418,18 @@ def decide_article(request, pk: int):
     """
     Editor-only action endpoint to approve or reject an article.
 
-    - Approve: sets APPROVED, emails author, emails publisher subscribers, attempts X post
-    - Reject: sets REJECTED, saves reason, emails author
+    - Approve: sets APPROVED, queues emails to the author and publisher subscribers
+      and an X post
+    - Reject: sets REJECTED, saves reason, queues an email to the author
+
+    Emails (outbox) and the X post (X post queue) are written in the decision's
+    transaction and delivered by the ``process_outbox`` worker and the
+    ``post_to_x`` scheduler, so the request itself only writes to the
+    database.
+
+    The status change is a compare-and-set against the status the editor saw
+    (``expected_status``, required): if another editor decided or claimed the
+    article first, nothing is written and the editor is told so.
 
     Args:
         request: Django HttpRequest.
@@ -330,75 +452,32 @@ def decide_article(request, pk: int):
     action = request.POST.get("action")
     reason = request.POST.get("reason", "").strip()
 
-    if action == "approve":
-        article.status = Article.Status.APPROVED
-        article.decision_reason = ""
-        article.decided_at = timezone.now()
-        article.save()
-
-        subject = f"Article approved: {article.title}"
-        body = (
-            f"Hi {article.author.username},\n\n"
-            f"Good news — your article '{article.title}' has been approved.\n\n"
-            f"Publisher: {article.publisher.name}\n\n"
-            "Regards,\nNews App Editor"
-        )
-        if article.author.email:
-            send_mail(subject, body, settings.DEFAULT_FROM_EMAIL, [article.author.email])
-
-        subscriber_emails = (
-            User.objects.filter(subscribed_publishers=article.publisher)
-            .exclude(pk=article.author.pk)
-            .exclude(email__isnull=True)
-            .exclude(email__exact="")
-            .values_list("email", flat=True)
-            .distinct()
-        )
-        subscriber_emails = list(subscriber_emails)
-
-        if subscriber_emails:
-            subject = f"New article from {article.publisher.name}: {article.title}"
-            body = (
-                "Hi,\n\n"
-                f"A new article has been published by {article.publisher.name}:\n\n"
-                f"Title: {article.title}\n"
-                f"Author: {article.author.username}\n\n"
-                f"Read it here: http://127.0.0.1:8000/articles/{article.pk}/\n\n"
-                "Regards,\nNews App"
-            )
-            send_mail(subject, body, settings.DEFAULT_FROM_EMAIL, subscriber_emails)
-            messages.info(
-                request,
-                f"Subscribers notified ({len(subscriber_emails)} email(s)).",
-            )
-
-        posted = post_article_to_x(article, request)
-        if posted:
-            messages.info(request, "Posted to X.")
-        else:
-            messages.info(request, "X post skipped or failed.")
-
-        messages.success(request, "Article approved and notifications sent.")
-
-    elif action == "reject":
-        article.status = Article.Status.REJECTED
-        article.decision_reason = reason
-        article.decided_at = timezone.now()
-        article.save()
-
-        subject = f"Article rejected: {article.title}"
-        body = (
-            f"Hi {article.author.username},\n\n"
-            f"Your article '{article.title}' was not approved.\n\n"
-            f"Reason:\n{reason if reason else 'No reason provided.'}\n\n"
-            "Regards,\nNews App Editor"
-        )
-        if article.author.email:
-            send_mail(subject, body, settings.DEFAULT_FROM_EMAIL, [article.author.email])
+    if action not in (APPROVE, REJECT):
+        messages.warning(request, "Invalid action.")
+        return redirect("core:editor_queue")
 
-        messages.error(request, "Article rejected and author notified.")
+    expected_status = request.POST.get("expected_status")
+    if expected_status not in Article.Status.values:
+        messages.warning(request, "Missing article status; reload the queue and try again.")
+        return redirect("core:editor_queue")
+    if not decide(
+        article,
+        action,
+        request=request,
+        editor=request.user,
+        expected_status=expected_status,
+        reason=reason,
+    ):
+        messages.warning(
+            request,
+            f"'{article.title}' was already decided or claimed by another editor; "
+            "nothing was changed.",
+        )
+        return redirect("core:editor_queue")
 
+    if action == APPROVE:
+        messages.success(request, "Article approved; notifications and X post queued.")
     else:
-        messages.warning(request, "Invalid action.")
+        messages.error(request, "Article rejected; the author will be notified.")
 
     return redirect("core:editor_queue")
\ No newline at end of file